@@ -0,0 +1,488 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""End-to-end throughput benchmark of the server extension handlers.
+
+A Jupyter server with the extension enabled is started in a subprocess,
+with gcloud stubbed out and the API endpoint overrides pointing at the
+upstream emulator, which runs in this process. Concurrent clients then
+call each benchmarked handler in turn, and the latency percentiles,
+throughput and server RSS are reported.
+
+    python benchmarks/e2e.py --output results.json
+    python benchmarks/e2e.py --check benchmarks/baselines/e2e.json
+
+With `--check`, the run fails when a handler is slower or the server uses
+more memory than the baseline allows. Baselines are machine specific;
+refresh them with `--update-baseline` on the machine that runs the checks.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+from scheduler_jupyter_plugin import emulator
+
+TOKEN = "benchmark-token"
+PROJECT_ID = "emulator-project"
+REGION_ID = "us-central1"
+ENVIRONMENT = "emulator-env-0"
+OUTPUT_RUN_ID = "benchmark-run"
+OUTPUT_FILE_NAME = "output.ipynb"
+
+# Stands in for the gcloud CLI, which the plugin calls for credentials.
+GCLOUD_STUB = """#!{python}
+import json
+import sys
+
+args = " ".join(sys.argv[1:])
+if args.startswith("config config-helper"):
+    print(json.dumps({{
+        "configuration": {{"properties": {{"core": {{
+            "account": "benchmark@example.com", "project": "{project_id}"
+        }}}}}},
+        "credential": {{
+            "access_token": "emulator-token",
+            "token_expiry": "2999-01-01T00:00:00Z",
+        }},
+    }}))
+elif args.startswith("projects describe"):
+    print("123456789")
+"""
+
+# A run fails the check when a latency percentile grows by more than the
+# tolerance and also by more than this many milliseconds, so that noise on
+# very fast handlers does not fail the build.
+LATENCY_NOISE_FLOOR_MS = 5
+
+
+class Scenario:
+    """A handler call repeated by the benchmark clients.
+
+    `request(index)` returns the method, path, query arguments and JSON
+    body of the `index`th call.
+    """
+
+    def __init__(self, name, request):
+        self.name = name
+        self.request = request
+
+
+def scenarios(dataset):
+    dag_ids = list(dataset.dags[ENVIRONMENT].keys())
+    bucket = dataset.environments[ENVIRONMENT]["storageConfig"]["bucket"]
+    dag_run_id = dataset.dag_runs(ENVIRONMENT, dag_ids[0])[0]["dag_run_id"]
+    location = {"project_id": PROJECT_ID, "region_id": REGION_ID}
+
+    def dag_list(index):
+        return "GET", "dagList", dict(location, composer=ENVIRONMENT), None
+
+    def dag_run(index):
+        query = dict(
+            location,
+            composer=ENVIRONMENT,
+            dag_id=dag_ids[index % len(dag_ids)],
+            start_date="2000-01-01T00:00:00Z",
+            end_date="2999-01-01T00:00:00Z",
+            offset=0,
+        )
+        return "GET", "dagRun", query, None
+
+    def list_schedules(index):
+        query = {"region_id": REGION_ID, "page_size": 25}
+        return "GET", "api/vertex/listSchedules", query, None
+
+    def create_job_scheduler(index):
+        body = {
+            "input_filename": "notebook.ipynb",
+            "composer_environment_name": ENVIRONMENT,
+            "name": f"benchmark_job_{index}",
+            "dag_id": f"benchmark_job_{index}",
+            "parameters": [],
+            "local_kernel": True,
+            "schedule_value": "0 * * * *",
+            "time_zone": "",
+            "email": [],
+        }
+        return "POST", "createJobScheduler", location, body
+
+    def download_output(index):
+        query = dict(
+            location,
+            composer=ENVIRONMENT,
+            bucket_name=bucket,
+            dag_id=dag_ids[0],
+            dag_run_id=dag_run_id,
+        )
+        return "POST", "downloadOutput", query, None
+
+    def download_job_output(index):
+        query = {
+            "bucket_name": bucket,
+            "job_run_id": OUTPUT_RUN_ID,
+            "file_name": OUTPUT_FILE_NAME,
+        }
+        return "POST", "api/storage/downloadOutput", query, None
+
+    return [
+        Scenario("dagList", dag_list),
+        Scenario("dagRun", dag_run),
+        Scenario("api/vertex/listSchedules", list_schedules),
+        Scenario("createJobScheduler", create_job_scheduler),
+        Scenario("downloadOutput", download_output),
+        Scenario("api/storage/downloadOutput", download_job_output),
+    ]
+
+
+def seed_outputs(dataset, output_size):
+    """Stores the output notebooks the download scenarios fetch."""
+    bucket = dataset.environments[ENVIRONMENT]["storageConfig"]["bucket"]
+    dag_id = next(iter(dataset.dags[ENVIRONMENT].keys()))
+    dag_run = dataset.dag_runs(ENVIRONMENT, dag_id)[0]["dag_run_id"]
+    data = os.urandom(output_size)
+    dataset.put_object(
+        bucket,
+        f"dataproc-output/{dag_id}/output-notebooks/{dag_id}_{dag_run}.ipynb",
+        data,
+    )
+    dataset.put_object(bucket, f"{OUTPUT_RUN_ID}/{OUTPUT_FILE_NAME}", data)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_environment(work_dir, upstream_url):
+    """Returns the environment of the server subprocess."""
+    bin_dir = os.path.join(work_dir, "bin")
+    os.makedirs(bin_dir)
+    gcloud = os.path.join(bin_dir, "gcloud")
+    with open(gcloud, "w") as f:
+        f.write(GCLOUD_STUB.format(python=sys.executable, project_id=PROJECT_ID))
+    os.chmod(gcloud, os.stat(gcloud).st_mode | stat.S_IEXEC)
+
+    env = dict(os.environ)
+    env["PATH"] = os.pathsep.join([bin_dir, env.get("PATH", "")])
+    env["CLOUDSDK_CONFIG"] = os.path.join(work_dir, "gcloud")
+    env["CLOUDSDK_CORE_PROJECT"] = PROJECT_ID
+    env["CLOUDSDK_COMPUTE_REGION"] = REGION_ID
+    for name, url in emulator.endpoint_overrides(upstream_url).items():
+        env[f"CLOUDSDK_API_ENDPOINT_OVERRIDES_{name.upper()}"] = url
+    env["JUPYTER_CONFIG_DIR"] = os.path.join(work_dir, "config")
+    env["JUPYTER_DATA_DIR"] = os.path.join(work_dir, "data")
+    env["JUPYTER_RUNTIME_DIR"] = os.path.join(work_dir, "runtime")
+    os.makedirs(env["JUPYTER_CONFIG_DIR"])
+    with open(
+        os.path.join(env["JUPYTER_CONFIG_DIR"], "jupyter_server_config.json"), "w"
+    ) as f:
+        json.dump(
+            {
+                "ServerApp": {
+                    "jpserver_extensions": {"scheduler_jupyter_plugin": True},
+                    "open_browser": False,
+                    # Containers used for CI often run as root.
+                    "allow_root": True,
+                },
+                "IdentityProvider": {"token": TOKEN},
+            },
+            f,
+        )
+    return env
+
+
+async def start_server(work_dir, upstream_url):
+    """Starts the Jupyter server and returns its process and base URL."""
+    port = free_port()
+    log = open(os.path.join(work_dir, "server.log"), "w")
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "jupyter_server",
+            f"--port={port}",
+            "--ServerApp.port_retries=0",
+            f"--ServerApp.root_dir={work_dir}",
+        ],
+        cwd=work_dir,
+        env=server_environment(work_dir, upstream_url),
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                break
+            try:
+                async with session.get(
+                    f"{base_url}/api/status",
+                    headers={"Authorization": f"token {TOKEN}"},
+                ) as response:
+                    if response.status == 200:
+                        return process, base_url
+            except aiohttp.ClientConnectionError:
+                pass
+            await asyncio.sleep(0.2)
+    process.kill()
+    log.close()
+    with open(os.path.join(work_dir, "server.log")) as f:
+        raise RuntimeError(f"Jupyter server did not start:\n{f.read()[-4000:]}")
+
+
+def rss_bytes(pid):
+    """Returns the resident set size of a process, or None if unknown."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(pid).memory_info().rss
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def is_error(status, body):
+    if status != 200:
+        return True
+    try:
+        result = json.loads(body)
+    except ValueError:
+        return True
+    return isinstance(result, dict) and any(
+        "error" in str(key).lower() for key in result.keys()
+    )
+
+
+async def run_scenario(session, base_url, scenario, requests, concurrency, warmup):
+    latencies = []
+    errors = 0
+    counter = iter(range(warmup + requests))
+
+    async def call(index):
+        method, path, query, body = scenario.request(index)
+        start = time.perf_counter()
+        async with session.request(
+            method,
+            f"{base_url}/scheduler-plugin/{path}",
+            params={name: str(value) for name, value in query.items()},
+            json=body,
+        ) as response:
+            content = await response.read()
+        return time.perf_counter() - start, is_error(response.status, content)
+
+    for index in range(warmup):
+        await call(next(counter))
+
+    async def client():
+        nonlocal errors
+        for index in counter:
+            elapsed, failed = await call(index)
+            latencies.append(elapsed)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+async def sample_rss(pid, samples, interval=0.25):
+    while True:
+        value = rss_bytes(pid)
+        if value is not None:
+            samples.append(value)
+        await asyncio.sleep(interval)
+
+
+async def benchmark(args):
+    dataset = emulator.Dataset(
+        dags=args.dags,
+        runs_per_dag=args.runs_per_dag,
+        schedules=args.schedules,
+    )
+    seed_outputs(dataset, args.output_size)
+    settings = emulator.Settings(latency=args.upstream_latency_ms / 1000)
+    runner, upstream_url = await emulator.start(emulator.create_app(dataset, settings))
+    with tempfile.TemporaryDirectory() as work_dir:
+        with open(os.path.join(work_dir, "notebook.ipynb"), "w") as f:
+            json.dump({"cells": [], "metadata": {}, "nbformat": 4}, f)
+        process, base_url = await start_server(work_dir, upstream_url)
+        rss_samples = []
+        sampler = asyncio.ensure_future(sample_rss(process.pid, rss_samples))
+        try:
+            rss_start = rss_bytes(process.pid)
+            results = {}
+            async with aiohttp.ClientSession(
+                headers={"Authorization": f"token {TOKEN}"},
+                connector=aiohttp.TCPConnector(limit=args.concurrency),
+            ) as session:
+                for scenario in scenarios(dataset):
+                    if args.scenario and scenario.name not in args.scenario:
+                        continue
+                    results[scenario.name] = await run_scenario(
+                        session,
+                        base_url,
+                        scenario,
+                        args.requests,
+                        args.concurrency,
+                        args.warmup,
+                    )
+                    print(f"{scenario.name}: {json.dumps(results[scenario.name])}")
+            rss_end = rss_bytes(process.pid)
+        finally:
+            sampler.cancel()
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            await runner.cleanup()
+    mib = 1024 * 1024
+    return {
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "dags": args.dags,
+            "runs_per_dag": args.runs_per_dag,
+            "schedules": args.schedules,
+            "upstream_latency_ms": args.upstream_latency_ms,
+            "output_size": args.output_size,
+        },
+        "handlers": results,
+        "rss_mib": {
+            "start": round((rss_start or 0) / mib, 1),
+            "peak": round(max(rss_samples, default=0) / mib, 1),
+            "end": round((rss_end or 0) / mib, 1),
+        },
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Returns the regressions of `results` against `baseline`."""
+    regressions = []
+    for name, expected in baseline.get("handlers", {}).items():
+        actual = results["handlers"].get(name)
+        if actual is None:
+            continue
+        if actual["errors"] > expected.get("errors", 0):
+            regressions.append(
+                f"{name}: {actual['errors']} errors (baseline {expected['errors']})"
+            )
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = expected[metric] * (1 + tolerance)
+            if (
+                actual[metric] > limit
+                and actual[metric] - expected[metric] > LATENCY_NOISE_FLOOR_MS
+            ):
+                regressions.append(
+                    f"{name}: {metric} {actual[metric]} > {round(limit, 2)}"
+                )
+        minimum = expected["requests_per_second"] * (1 - tolerance)
+        if actual["requests_per_second"] < minimum:
+            regressions.append(
+                f"{name}: {actual['requests_per_second']} requests/s < {round(minimum, 1)}"
+            )
+    expected_peak = baseline.get("rss_mib", {}).get("peak")
+    if expected_peak and results["rss_mib"]["peak"] > expected_peak * (1 + tolerance):
+        regressions.append(
+            f"peak RSS {results['rss_mib']['peak']} MiB > {round(expected_peak * (1 + tolerance), 1)} MiB"
+        )
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200, help="per handler")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=5, help="per handler")
+    parser.add_argument("--dags", type=int, default=10000)
+    parser.add_argument("--runs-per-dag", type=int, default=10)
+    parser.add_argument("--schedules", type=int, default=100)
+    parser.add_argument("--upstream-latency-ms", type=float, default=20)
+    parser.add_argument(
+        "--output-size", type=int, default=256 * 1024, help="bytes per download"
+    )
+    parser.add_argument("--scenario", action="append", help="only run these handlers")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--check", metavar="BASELINE", help="compare to a baseline")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="overwrite the --check baseline with the results",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed relative regression against the baseline",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = asyncio.run(benchmark(args))
+    print(f"RSS (MiB): {json.dumps(results['rss_mib'])}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.check and args.update_baseline:
+        with open(args.check, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    elif args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from scheduler_jupyter_plugin.services import airflow
+from scheduler_jupyter_plugin.tests import mocks
+
+
+@pytest.mark.parametrize("parameters", [0, 10, 100, 1000])
+@pytest.mark.parametrize("mode", ["local", "cluster", "serverless"])
+def bench_edit_jobs(
+    benchmark, run, credentials, log, executor_client, make_job, mode, parameters
+):
+    # Parse the DAG files the plugin generates for such jobs.
+    file_path = run(
+        executor_client.prepare_dag(
+            make_job(mode, parameters),
+            "mock-bucket",
+            "dag_benchmark_job.py",
+            "mock-project",
+            "us-central1",
+        )
+    )
+    with open(file_path, "rb") as f:
+        dag_file = f.read()
+    client = airflow.Client(credentials, log, mocks.MockClientSession())
+
+    async def get_dag_file(dag_id, bucket_name):
+        return dag_file
+
+    client.get_dag_file = get_dag_file
+
+    job = benchmark(lambda: run(client.edit_jobs("benchmark_job", "mock-bucket")))
+
+    # Local DAGs keep their parameters on a single line.
+    assert len(job["parameters"]) == (
+        min(parameters, 1) if mode == "local" else parameters
+    )
@@ -0,0 +1,36 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+
+@pytest.mark.parametrize("parameters", [0, 10, 100])
+@pytest.mark.parametrize("mode", ["local", "cluster", "serverless"])
+def bench_prepare_dag(benchmark, run, executor_client, make_job, mode, parameters):
+    job = make_job(mode, parameters)
+
+    file_path = benchmark(
+        lambda: run(
+            executor_client.prepare_dag(
+                job,
+                "mock-bucket",
+                "dag_benchmark_job.py",
+                "mock-project",
+                "us-central1",
+            )
+        )
+    )
+
+    with open(file_path) as f:
+        assert "param_0" in f.read() or parameters == 0
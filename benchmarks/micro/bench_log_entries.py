@@ -0,0 +1,45 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from scheduler_jupyter_plugin.services import logEntries
+
+
+def log_entry(i):
+    entry = {
+        "timestamp": f"2025-01-01T00:00:{i % 60:02d}.000000Z",
+        "severity": ("INFO", "WARNING", "ERROR")[i % 3],
+        "logName": "projects/mock-project/logs/airflow-worker",
+    }
+    kind = i % 4
+    if kind == 0:
+        entry["textPayload"] = f"Task benchmark_job.process_notebook line {i}"
+    elif kind == 1:
+        entry["jsonPayload"] = {"message": f"Executing notebook cell {i}"}
+    elif kind == 2:
+        entry["protoPayload"] = {"status": {"message": f"Permission denied {i}"}}
+    else:
+        entry["httpRequest"] = {"status": 503, "statusMessage": "Unavailable"}
+    return entry
+
+
+@pytest.mark.parametrize("size", [100, 1000, 10000])
+def bench_format_log_entries(benchmark, size):
+    # list_log_entries formats every entry of every page it is given.
+    entries = [log_entry(i) for i in range(size)]
+
+    logs = benchmark(lambda: [logEntries.format_log_entry(e) for e in entries])
+
+    assert len(logs) == size
@@ -0,0 +1,102 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from scheduler_jupyter_plugin.services import vertex
+from scheduler_jupyter_plugin.tests import mocks
+
+CRONS = [
+    "0 6 * * 1-5",
+    "TZ=Europe/Paris 30 2 * * *",
+    "*/15 * * * *",
+    "0 0 1 * *",
+    "0 12 * * 0",
+    "5 4 * * sun",
+    "0 22 * * 1-5",
+    "* * * * *",
+]
+
+
+class MockSession(mocks.MockClientSession):
+    def __init__(self, resp):
+        self.resp = resp
+
+    def get(self, api_endpoint, headers=None):
+        # The client replaces the top level keys of the responses it formats.
+        return mocks.MockResponse(dict(self.resp))
+
+
+def schedule(i):
+    return {
+        "name": f"projects/mock-project/locations/us-central1/schedules/{i}",
+        "displayName": f"schedule-{i}",
+        "cron": CRONS[i % len(CRONS)],
+        "maxRunCount": "1" if i % 10 == 0 else None,
+        "state": "ACTIVE",
+        "createTime": "2025-01-01T00:00:00Z",
+        "nextRunTime": "2025-01-02T00:00:00Z",
+        "lastScheduledRunResponse": {"runResponse": "OK"},
+        "createNotebookExecutionJobRequest": {
+            "notebookExecutionJob": {
+                "labels": {
+                    # A few schedules were not created by the plugin.
+                    "aiplatform.googleapis.com/colab_enterprise_entry_service": (
+                        "workbench" if i % 7 else "colab"
+                    )
+                }
+            }
+        },
+    }
+
+
+def machine_config(i):
+    return {
+        "machineType": f"n2-standard-{i}",
+        "cpuCount": i,
+        "ramBytes": str(i * 4 * 1024**3),
+        "acceleratorConfigs": [
+            {"acceleratorType": "NVIDIA_TESLA_T4", "allowedCounts": [1, 2, 4]}
+        ],
+    }
+
+
+@pytest.fixture
+def client_for(monkeypatch, credentials, log):
+    mocks.patch_mocks(monkeypatch)
+    return lambda resp: vertex.Client(credentials, log, MockSession(resp))
+
+
+@pytest.mark.parametrize("size", [10, 100, 1000])
+def bench_list_schedules(benchmark, run, client_for, size):
+    client = client_for({"schedules": [schedule(i) for i in range(size)]})
+
+    result = benchmark(lambda: run(client.list_schedules("us-central1", size)))
+
+    assert len(result["schedules"]) == size - len(range(0, size, 7))
+
+
+@pytest.mark.parametrize("size", [10, 100, 1000])
+def bench_list_uiconfig(benchmark, run, client_for, size):
+    client = client_for(
+        {
+            "notebookRuntimeConfig": {
+                "machineConfigs": [machine_config(i) for i in range(1, size + 1)]
+            }
+        }
+    )
+
+    result = benchmark(lambda: run(client.list_uiconfig("us-central1")))
+
+    assert len(result) == size
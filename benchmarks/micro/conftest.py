@@ -0,0 +1,96 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+
+import pytest
+
+from scheduler_jupyter_plugin.models.models import DescribeJob
+from scheduler_jupyter_plugin.services import executor
+from scheduler_jupyter_plugin.tests import mocks
+
+CREDENTIALS = {
+    "access_token": "mock-token",
+    "project_id": "mock-project",
+    "region_id": "us-central1",
+}
+
+
+@pytest.fixture
+def credentials():
+    return dict(CREDENTIALS)
+
+
+@pytest.fixture
+def log():
+    # Logging the parsed payloads would dominate the timings.
+    logger = logging.getLogger("benchmark")
+    logger.disabled = True
+    return logger
+
+
+@pytest.fixture
+def run():
+    """Runs a coroutine to completion on an event loop kept for the test."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def executor_client(monkeypatch, tmp_path, credentials, log):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(executor, "gcp_account", lambda: "user@example.com")
+    # prepare_dag writes the DAG files under the working directory.
+    monkeypatch.chdir(tmp_path)
+    client = executor.Client(credentials, log, mocks.MockClientSession())
+
+    async def multi_tenant_user_service_account(cluster_name):
+        return None
+
+    monkeypatch.setattr(
+        client, "multi_tenant_user_service_account", multi_tenant_user_service_account
+    )
+    return client
+
+
+def _job(mode, parameters):
+    return DescribeJob(
+        input_filename="notebooks/analysis.ipynb",
+        composer_environment_name="composer-env",
+        parameters=[f"param_{i}:value_{i}" for i in range(parameters)],
+        serverless_name={
+            "jupyterSession": {"displayName": "serverless-runtime"},
+            "runtimeConfig": {"version": "2.2"},
+        },
+        cluster_name="cluster-1",
+        mode_selected=mode,
+        schedule_value="0 6 * * 1-5",
+        retry_count=3,
+        retry_delay=10,
+        email_failure=True,
+        email=[f"user{i}@example.com" for i in range(3)],
+        name="benchmark_job",
+        dag_id="benchmark_job",
+        time_zone="Europe/Paris",
+        local_kernel=mode == "local",
+    )
+
+
+@pytest.fixture
+def make_job():
+    """Returns a factory of jobs in a mode (local, cluster or serverless)
+    with a number of notebook parameters."""
+    return _job
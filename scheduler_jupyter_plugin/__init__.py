@@ -12,6 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
+_import_started = time.perf_counter()
+
+from .commons import startup
+
+startup.start_import_timer()
 
 try:
     from ._version import __version__
@@ -25,8 +32,12 @@ except ImportError:
     __version__ = "dev"
 import logging
 
+from . import sessions, subscriptions
+from .commons import threadpool, tracing
 from .handlers import setup_handlers, SchedulerPluginConfig
 
+startup.record("import", time.perf_counter() - _import_started)
+
 
 def _jupyter_labextension_paths():
     return [{"src": "labextension", "dest": "scheduler-jupyter-plugin"}]
@@ -39,13 +50,31 @@ def _jupyter_server_extension_points():
 def _link_jupyter_server_extension(server_app):
     plugin_config = SchedulerPluginConfig.instance(parent=server_app)
     if plugin_config.log_path != "":
-        file_handler = logging.handlers.RotatingFileHandler(
-            plugin_config.log_path, maxBytes=2 * 1024 * 1024, backupCount=5
-        )
-        file_handler.setFormatter(
-            logging.Formatter("[%(levelname)s %(asctime)s %(name)s] %(message)s")
-        )
-        server_app.log.addHandler(file_handler)
+        with startup.phase("log handler setup"):
+            file_handler = logging.handlers.RotatingFileHandler(
+                plugin_config.log_path, maxBytes=2 * 1024 * 1024, backupCount=5
+            )
+            file_handler.setFormatter(
+                logging.Formatter("[%(levelname)s %(asctime)s %(name)s] %(message)s")
+            )
+            server_app.log.addHandler(file_handler)
+
+
+def _add_shutdown_hook(server_app, hook):
+    """Runs `hook` when the server cleans up its extensions.
+
+    Module-based server extensions have no stop callback of their own, so we
+    chain onto the server's extension cleanup step instead.
+    """
+    cleanup_extensions = server_app.cleanup_extensions
+
+    async def cleanup_with_hook():
+        try:
+            await hook()
+        finally:
+            await cleanup_extensions()
+
+    server_app.cleanup_extensions = cleanup_with_hook
 
 
 def _load_jupyter_server_extension(server_app):
@@ -56,9 +85,32 @@ def _load_jupyter_server_extension(server_app):
     server_app: jupyterlab.labapp.LabApp
         JupyterLab application instance
     """
-    setup_handlers(server_app.web_app)
+    plugin_config = SchedulerPluginConfig.instance(parent=server_app)
+    with startup.phase("session setup"):
+        sessions.setup(
+            limit=plugin_config.http_connection_limit,
+            limit_per_host=plugin_config.http_connection_limit_per_host,
+            keepalive_timeout=plugin_config.http_keepalive_timeout,
+            dns_cache_ttl=plugin_config.http_dns_cache_ttl,
+            host_limits=plugin_config.http_host_limits,
+        )
+    _add_shutdown_hook(server_app, sessions.close)
+    with startup.phase("thread pool setup"):
+        threadpool.configure(plugin_config.sdk_thread_pools)
+    _add_shutdown_hook(server_app, threadpool.close)
+    _add_shutdown_hook(server_app, subscriptions.close)
+    with startup.phase("tracing setup"):
+        tracing.configure(
+            plugin_config.trace_buffer_size, plugin_config.otlp_traces_endpoint
+        )
+    _add_shutdown_hook(server_app, tracing.close)
+    with startup.phase("handler registration"):
+        setup_handlers(server_app.web_app)
+    # The controllers imported later on are timed by the lazy handlers.
+    startup.stop_import_timer()
     name = "scheduler_jupyter_plugin"
     server_app.log.info(f"Registered {name} server extension")
+    startup.log_report(server_app.log)
 
 
 # For backward compatibility with notebook server - useful for Binder/JupyterHub
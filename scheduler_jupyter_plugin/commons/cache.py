@@ -0,0 +1,118 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+
+from scheduler_jupyter_plugin.commons import tracing
+
+
+class AsyncTTLCache:
+    """A small async cache with TTL, stale-while-revalidate and negative caching.
+
+    Values younger than `ttl` seconds are returned as-is. Values up to
+    `stale_ttl` seconds past their TTL are still returned, but trigger a
+    refresh in the background. Exceptions of the types in
+    `negative_exceptions` are cached for `negative_ttl` seconds and re-raised.
+    Concurrent misses for the same key share a single load.
+    """
+
+    def __init__(
+        self,
+        ttl,
+        stale_ttl=0,
+        negative_ttl=0,
+        negative_exceptions=(),
+        maxsize=1024,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.negative_exceptions = tuple(negative_exceptions)
+        self.maxsize = maxsize
+        # Maps a key to (value, error, stored_at).
+        self._entries = {}
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Returns whether a fresh value is cached for `key`."""
+        entry = self._entries.get(key)
+        return (
+            entry is not None
+            and entry[1] is None
+            and time.monotonic() - entry[2] < self.ttl
+        )
+
+    def _store(self, key, value, error):
+        self._entries.pop(key, None)
+        self._entries[key] = (value, error, time.monotonic())
+        while len(self._entries) > self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+
+    async def _load(self, key, load):
+        try:
+            value = await load()
+        except self.negative_exceptions as e:
+            self._store(key, None, e)
+            raise
+        self._store(key, value, None)
+        return value
+
+    def _start_load(self, key, load, background=False):
+        task = self._pending.get(key)
+        if task is None or task.done():
+            if background:
+                task = tracing.start_background_task(self._load(key, load))
+            else:
+                task = asyncio.ensure_future(self._load(key, load))
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+            self._pending[key] = task
+        return task
+
+    def _revalidate(self, key, load):
+        def log_failure(task):
+            if not task.cancelled() and task.exception() is not None:
+                logging.warning(
+                    f"Error refreshing cached value for {key}: {task.exception()}"
+                )
+
+        if key not in self._pending:
+            self._start_load(key, load, background=True).add_done_callback(log_failure)
+
+    async def get(self, key, load):
+        """Returns the value for `key`, calling `load()` to fetch it if needed."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, error, stored_at = entry
+            age = time.monotonic() - stored_at
+            if error is not None:
+                if age < self.negative_ttl:
+                    raise error
+            elif age < self.ttl:
+                return value
+            elif age < self.ttl + self.stale_ttl:
+                self._revalidate(key, load)
+                return value
+        return await asyncio.shield(self._start_load(key, load))
+
+    def invalidate(self, key=None):
+        """Drops one cached key, or every key if none is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
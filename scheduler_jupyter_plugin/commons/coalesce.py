@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Coalescing of identical concurrent requests.
+
+Requests that arrive while an identical one is still in flight wait for
+its result instead of calling the upstream service again.
+"""
+
+import asyncio
+import collections
+import hashlib
+
+from scheduler_jupyter_plugin import credentials
+
+
+class SingleFlight:
+    """Shares one in-flight call between concurrent callers with the same key.
+
+    Keys are tuples whose first element names the operation; calls and
+    coalesced calls are counted per operation name.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self.calls = collections.Counter()
+        self.hits = collections.Counter()
+
+    async def do(self, key, load):
+        """Returns the result of `load()`, sharing it with identical calls."""
+        name = key[0]
+        self.calls[name] += 1
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+            self._pending[key] = task
+        else:
+            self.hits[name] += 1
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {
+            name: {"calls": calls, "coalesced": self.hits[name]}
+            for name, calls in self.calls.items()
+        }
+
+
+requests = SingleFlight()
+
+
+def request_key(handler, access_token):
+    """Returns the coalescing key for a GET request handled by `handler`.
+
+    The key is made of the handler class, the query arguments (ignoring
+    their order) and the gcloud identity the upstream calls are made with.
+    """
+    arguments = tuple(
+        sorted(
+            (name, tuple(values))
+            for name, values in handler.request.query_arguments.items()
+        )
+    )
+    identity = hashlib.sha256(access_token.encode()).hexdigest()
+    return (type(handler).__name__, arguments, identity)
+
+
+async def coalesced(handler, load):
+    """Runs `load()` for a GET request, sharing it with identical requests."""
+    access_token = (await credentials.get_cached()).get("access_token") or ""
+    return await requests.do(request_key(handler, access_token), load)
+
+
+def stats():
+    """Returns the call and coalesced call counts per handler."""
+    return requests.stats()
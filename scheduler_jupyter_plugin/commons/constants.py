@@ -25,6 +25,7 @@ METASTORE_SERVICE_NAME = "metastore"
 STORAGE_SERVICE_DEFAULT_URL = "https://storage.googleapis.com/storage/v1/"
 STORAGE_SERVICE_NAME = "storage"
 COMPOSER_SERVICE_NAME = "composer"
+AIPLATFORM_SERVICE_NAME = "aiplatform"
 CONTENT_TYPE = "application/json"
 GCS = "gs://"
 PACKAGE_NAME = "scheduler_jupyter_plugin"
@@ -55,7 +56,11 @@ BUCKET_NAME_REGEXP = re.compile("[a-z][a-z0-9_.-]{1,61}[a-z0-9]")
 DAG_RUN_ID_REGEXP = re.compile("[a-zA-Z0-9_:\\+.-]+")
 
 HTTP_STATUS_OK = 200
+HTTP_STATUS_CREATED = 201
 HTTP_STATUS_NO_CONTENT = 204
+HTTP_STATUS_PARTIAL_CONTENT = 206
+HTTP_STATUS_RESUME_INCOMPLETE = 308
 HTTP_STATUS_FORBIDDEN = 403
+HTTP_STATUS_NOT_FOUND = 404
 HTTP_STATUS_INTERNAL_SERVER_ERROR = 500
 HTTP_STATUS_NETWORK_CONNECT_TIMEOUT = 599
@@ -0,0 +1,139 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reads gcloud configuration properties from disk instead of via the CLI.
+
+Files are re-parsed only when their mtime or size changes. Access tokens are
+not stored in these files and still have to be minted with the CLI.
+"""
+
+import configparser
+import logging
+import os
+import shutil
+
+DEFAULT_CONFIG_NAME = "default"
+
+# Maps a file path to the (stat signature, parsed value) last read from it.
+_file_cache = {}
+_installation_properties_path = None
+
+
+def config_dir():
+    """Returns the gcloud user configuration directory."""
+    configured_dir = os.environ.get("CLOUDSDK_CONFIG")
+    if configured_dir:
+        return configured_dir
+    if os.name == "nt" and os.environ.get("APPDATA"):
+        return os.path.join(os.environ["APPDATA"], "gcloud")
+    return os.path.join(os.path.expanduser("~"), ".config", "gcloud")
+
+
+def _stat_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_watched(path, parse, default):
+    signature = _stat_signature(path)
+    if signature is None:
+        _file_cache.pop(path, None)
+        return default
+    cached = _file_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    try:
+        value = parse(path)
+    except (OSError, configparser.Error, UnicodeDecodeError) as e:
+        logging.warning(f"Error reading gcloud config file {path}: {e}")
+        value = default
+    _file_cache[path] = (signature, value)
+    return value
+
+
+def _parse_active_config(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def _parse_properties(path):
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(path, encoding="utf-8")
+    return {section: dict(parser.items(section)) for section in parser.sections()}
+
+
+def active_config_name():
+    """Returns the name of the active gcloud configuration."""
+    configured_name = os.environ.get("CLOUDSDK_ACTIVE_CONFIG_NAME")
+    if configured_name:
+        return configured_name
+    active_config = os.path.join(config_dir(), "active_config")
+    name = _read_watched(active_config, _parse_active_config, "")
+    return name or DEFAULT_CONFIG_NAME
+
+
+def _user_properties_path():
+    return os.path.join(
+        config_dir(), "configurations", f"config_{active_config_name()}"
+    )
+
+
+def _installation_properties():
+    global _installation_properties_path
+    if _installation_properties_path is None:
+        gcloud_path = shutil.which("gcloud")
+        if gcloud_path:
+            sdk_root = os.path.dirname(os.path.dirname(os.path.realpath(gcloud_path)))
+            _installation_properties_path = os.path.join(sdk_root, "properties")
+        else:
+            _installation_properties_path = ""
+    if not _installation_properties_path:
+        return {}
+    return _read_watched(_installation_properties_path, _parse_properties, {})
+
+
+def get_section(section):
+    """Returns all properties set for a section of the gcloud config.
+
+    Environment overrides are included, with names lower-cased to match the
+    names used in the config files.
+    """
+    properties = {}
+    properties.update(_installation_properties().get(section, {}))
+    properties.update(
+        _read_watched(_user_properties_path(), _parse_properties, {}).get(section, {})
+    )
+    env_prefix = f"CLOUDSDK_{section.upper()}_"
+    for key, value in os.environ.items():
+        if key.startswith(env_prefix) and value:
+            properties[key[len(env_prefix) :].lower()] = value
+    return properties
+
+
+def get_property(section, name):
+    """Returns a single gcloud config property, or None if it is not set."""
+    env_value = os.environ.get(f"CLOUDSDK_{section}_{name}".upper())
+    if env_value:
+        return env_value
+    for properties in (
+        _read_watched(_user_properties_path(), _parse_properties, {}),
+        _installation_properties(),
+    ):
+        value = properties.get(section, {}).get(name)
+        if value:
+            return value
+    return None
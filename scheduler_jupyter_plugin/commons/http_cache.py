@@ -0,0 +1,58 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache-Control support for list endpoints.
+
+Tornado already gives GET responses an ETag and answers matching
+If-None-Match requests with an empty 304 response, so clients re-polling
+unchanged data only need to be told how long they may keep it.
+"""
+
+from scheduler_jupyter_plugin.commons import responses
+
+# Cache lifetimes, in seconds, per kind of data. Zero still lets the
+# browser keep the response, but it has to revalidate it on every use.
+REGIONS_MAX_AGE = 86400
+UI_CONFIG_MAX_AGE = 3600
+SERVICE_ACCOUNTS_MAX_AGE = 300
+# Run lists and buckets change through this extension, so they are always
+# revalidated to show the user's own updates straight away.
+RUN_LIST_MAX_AGE = 0
+BUCKETS_MAX_AGE = 0
+
+
+def cache_control(max_age):
+    if max_age <= 0:
+        return "private, no-cache"
+    return f"private, max-age={max_age}"
+
+
+def is_error(result):
+    """Whether `result` is one of the error payloads returned by services."""
+    return isinstance(result, dict) and any(
+        str(key).lower().startswith("error") for key in result
+    )
+
+
+def finish_cached(handler, result, max_age):
+    """Finishes a GET request with `result` as JSON.
+
+    Error payloads are never cached. Keys are sorted so that equal results
+    get the same ETag.
+    """
+    if is_error(result):
+        handler.set_header("Cache-Control", "no-store")
+    else:
+        handler.set_header("Cache-Control", cache_control(max_age))
+    return responses.finish_body(handler, responses.dumps(result, sort_keys=True))
@@ -0,0 +1,83 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Handlers whose modules are only imported on their first request.
+
+The controllers pull in the Google Cloud client libraries, which take
+seconds to import. The route table is registered at startup with
+placeholder handler classes, and a controller module is imported the first
+time one of its routes is requested.
+"""
+
+import importlib
+import sys
+import time
+
+from tornado import web
+from tornado.log import app_log
+
+# Seconds spent importing each lazily loaded module, in import order.
+_import_seconds = {}
+
+
+def import_module(name):
+    """Imports `name`, recording how long it took if it was not loaded yet."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_seconds[name] = time.perf_counter() - start
+    return module
+
+
+def handler(module_name, class_name, wrap=None):
+    """Returns a stand-in for the handler class `module_name.class_name`.
+
+    Tornado instantiates the stand-in for each request; the first one
+    imports the module, and every request is then served by an instance of
+    the real class, passed through `wrap` when given.
+    """
+    resolved = []
+
+    def resolve():
+        if not resolved:
+            handler_class = getattr(import_module(module_name), class_name)
+            resolved.append(wrap(handler_class) if wrap else handler_class)
+        return resolved[0]
+
+    # Tornado only dispatches to RequestHandler subclasses.
+    class LazyHandler(web.RequestHandler):
+        def __new__(cls, *args, **kwargs):
+            imported = module_name not in sys.modules
+            handler_class = resolve()
+            # Not an instance of this class, so Python does not initialize it.
+            instance = handler_class.__new__(handler_class)
+            instance.__init__(*args, **kwargs)
+            if imported:
+                # Jupyter handlers log to the server's log.
+                getattr(instance, "log", app_log).info(
+                    f"Imported {module_name} on first request in "
+                    f"{_import_seconds[module_name] * 1000:.0f} ms"
+                )
+            return instance
+
+    LazyHandler.__name__ = LazyHandler.__qualname__ = class_name
+    LazyHandler.module_name = module_name
+    LazyHandler.resolve = staticmethod(resolve)
+    return LazyHandler
+
+
+def import_report():
+    """Returns the modules imported on first use and the time each took."""
+    return {name: round(seconds * 1000, 1) for name, seconds in _import_seconds.items()}
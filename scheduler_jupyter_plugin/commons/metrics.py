@@ -0,0 +1,283 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prometheus metrics for handlers, upstream calls and gcloud subprocesses.
+
+The metrics live in their own registry, served by the
+`scheduler-plugin/metrics` endpoint, so that they do not mix with the
+Jupyter server's own metrics. The same measured operations are also
+recorded as tracing spans.
+"""
+
+import contextlib
+import fnmatch
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from tornado.escape import json_encode
+
+from scheduler_jupyter_plugin.commons import tracing
+
+REGISTRY = CollectorRegistry()
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+SUBPROCESS_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+HANDLER_REQUESTS = Counter(
+    "scheduler_plugin_handler_requests",
+    "Requests handled, per handler, HTTP method and status code.",
+    ["handler", "method", "code"],
+    registry=REGISTRY,
+)
+HANDLER_ERRORS = Counter(
+    "scheduler_plugin_handler_errors",
+    "Requests answered with an error status or error payload.",
+    ["handler", "method"],
+    registry=REGISTRY,
+)
+HANDLER_DURATION = Histogram(
+    "scheduler_plugin_handler_duration_seconds",
+    "Time spent handling requests.",
+    ["handler", "method"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+RESPONSE_SIZE = Histogram(
+    "scheduler_plugin_response_size_bytes",
+    "Size of response bodies as sent, after any compression.",
+    ["handler"],
+    buckets=SIZE_BUCKETS,
+    registry=REGISTRY,
+)
+UPSTREAM_REQUESTS = Counter(
+    "scheduler_plugin_upstream_requests",
+    "Calls to upstream services, per service, method and outcome.",
+    ["service", "method", "code"],
+    registry=REGISTRY,
+)
+UPSTREAM_DURATION = Histogram(
+    "scheduler_plugin_upstream_duration_seconds",
+    "Latency of calls to upstream services, until the response headers.",
+    ["service", "method"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+GCLOUD_DURATION = Histogram(
+    "scheduler_plugin_gcloud_subprocess_duration_seconds",
+    "Run time of gcloud subprocesses, per command.",
+    ["command"],
+    buckets=SUBPROCESS_BUCKETS,
+    registry=REGISTRY,
+)
+GCLOUD_FAILURES = Counter(
+    "scheduler_plugin_gcloud_subprocess_failures",
+    "gcloud subprocesses that failed, per command.",
+    ["command"],
+    registry=REGISTRY,
+)
+
+# Upstream host name patterns and the services they belong to.
+SERVICE_HOSTS = {
+    "composer.googleapis.com": "composer",
+    "*.composer.googleusercontent.com": "airflow",
+    "*aiplatform.googleapis.com": "vertex",
+    "storage.googleapis.com": "gcs",
+    "compute.googleapis.com": "compute",
+    "logging.googleapis.com": "logging",
+    "cloudkms.googleapis.com": "kms",
+    "iam.googleapis.com": "iam",
+    "dataproc.googleapis.com": "dataproc",
+    "pypi.org": "pypi",
+}
+
+
+def service_for_host(host):
+    for pattern, service in SERVICE_HOSTS.items():
+        if fnmatch.fnmatch(host, pattern):
+            return service
+    return "other"
+
+
+def observe_upstream(service, method, code, seconds):
+    UPSTREAM_REQUESTS.labels(service, method, str(code)).inc()
+    UPSTREAM_DURATION.labels(service, method).observe(seconds)
+
+
+@contextlib.contextmanager
+def upstream_timer(service, method):
+    """Times a call to an upstream service made through a Google SDK."""
+    started_at = time.perf_counter()
+    code = "error"
+    try:
+        with tracing.span(
+            f"{service}.{method}", tracing.SPAN_KIND_CLIENT, service=service
+        ):
+            yield
+        code = "ok"
+    finally:
+        observe_upstream(service, method, code, time.perf_counter() - started_at)
+
+
+@contextlib.contextmanager
+def gcloud_timer(command):
+    """Times a gcloud subprocess; `command` names it without its arguments."""
+    started_at = time.perf_counter()
+    try:
+        with tracing.span(f"gcloud {command}", tracing.SPAN_KIND_CLIENT):
+            yield
+    except BaseException:
+        GCLOUD_FAILURES.labels(command).inc()
+        raise
+    finally:
+        GCLOUD_DURATION.labels(command).observe(time.perf_counter() - started_at)
+
+
+def _is_error_body(chunk):
+    if isinstance(chunk, dict):
+        return any(str(key).lower().startswith("error") for key in chunk)
+    if isinstance(chunk, str):
+        chunk = chunk[:7].encode()
+    return chunk[:7].lower() == b'{"error'
+
+
+class HandlerMetricsMixin:
+    """Records the request count, latency, response size and errors of a
+    handler, and traces each request; see `instrument`."""
+
+    metrics_name = None
+    _metrics_written = 0
+    _metrics_error = False
+    _trace_span = None
+
+    def prepare(self):
+        self._trace_span = tracing.start_span(
+            f"{self.request.method} {self.metrics_name}",
+            tracing.SPAN_KIND_SERVER,
+            **{"http.method": self.request.method, "http.route": self.metrics_name},
+        )
+        return super().prepare()
+
+    def write(self, chunk):
+        if not self._metrics_written:
+            self._metrics_error = _is_error_body(chunk)
+        if isinstance(chunk, dict):
+            size = len(json_encode(chunk).encode())
+        elif isinstance(chunk, str):
+            size = len(chunk.encode())
+        else:
+            size = len(chunk)
+        self._metrics_written += size
+        return super().write(chunk)
+
+    def on_finish(self):
+        super().on_finish()
+        method = self.request.method
+        status = self.get_status()
+        HANDLER_REQUESTS.labels(self.metrics_name, method, str(status)).inc()
+        HANDLER_DURATION.labels(self.metrics_name, method).observe(
+            self.request.request_time()
+        )
+        # Bodies are dropped from 304 responses after they were written.
+        size = 0 if status == 304 else self._metrics_written
+        RESPONSE_SIZE.labels(self.metrics_name).observe(size)
+        error = status >= 400 or self._metrics_error
+        if error:
+            HANDLER_ERRORS.labels(self.metrics_name, method).inc()
+        if self._trace_span is not None:
+            self._trace_span.set_attribute("http.status_code", status)
+            if error:
+                self._trace_span.set_error(f"Error response ({status})")
+            self._trace_span.end()
+
+
+def instrument(handler_class, name):
+    """Returns a subclass of `handler_class` that records metrics as `name`.
+
+    The subclass keeps the class name, which other code relies on to tell
+    handlers apart.
+    """
+    return type(
+        handler_class.__name__,
+        (HandlerMetricsMixin, handler_class),
+        {"metrics_name": name, "__module__": handler_class.__module__},
+    )
+
+
+class StatsCollector:
+    """Exposes the state of the plugin's pools, limiters and breakers."""
+
+    def collect(self):
+        # Imported here as sessions depends on this module, via resilience.
+        from scheduler_jupyter_plugin import sessions
+        from scheduler_jupyter_plugin.commons import threadpool
+
+        pool_queued = GaugeMetricFamily(
+            "scheduler_plugin_thread_pool_queued",
+            "Blocking SDK calls waiting for a worker thread.",
+            labels=["pool"],
+        )
+        pool_active = GaugeMetricFamily(
+            "scheduler_plugin_thread_pool_active",
+            "Blocking SDK calls running on a worker thread.",
+            labels=["pool"],
+        )
+        for name, stats in threadpool.stats().items():
+            pool_queued.add_metric([name], stats["queued"])
+            pool_active.add_metric([name], stats["active"])
+        yield pool_queued
+        yield pool_active
+
+        host_waiting = GaugeMetricFamily(
+            "scheduler_plugin_upstream_queue_waiting",
+            "Requests waiting for a concurrency or rate limit slot.",
+            labels=["host"],
+        )
+        host_wait = GaugeMetricFamily(
+            "scheduler_plugin_upstream_queue_wait_seconds_total",
+            "Total time requests waited for a limit slot.",
+            labels=["host"],
+        )
+        for host, stats in sessions.host_limiters().items():
+            host_waiting.add_metric([host], stats["waiting"])
+            host_wait.add_metric([host], stats["wait_seconds_total"])
+        yield host_waiting
+        yield host_wait
+
+        circuit_open = GaugeMetricFamily(
+            "scheduler_plugin_upstream_circuit_open",
+            "Whether requests to an upstream host are being rejected.",
+            labels=["host"],
+        )
+        for host, stats in sessions.circuit_breakers().items():
+            circuit_open.add_metric([host], 0 if stats["state"] == "closed" else 1)
+        yield circuit_open
+
+
+REGISTRY.register(StatsCollector())
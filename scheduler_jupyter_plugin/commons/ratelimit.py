@@ -0,0 +1,136 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-host concurrency and rate limits for outbound requests.
+
+Small upstream servers, such as Composer's Airflow webservers, slow down
+for everyone when a burst of UI actions or several open tabs send them
+dozens of requests at once. Requests to each host are therefore bounded
+by a semaphore and, optionally, a token bucket. Time spent waiting for
+either is recorded, to show when a limit is the bottleneck.
+"""
+
+import asyncio
+import fnmatch
+import time
+
+# Limits per host name pattern; the first matching pattern applies and "*"
+# is always tried last. A rate of 0 means requests are not rate limited.
+DEFAULT_HOST_LIMITS = {
+    "*.composer.googleusercontent.com": {"concurrency": 4, "rate": 10.0, "burst": 10},
+    "*": {"concurrency": 10, "rate": 0, "burst": 0},
+}
+
+
+def limits_for(host, host_limits):
+    """Returns the limits of the first pattern in `host_limits` matching `host`."""
+    patterns = [pattern for pattern in host_limits if pattern != "*"]
+    for pattern in patterns + ["*"]:
+        if pattern in host_limits and fnmatch.fnmatch(host, pattern):
+            return host_limits[pattern]
+    return DEFAULT_HOST_LIMITS["*"]
+
+
+def merge_host_limits(configured):
+    """Returns the configured limits, followed by the defaults they do not
+    override, so that configured patterns are matched first."""
+    merged = dict(configured or {})
+    for pattern, limits in DEFAULT_HOST_LIMITS.items():
+        merged.setdefault(pattern, limits)
+    return merged
+
+
+class TokenBucket:
+    """Lets through `rate` acquisitions per second, in bursts of up to `burst`."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # The lock makes waiters take tokens in arrival order.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    """Bounds the concurrent requests and request rate to one host."""
+
+    def __init__(self, host, concurrency, rate=0, burst=0):
+        self.host = host
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate, burst or concurrency) if rate > 0 else None
+        self.requests = 0
+        self.waiting = 0
+        self.active = 0
+        self.delayed = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def acquire(self):
+        """Waits for a request slot to the host."""
+        started_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        wait = time.perf_counter() - started_at
+        self.requests += 1
+        self.active += 1
+        # Ignore the scheduling noise of acquiring an uncontended slot.
+        if wait > 0.001:
+            self.delayed += 1
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self):
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+def create_limiter(host, host_limits):
+    limits = limits_for(host, host_limits)
+    return HostLimiter(
+        host,
+        limits.get("concurrency", DEFAULT_HOST_LIMITS["*"]["concurrency"]),
+        limits.get("rate", 0),
+        limits.get("burst", 0),
+    )
@@ -0,0 +1,338 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retries and circuit breaking for calls to upstream services.
+
+`ResilientSession` wraps the shared aiohttp session. Failed requests are
+retried with jittered exponential backoff, honoring Retry-After, and each
+upstream host has a circuit breaker that fails requests fast while the
+host keeps failing. Every attempt also waits for the host's concurrency
+and rate limits (see `ratelimit`).
+"""
+
+import asyncio
+import email.utils
+import random
+import time
+
+import aiohttp
+from yarl import URL
+
+from scheduler_jupyter_plugin.commons import metrics, ratelimit, tracing
+
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 5.0
+# Longer Retry-After delays are not waited for; the response is returned.
+MAX_RETRY_AFTER = 30.0
+
+HTTP_STATUS_TOO_MANY_REQUESTS = 429
+RETRYABLE_STATUSES = {HTTP_STATUS_TOO_MANY_REQUESTS, 500, 502, 503, 504}
+# Statuses that say the request was not processed at all, so that even
+# non-idempotent requests can be sent again.
+UNPROCESSED_STATUSES = {HTTP_STATUS_TOO_MANY_REQUESTS}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Tracks the health of one upstream host.
+
+    The circuit opens after `failure_threshold` consecutive failures.
+    Once `reset_timeout` seconds have passed, a single trial request is let
+    through: the circuit closes if it succeeds and opens again otherwise.
+    """
+
+    def __init__(
+        self, host, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT
+    ):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.requests = 0
+        self.retries = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def before_request(self):
+        """Raises CircuitOpenError if the host should not be called now."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                retry_in = self.reset_timeout - (time.monotonic() - self.opened_at)
+                raise CircuitOpenError(
+                    f"Too many failures calling {self.host}, retrying in {retry_in:.0f}s"
+                )
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"Too many failures calling {self.host}, retrying shortly"
+                )
+            self._trial_in_flight = True
+        self.requests += 1
+
+    def record_success(self):
+        self._trial_in_flight = False
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+
+    def abandon_request(self):
+        """Forgets a request that ended without a success or a failure."""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self._trial_in_flight = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "requests": self.requests,
+            "retries": self.retries,
+            "rejected": self.rejected,
+        }
+
+
+def backoff_delay(attempt):
+    """Returns a full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def retry_after_delay(response):
+    """Returns the delay asked for by a Retry-After header, if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _replayable(kwargs):
+    """Whether the request body can be sent again."""
+    data = kwargs.get("data")
+    return data is None or isinstance(data, (bytes, str, dict))
+
+
+class _RequestContext:
+    """Async context manager for one logical request and its retries."""
+
+    def __init__(self, session, method, url, args, kwargs):
+        self._session = session
+        self._method = method
+        self._url = url
+        self._args = args
+        self._kwargs = kwargs
+        self._context = None
+        self._limiter = None
+
+    async def _send(self):
+        breaker = self._session.breaker_for(self._url)
+        limiter = self._session.limiter_for(self._url)
+        service = metrics.service_for_host(breaker.host)
+        method = self._method.upper()
+        idempotent = method in IDEMPOTENT_METHODS
+        replayable = _replayable(self._kwargs)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.before_request()
+            # A request that ends without an outcome, e.g. cancelled while
+            # waiting for the limiter, must not keep a half-open trial.
+            recorded = False
+            try:
+                await limiter.acquire()
+                send = getattr(self._session.session, self._method.lower())
+                started_at = time.perf_counter()
+                attempt_span = tracing.start_span(
+                    f"{method} {service}",
+                    tracing.SPAN_KIND_CLIENT,
+                    activate=False,
+                    **{"http.method": method, "net.peer.name": breaker.host},
+                    attempt=attempt,
+                )
+                try:
+                    context = send(self._url, *self._args, **self._kwargs)
+                    response = await context.__aenter__()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    limiter.release()
+                    attempt_span.set_error(e)
+                    attempt_span.end()
+                    metrics.observe_upstream(
+                        service, method, "error", time.perf_counter() - started_at
+                    )
+                    recorded = True
+                    breaker.record_failure()
+                    # Only connections that were never made are known not to
+                    # have reached the server.
+                    retryable = idempotent or isinstance(
+                        e, aiohttp.ClientConnectorError
+                    )
+                    if not (retryable and replayable) or attempt >= MAX_ATTEMPTS:
+                        raise
+                    delay = backoff_delay(attempt)
+                except BaseException as e:
+                    limiter.release()
+                    attempt_span.set_error(e)
+                    attempt_span.end()
+                    raise
+                else:
+                    attempt_span.set_attribute("http.status_code", response.status)
+                    if response.status >= 500:
+                        attempt_span.set_error(response.reason or response.status)
+                    attempt_span.end()
+                    metrics.observe_upstream(
+                        service,
+                        method,
+                        response.status,
+                        time.perf_counter() - started_at,
+                    )
+                    recorded = True
+                    if response.status >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    delay = self._retry_delay(response, attempt, idempotent, replayable)
+                    if delay is None:
+                        # The slot is held until the response is released.
+                        self._context = context
+                        self._limiter = limiter
+                        return response
+                    try:
+                        await context.__aexit__(None, None, None)
+                    finally:
+                        limiter.release()
+            finally:
+                if not recorded:
+                    breaker.abandon_request()
+            breaker.retries += 1
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, response, attempt, idempotent, replayable):
+        """Returns how long to wait before retrying, or None not to retry."""
+        status = response.status
+        if (
+            status not in RETRYABLE_STATUSES
+            or not (idempotent or status in UNPROCESSED_STATUSES)
+            or not replayable
+            or attempt >= MAX_ATTEMPTS
+        ):
+            return None
+        delay = retry_after_delay(response)
+        if delay is None:
+            return backoff_delay(attempt)
+        if delay > MAX_RETRY_AFTER:
+            return None
+        return delay
+
+    async def __aenter__(self):
+        return await self._send()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._context is not None:
+            try:
+                return await self._context.__aexit__(exc_type, exc, tb)
+            finally:
+                self._limiter.release()
+
+    async def _send_and_release(self):
+        # Awaited requests hand the response over to the caller, so the
+        # slot only covers the time until the response headers arrive.
+        response = await self._send()
+        self._limiter.release()
+        return response
+
+    def __await__(self):
+        return self._send_and_release().__await__()
+
+
+class ResilientSession:
+    """Wraps an aiohttp session with retries, per-host circuit breakers and
+    per-host limits.
+
+    Only the request methods are wrapped; every other attribute is read
+    from the wrapped session.
+    """
+
+    def __init__(self, session, breakers=None, limiters=None, host_limits=None):
+        self.session = session
+        self.breakers = breakers if breakers is not None else {}
+        self.limiters = limiters if limiters is not None else {}
+        self.host_limits = host_limits or ratelimit.DEFAULT_HOST_LIMITS
+
+    def breaker_for(self, url):
+        host = URL(str(url)).host or ""
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    def limiter_for(self, url):
+        host = URL(str(url)).host or ""
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            limiter = self.limiters[host] = ratelimit.create_limiter(
+                host, self.host_limits
+            )
+        return limiter
+
+    def request(self, method, url, *args, **kwargs):
+        return _RequestContext(self, method, url, args, kwargs)
+
+    def get(self, url, *args, **kwargs):
+        return self.request("GET", url, *args, **kwargs)
+
+    def post(self, url, *args, **kwargs):
+        return self.request("POST", url, *args, **kwargs)
+
+    def put(self, url, *args, **kwargs):
+        return self.request("PUT", url, *args, **kwargs)
+
+    def patch(self, url, *args, **kwargs):
+        return self.request("PATCH", url, *args, **kwargs)
+
+    def delete(self, url, *args, **kwargs):
+        return self.request("DELETE", url, *args, **kwargs)
+
+    def head(self, url, *args, **kwargs):
+        return self.request("HEAD", url, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
@@ -0,0 +1,222 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared JSON response writer.
+
+Bodies are serialized with orjson when it is installed, compressed with
+brotli or gzip when the client accepts it, and large listings can be
+streamed as a JSON array or as NDJSON while they are still being paged
+from upstream.
+"""
+
+import json
+import zlib
+
+from tornado.iostream import StreamClosedError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth the compression overhead.
+COMPRESSION_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+JSON_CONTENT_TYPE = "application/json"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+def dumps(obj, sort_keys=False):
+    """Serializes `obj` to JSON bytes."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # orjson is stricter than json, e.g. about integer sizes.
+            pass
+    return json.dumps(obj, sort_keys=sort_keys).encode()
+
+
+def accepted_encoding(handler):
+    """Returns the best content encoding accepted by the client, if any."""
+    accepted = set()
+    for coding in handler.request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class Compressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        """Compresses `data`, returning everything that can be sent so far."""
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def finish_json(handler, obj, sort_keys=False):
+    """Finishes the request with `obj` as its JSON body."""
+    return finish_body(handler, dumps(obj, sort_keys))
+
+
+def finish_body(handler, body):
+    """Finishes the request with a serialized JSON body, compressing it when
+    it is large enough and the client accepts it."""
+    handler.set_header("Content-Type", JSON_CONTENT_TYPE)
+    handler.add_header("Vary", "Accept-Encoding")
+    encoding = accepted_encoding(handler)
+    if encoding and len(body) >= COMPRESSION_MIN_SIZE:
+        compressor = Compressor(encoding)
+        body = compressor.compress(body) + compressor.finish()
+        handler.set_header("Content-Encoding", encoding)
+    return handler.finish(body)
+
+
+def wants_ndjson(handler):
+    """Whether the client asked for NDJSON instead of a JSON array."""
+    if handler.get_argument("format", "") == "ndjson":
+        return True
+    return NDJSON_CONTENT_TYPE in handler.request.headers.get("Accept", "")
+
+
+class JSONStream:
+    """Writes a list to the client page by page.
+
+    The output is either one JSON array, which is byte-for-byte what
+    `finish_json` would have sent for the whole list, or NDJSON with one
+    item per line.
+    """
+
+    def __init__(self, handler, ndjson=False):
+        self.handler = handler
+        self.ndjson = ndjson
+        self.count = 0
+        self._compressor = None
+        self.content_type = NDJSON_CONTENT_TYPE if ndjson else JSON_CONTENT_TYPE
+        handler.set_header("Content-Type", self.content_type)
+        handler.add_header("Vary", "Accept-Encoding")
+        encoding = accepted_encoding(handler)
+        if encoding:
+            self._compressor = Compressor(encoding)
+            handler.set_header("Content-Encoding", encoding)
+        if not ndjson:
+            self._write(b"[")
+
+    def _write(self, data):
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        if data:
+            self.handler.write(data)
+
+    async def write_page(self, items):
+        """Sends a page of items to the client."""
+        if not items:
+            return
+        if self.ndjson:
+            data = b"".join(dumps(item) + b"\n" for item in items)
+        else:
+            data = b",".join(dumps(item) for item in items)
+            if self.count:
+                data = b"," + data
+        self.count += len(items)
+        self._write(data)
+        await self.handler.flush()
+
+    def finish(self):
+        if not self.ndjson:
+            self._write(b"]")
+        return self._finish()
+
+    def _finish(self):
+        tail = self._compressor.finish() if self._compressor is not None else b""
+        # APIHandler.finish resets the content type unless it is given.
+        return self.handler.finish(tail, set_content_type=self.content_type)
+
+    def abort(self, error):
+        """Ends a stream that failed after its first page was sent.
+
+        NDJSON streams get a final error line. JSON arrays are left
+        unterminated, so that clients fail to parse them instead of
+        mistaking them for a complete list.
+        """
+        if self.ndjson:
+            self._write(dumps({"error": str(error)}) + b"\n")
+        return self._finish()
+
+
+async def stream_pages(handler, pages, ndjson=False):
+    """Streams the lists yielded by the async iterator `pages`.
+
+    The first page is fetched before anything is sent, so that a failing
+    upstream still gets the usual error response. Returns the number of
+    items sent.
+    """
+    # Not the aiter and anext builtins, which need Python 3.10.
+    pages = pages.__aiter__()
+    try:
+        try:
+            first_page = await pages.__anext__()
+        except StopAsyncIteration:
+            first_page = []
+        stream = JSONStream(handler, ndjson)
+        try:
+            await stream.write_page(first_page)
+            async for page in pages:
+                await stream.write_page(page)
+        except StreamClosedError:
+            # The client went away; there is nobody left to tell.
+            return stream.count
+        except Exception as e:
+            handler.log.exception(f"Error streaming response: {str(e)}")
+            stream.abort(e)
+            return stream.count
+        stream.finish()
+        return stream.count
+    finally:
+        # Stops the work of generators right away rather than when they
+        # are garbage collected.
+        if hasattr(pages, "aclose"):
+            await pages.aclose()
@@ -0,0 +1,181 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Profile of the extension's startup cost.
+
+The time spent importing the package, linking the extension (log handler
+setup) and loading it (sessions, pools, tracing and handler registration)
+is recorded as phases, together with the import time of each of the
+plugin's modules. With SCHEDULER_PLUGIN_IMPORTTIME=1 in the environment,
+the import of every module is timed, like `python -X importtime`.
+
+The profile is logged when the extension is loaded and served by the
+`scheduler-plugin/debug/startup` endpoint.
+"""
+
+import contextlib
+import importlib.machinery
+import os
+import sys
+import time
+
+DEEP_MODE_ENV_VAR = "SCHEDULER_PLUGIN_IMPORTTIME"
+PACKAGE_NAME = "scheduler_jupyter_plugin"
+# Modules listed in the server log, slowest first.
+LOGGED_MODULES = 10
+
+# Loaders created for each module, whose exec_module can be wrapped
+# without affecting other modules.
+_TIMED_LOADERS = (
+    importlib.machinery.SourceFileLoader,
+    importlib.machinery.SourcelessFileLoader,
+    importlib.machinery.ExtensionFileLoader,
+)
+
+
+class ImportTimer:
+    """A meta path finder that times the execution of imported modules.
+
+    Like `-X importtime`, it records for each module the time spent in its
+    own body ("self") and including the modules it imported ("cumulative").
+    Only modules under `prefix` are timed unless `prefix` is None, in which
+    case the imports of untimed modules count towards the self time of the
+    module importing them.
+    """
+
+    def __init__(self, prefix=None):
+        self.prefix = prefix
+        self.records = []
+        self._stack = []
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def _timed(self, fullname):
+        if self.prefix is None:
+            return True
+        return fullname == self.prefix or fullname.startswith(self.prefix + ".")
+
+    def find_spec(self, fullname, path, target=None):
+        if not self._timed(fullname):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if isinstance(spec.loader, _TIMED_LOADERS):
+                    self._wrap(spec.loader, fullname)
+                return spec
+        return None
+
+    def _wrap(self, loader, fullname):
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            # The time spent in nested imports is subtracted from self time.
+            frame = [time.perf_counter(), 0.0]
+            self._stack.append(frame)
+            try:
+                exec_module(module)
+            finally:
+                self._stack.pop()
+                cumulative = time.perf_counter() - frame[0]
+                if self._stack:
+                    self._stack[-1][1] += cumulative
+                self.records.append(
+                    {
+                        "module": fullname,
+                        "depth": len(self._stack),
+                        "self_ms": round((cumulative - frame[1]) * 1000, 2),
+                        "cumulative_ms": round(cumulative * 1000, 2),
+                    }
+                )
+
+        loader.exec_module = timed_exec_module
+
+
+# Milliseconds spent in each startup phase, by phase name.
+_phases = {}
+_import_timer = None
+
+
+def deep_mode():
+    return os.environ.get(DEEP_MODE_ENV_VAR, "") not in ("", "0")
+
+
+def start_import_timer():
+    """Starts timing imports; called first thing by the package."""
+    global _import_timer
+    if _import_timer is None:
+        _import_timer = ImportTimer(None if deep_mode() else PACKAGE_NAME)
+        _import_timer.install()
+
+
+def stop_import_timer():
+    if _import_timer is not None:
+        _import_timer.uninstall()
+
+
+def record(name, seconds):
+    # Reloading the extension, as tests do, replaces earlier timings.
+    _phases[name] = round(seconds * 1000, 2)
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Records the time spent in the block as the startup phase `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def report():
+    """Returns the startup phases and module import times."""
+    # Imported here as the package starts the import timer before tornado
+    # is loaded.
+    from scheduler_jupyter_plugin.commons import lazy
+
+    records = _import_timer.records if _import_timer else []
+    return {
+        "deep_mode": deep_mode(),
+        "total_ms": round(sum(_phases.values()), 2),
+        "phases_ms": dict(_phases),
+        # In the order their imports finished, like `-X importtime`.
+        "imports": list(records),
+        "lazy_imports_ms": lazy.import_report(),
+    }
+
+
+def log_report(log):
+    """Logs a summary of the startup profile."""
+    profile = report()
+    phases = ", ".join(
+        f"{name} {ms:.0f} ms" for name, ms in profile["phases_ms"].items()
+    )
+    log.info(f"{PACKAGE_NAME} startup took {profile['total_ms']:.0f} ms: {phases}")
+    slowest = sorted(
+        profile["imports"], key=lambda record: record["self_ms"], reverse=True
+    )[:LOGGED_MODULES]
+    if slowest:
+        modules = ", ".join(
+            f"{record['module']} {record['self_ms']:.0f} ms" for record in slowest
+        )
+        log.info(f"Slowest module imports (self time): {modules}")
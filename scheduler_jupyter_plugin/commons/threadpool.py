@@ -0,0 +1,124 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Pools for blocking Google SDK calls, so that a slow call to one service
+# cannot starve the others. Sizes can be overridden through
+# SchedulerPluginConfig.sdk_thread_pools.
+COMPUTE_POOL = "compute"
+LOGGING_POOL = "logging"
+DEFAULT_POOL_SIZES = {COMPUTE_POOL: 4, LOGGING_POOL: 4}
+
+
+class InstrumentedThreadPool:
+    """A bounded thread pool that tracks queue depth and wait times."""
+
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"scheduler-{name}"
+        )
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._started = 0
+        self._finished = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._run_seconds_total = 0.0
+
+    def _call(self, submitted_at, fn):
+        started_at = time.perf_counter()
+        wait = started_at - submitted_at
+        with self._lock:
+            self._started += 1
+            self._wait_seconds_total += wait
+            self._wait_seconds_max = max(self._wait_seconds_max, wait)
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self._finished += 1
+                self._run_seconds_total += time.perf_counter() - started_at
+
+    async def run(self, fn, *args, **kwargs):
+        """Runs `fn(*args, **kwargs)` on the pool and awaits its result."""
+        call = functools.partial(fn, *args, **kwargs)
+        with self._lock:
+            self._submitted += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._call, time.perf_counter(), call
+        )
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._submitted - self._started,
+                "active": self._started - self._finished,
+                "completed": self._finished,
+                "wait_seconds_total": self._wait_seconds_total,
+                "wait_seconds_max": self._wait_seconds_max,
+                "run_seconds_total": self._run_seconds_total,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_pools = {}
+_pool_sizes = dict(DEFAULT_POOL_SIZES)
+
+
+def configure(pool_sizes=None):
+    """Sets the pool sizes; pools are (re)created lazily with the new sizes."""
+    global _pool_sizes
+    shutdown()
+    _pool_sizes = dict(DEFAULT_POOL_SIZES)
+    _pool_sizes.update(pool_sizes or {})
+
+
+def get_pool(name):
+    pool = _pools.get(name)
+    if pool is None:
+        pool = InstrumentedThreadPool(name, _pool_sizes.get(name, 4))
+        _pools[name] = pool
+    return pool
+
+
+async def run_blocking(pool_name, fn, *args, **kwargs):
+    """Runs a blocking call on the named pool instead of the event loop."""
+    return await get_pool(pool_name).run(fn, *args, **kwargs)
+
+
+def stats():
+    """Returns queue depth and wait time metrics for every pool in use."""
+    return {name: pool.stats() for name, pool in _pools.items()}
+
+
+def shutdown():
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
+
+
+async def close():
+    """Shuts down every pool; used as a server shutdown hook."""
+    shutdown()
@@ -0,0 +1,352 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lightweight tracing of handler, service and upstream calls.
+
+Spans nest through a context variable, so a span started inside another
+one, including in tasks created while it is open, becomes its child. When
+the root span of a trace ends, the trace is kept in an in-memory ring
+buffer served by the `scheduler-plugin/debug/traces` endpoint, and handed
+to the OTLP exporter when one is configured.
+"""
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+import logging
+import random
+import time
+
+import aiohttp
+
+DEFAULT_MAX_TRACES = 200
+# Child spans beyond this many in one trace are counted but not kept. The
+# root span is always kept, so that the trace is still recorded.
+MAX_SPANS_PER_TRACE = 500
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+OTLP_STATUS_OK = 1
+OTLP_STATUS_ERROR = 2
+
+EXPORT_INTERVAL = 5.0
+MAX_EXPORT_QUEUE = 10000
+
+_current_span = contextvars.ContextVar("scheduler_plugin_span", default=None)
+_traces = collections.deque(maxlen=DEFAULT_MAX_TRACES)
+_exporter = None
+
+
+def _random_id(bits):
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Trace:
+    def __init__(self):
+        self.trace_id = _random_id(128)
+        self.spans = []
+        self.dropped_spans = 0
+        self.finished = False
+
+
+class Span:
+    """A timed operation, with attributes and an error status."""
+
+    def __init__(self, name, trace, parent=None, kind=SPAN_KIND_INTERNAL):
+        self.name = name
+        self.trace = trace
+        self.span_id = _random_id(64)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind
+        self.attributes = {}
+        self.error = None
+        self.start_time_ns = time.time_ns()
+        self._started_at = time.perf_counter()
+        self.duration = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_error(self, message):
+        self.error = str(message)
+
+    def end(self):
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started_at
+        trace = self.trace
+        if self.parent_id is not None and len(trace.spans) >= MAX_SPANS_PER_TRACE:
+            trace.dropped_spans += 1
+            return
+        trace.spans.append(self)
+        if trace.finished:
+            # A child that outlived its root, e.g. in a background task.
+            _export([self])
+        elif self.parent_id is None:
+            trace.finished = True
+            _traces.append(trace)
+            _export(trace.spans)
+
+    def to_dict(self, trace_start_ns):
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_offset_ms": (self.start_time_ns - trace_start_ns) / 1e6,
+            "duration_ms": self.duration * 1000,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+def start_span(name, kind=SPAN_KIND_INTERNAL, activate=True, **attributes):
+    """Starts a span as a child of the current one, or as a new trace.
+
+    Unless `activate` is false, the span becomes the current span of the
+    running context. It must be ended with `Span.end`.
+    """
+    parent = _current_span.get()
+    trace = parent.trace if parent is not None else Trace()
+    new_span = Span(name, trace, parent, kind)
+    new_span.attributes.update(attributes)
+    if activate:
+        _current_span.set(new_span)
+    return new_span
+
+
+@contextlib.contextmanager
+def span(name, kind=SPAN_KIND_INTERNAL, **attributes):
+    """Records the enclosed block as a span; exceptions mark it as failed."""
+    parent = _current_span.get()
+    new_span = start_span(name, kind, **attributes)
+    try:
+        yield new_span
+    except BaseException as e:
+        if not isinstance(e, (asyncio.CancelledError, GeneratorExit)):
+            new_span.set_error(e)
+        raise
+    finally:
+        new_span.end()
+        _current_span.set(parent)
+
+
+def traced(name):
+    """Decorates a coroutine function to run it inside a span."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span():
+    return _current_span.get()
+
+
+def start_background_task(coro):
+    """Runs `coro` in a task outside of the current trace.
+
+    Tasks copy the context they are created in, so a task outliving the
+    request that started it would otherwise keep adding spans to its trace.
+    """
+    context = contextvars.copy_context()
+    context.run(_current_span.set, None)
+    return context.run(asyncio.ensure_future, coro)
+
+
+def recent_traces(limit=None, min_duration_ms=0):
+    """Returns the most recent finished traces, newest first."""
+    result = []
+    for trace in reversed(_traces):
+        root = next(s for s in trace.spans if s.parent_id is None)
+        duration_ms = root.duration * 1000
+        if duration_ms < min_duration_ms:
+            continue
+        result.append(
+            {
+                "trace_id": trace.trace_id,
+                "name": root.name,
+                "start_time": root.start_time_ns / 1e9,
+                "duration_ms": duration_ms,
+                "error": any(s.error for s in trace.spans),
+                "dropped_spans": trace.dropped_spans,
+                "spans": sorted(
+                    (s.to_dict(root.start_time_ns) for s in trace.spans),
+                    key=lambda s: s["start_offset_ms"],
+                ),
+            }
+        )
+        if limit and len(result) >= limit:
+            break
+    return result
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_payload(spans, service_name):
+    """Returns spans as an OTLP/HTTP JSON ExportTraceServiceRequest."""
+    otlp_spans = []
+    for s in spans:
+        otlp_span = {
+            "traceId": s.trace.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": s.kind,
+            "startTimeUnixNano": str(s.start_time_ns),
+            "endTimeUnixNano": str(s.start_time_ns + int(s.duration * 1e9)),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in s.attributes.items()
+            ],
+            "status": (
+                {"code": OTLP_STATUS_ERROR, "message": s.error}
+                if s.error
+                else {"code": OTLP_STATUS_OK}
+            ),
+        }
+        if s.parent_id:
+            otlp_span["parentSpanId"] = s.parent_id
+        otlp_spans.append(otlp_span)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": _otlp_value(service_name)}
+                    ]
+                },
+                "scopeSpans": [
+                    {"scope": {"name": "scheduler_jupyter_plugin"}, "spans": otlp_spans}
+                ],
+            }
+        ]
+    }
+
+
+class OTLPExporter:
+    """Sends finished spans to an OTLP/HTTP collector in batches.
+
+    It uses a session of its own, so that exports are neither traced nor
+    subject to the limits of the shared session.
+    """
+
+    def __init__(
+        self,
+        endpoint,
+        service_name="scheduler-jupyter-plugin",
+        interval=EXPORT_INTERVAL,
+        max_queue=MAX_EXPORT_QUEUE,
+    ):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.interval = interval
+        self.max_queue = max_queue
+        self.pending = []
+        self.exported = 0
+        self.failed = 0
+        self.dropped = 0
+        self._task = None
+        self._session = None
+
+    def add(self, spans):
+        if len(self.pending) + len(spans) > self.max_queue:
+            self.dropped += len(spans)
+            return
+        self.pending.extend(spans)
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._flush_later())
+            except RuntimeError:
+                # No running loop; the spans go out with the next batch.
+                pass
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
+        await self.flush()
+
+    async def flush(self):
+        spans, self.pending = self.pending, []
+        if not spans:
+            return
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        try:
+            async with self._session.post(
+                self.endpoint, json=otlp_payload(spans, self.service_name)
+            ) as response:
+                if response.status >= 300:
+                    raise Exception(f"{response.status} {await response.text()}")
+            self.exported += len(spans)
+        except Exception as e:
+            self.failed += len(spans)
+            logging.warning(f"Error exporting {len(spans)} spans: {str(e)}")
+
+    def stats(self):
+        return {
+            "endpoint": self.endpoint,
+            "pending": len(self.pending),
+            "exported": self.exported,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        await self.flush()
+        if self._session is not None:
+            await self._session.close()
+
+
+def _export(spans):
+    if _exporter is not None:
+        _exporter.add(spans)
+
+
+def configure(max_traces=DEFAULT_MAX_TRACES, otlp_endpoint=""):
+    """Empties and sizes the trace buffer, and sets up the OTLP exporter."""
+    global _traces, _exporter
+    _traces = collections.deque(maxlen=max_traces)
+    _exporter = OTLPExporter(otlp_endpoint) if otlp_endpoint else None
+
+
+def exporter_stats():
+    return _exporter.stats() if _exporter is not None else None
+
+
+async def close():
+    """Flushes the exporter; used as a server shutdown hook."""
+    global _exporter
+    exporter, _exporter = _exporter, None
+    if exporter is not None:
+        await exporter.close()
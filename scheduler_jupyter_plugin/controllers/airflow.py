@@ -12,16 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 import re
 
-import aiohttp
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
-from scheduler_jupyter_plugin import credentials
-from scheduler_jupyter_plugin.commons import constants
-from scheduler_jupyter_plugin.services import airflow
+from scheduler_jupyter_plugin import credentials, sessions
+from scheduler_jupyter_plugin.commons import (
+    coalesce,
+    constants,
+    http_cache,
+    responses,
+)
+from scheduler_jupyter_plugin.services import airflow, composer
 
 
 class AirflowHandler(APIHandler):
@@ -30,6 +33,11 @@ class AirflowHandler(APIHandler):
     This class handles argument validation and error reporting.
     """
 
+    # Whether identical concurrent GET requests share one upstream call.
+    coalesce_get = False
+    # Cache lifetime of GET responses, sent as their Cache-Control header.
+    cache_max_age = None
+
     @property
     def composer_environment(self):
         composer_arg = self.get_argument("composer")
@@ -75,12 +83,17 @@ class AirflowHandler(APIHandler):
     @tornado.web.authenticated
     async def get(self):
         try:
-            async with aiohttp.ClientSession() as client_session:
-                client = airflow.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
+            client = airflow.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            if self.coalesce_get:
+                resp = await coalesce.coalesced(self, lambda: self._handle_get(client))
+            else:
                 resp = await self._handle_get(client)
-                self.finish(json.dumps(resp))
+            if self.cache_max_age is not None:
+                http_cache.finish_cached(self, resp, self.cache_max_age)
+            else:
+                responses.finish_json(self, resp)
         except Exception as e:
             self.log.exception(f"Error fetching {self.description()}")
             self.finish({"error": str(e)})
@@ -91,12 +104,11 @@ class AirflowHandler(APIHandler):
     @tornado.web.authenticated
     async def post(self):
         try:
-            async with aiohttp.ClientSession() as client_session:
-                client = airflow.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                resp = await self._handle_post(client)
-                self.finish(json.dumps(resp))
+            client = airflow.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            resp = await self._handle_post(client)
+            responses.finish_json(self, resp)
         except Exception as e:
             self.log.exception(f"Error updating {self.description()}")
             self.finish({"error": str(e)})
@@ -107,27 +119,119 @@ class AirflowHandler(APIHandler):
     @tornado.web.authenticated
     async def delete(self):
         try:
-            async with aiohttp.ClientSession() as client_session:
-                client = airflow.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                resp = await self._handle_delete(client)
-                self.finish(json.dumps(resp))
+            client = airflow.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            resp = await self._handle_delete(client)
+            responses.finish_json(self, resp)
         except Exception as e:
             self.log.exception(f"Error deleting {self.description()}")
             self.finish({"error": str(e)})
 
 
 class DagListController(AirflowHandler):
+    coalesce_get = True
+    cache_max_age = http_cache.RUN_LIST_MAX_AGE
+
     def description(self):
         return "cluster list"
 
+    def _int_argument(self, name):
+        value = self.get_argument(name, default=None)
+        if value is None:
+            return None
+        if not value.isdigit():
+            raise ValueError(f"Invalid {name}: {value}")
+        return int(value)
+
+    def _list_filters(self):
+        order_by = self.get_argument("order_by", default=None)
+        if order_by and order_by not in airflow.DAG_LIST_ORDERS:
+            raise ValueError(f"Invalid DAG order: {order_by}")
+        paused = self.get_argument("paused", default=None)
+        if paused not in (None, "true", "false"):
+            raise ValueError(f"Invalid paused filter: {paused}")
+        limit = self._int_argument("limit")
+        if limit == 0:
+            raise ValueError("Invalid limit: 0")
+        return {
+            "search": self.get_argument("search", default=None),
+            "order_by": order_by,
+            "paused": None if paused is None else paused == "true",
+            "offset": self._int_argument("offset") or 0,
+            "limit": limit,
+        }
+
     async def _handle_get(self, client):
         return await client.list_jobs(
-            self.composer_environment, self.project_id, self.region_id
+            self.composer_environment,
+            self.project_id,
+            self.region_id,
+            **self._list_filters(),
         )
 
 
+class AllDagListController(DagListController):
+    """Lists the DAGs of every environment in the project's regions.
+
+    Each environment is streamed as it answers, with its DAGs or the error
+    listing them failed with.
+    """
+
+    coalesce_get = False
+    cache_max_age = None
+
+    def description(self):
+        return "DAG lists"
+
+    @property
+    def timeout(self):
+        timeout_arg = self.get_argument("timeout", default=None)
+        if timeout_arg is None:
+            return airflow.ENVIRONMENT_LIST_TIMEOUT
+        try:
+            timeout = float(timeout_arg)
+        except ValueError:
+            timeout = None
+        # Also rejects nan, which fails every comparison.
+        if timeout is None or not 0 < timeout <= airflow.MAX_ENVIRONMENT_LIST_TIMEOUT:
+            raise ValueError(
+                f"Invalid timeout: {timeout_arg}, expected seconds between 0 "
+                f"and {airflow.MAX_ENVIRONMENT_LIST_TIMEOUT}"
+            )
+        return timeout
+
+    @tornado.web.authenticated
+    async def get(self):
+        try:
+            cached_credentials = await credentials.get_cached()
+            session = sessions.get_session()
+            project_id = (
+                self.get_argument("project_id", default=None)
+                or cached_credentials["project_id"]
+            )
+            region_ids = self.get_arguments("region_id") or [
+                cached_credentials["region_id"]
+            ]
+            timeout = self.timeout
+            client = airflow.Client(cached_credentials, self.log, session)
+            composer_client = composer.Client(cached_credentials, self.log, session)
+            await responses.stream_pages(
+                self,
+                client.iter_all_jobs(
+                    composer_client,
+                    project_id,
+                    region_ids,
+                    timeout,
+                    **self._list_filters(),
+                ),
+                responses.wants_ndjson(self),
+            )
+        except Exception as e:
+            self.log.exception(f"Error fetching {self.description()}")
+            self.finish({"error": str(e)})
+
+
 class DagDeleteController(AirflowHandler):
     def description(self):
         return "dag file"
@@ -168,6 +272,33 @@ class DagUpdateController(AirflowHandler):
         return {"status": update_response}
 
 
+class DagBulkController(AirflowHandler):
+    def description(self):
+        return "DAGs"
+
+    async def _handle_post(self, client):
+        body = self.get_json_body() or {}
+        action = body.get("action")
+        if action not in airflow.BULK_DAG_ACTIONS:
+            raise ValueError(f"Invalid action: {action}")
+        dag_ids = body.get("dag_ids")
+        if not isinstance(dag_ids, list) or not dag_ids:
+            raise ValueError("dag_ids must be a non-empty list")
+        for dag_id in dag_ids:
+            if not isinstance(dag_id, str) or not re.fullmatch(
+                constants.DAG_ID_REGEXP, dag_id
+            ):
+                raise ValueError(f"Invalid DAG ID: {dag_id}")
+        results = await client.bulk_dag_action(
+            self.composer_environment,
+            list(dict.fromkeys(dag_ids)),
+            action,
+            self.project_id,
+            self.region_id,
+        )
+        return {"results": results}
+
+
 class DagRunController(AirflowHandler):
     def description(self):
         return "dag run list"
@@ -208,6 +339,9 @@ class DagRunTaskLogsController(AirflowHandler):
     async def _handle_get(self, client):
         task_id = self.get_argument("task_id")
         task_try_number = self.get_argument("task_try_number")
+        full_content = self.get_argument("full_content", "true").lower() != "false"
+        continuation_token = self.get_argument("continuation_token", None)
+        task_state = self.get_argument("task_state", None)
         return await client.list_dag_run_task_logs(
             self.composer_environment,
             self.dag_id,
@@ -216,6 +350,9 @@ class DagRunTaskLogsController(AirflowHandler):
             task_try_number,
             self.project_id,
             self.region_id,
+            full_content,
+            continuation_token,
+            task_state,
         )
 
 
@@ -14,11 +14,11 @@
 
 import json
 
-import aiohttp
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
-from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin import credentials, sessions
+from scheduler_jupyter_plugin.commons import coalesce
 from scheduler_jupyter_plugin.services import composer
 
 
@@ -29,13 +29,14 @@ class EnvironmentListController(APIHandler):
         try:
             project_id = self.get_argument("project_id")
             region_id = self.get_argument("region_id")
-            async with aiohttp.ClientSession() as client_session:
-                client = composer.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                environments = await client.list_environments(project_id, region_id)
-                self.set_header("Content-Type", "application/json")
-                self.finish(json.dumps(environments, default=lambda x: x.dict()))
+            client = composer.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            environments = await coalesce.coalesced(
+                self, lambda: client.list_environments(project_id, region_id)
+            )
+            self.set_header("Content-Type", "application/json")
+            self.finish(json.dumps(environments, default=lambda x: x.dict()))
         except Exception as e:
             self.log.exception(f"Error fetching composer environments: {str(e)}")
             self.finish({"error": str(e)})
@@ -46,13 +47,12 @@ class EnvironmentGetController(APIHandler):
         """Returns details of composer environment"""
         try:
             env_name = self.get_argument("env_name")
-            async with aiohttp.ClientSession() as client_session:
-                client = composer.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                environment = await client.get_environment(env_name)
-                self.set_header("Content-Type", "application/json")
-                self.finish(json.dumps(environment, default=lambda x: x.dict()))
+            client = composer.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            environment = await client.get_environment(env_name)
+            self.set_header("Content-Type", "application/json")
+            self.finish(json.dumps(environment, default=lambda x: x.dict()))
         except Exception as e:
             self.log.exception(f"Error fetching composer environment: {str(e)}")
             self.finish({"error": str(e)})
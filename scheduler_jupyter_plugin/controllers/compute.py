@@ -14,11 +14,11 @@
 
 import json
 
-import aiohttp
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
-from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin import credentials, sessions
+from scheduler_jupyter_plugin.commons import coalesce, http_cache
 from scheduler_jupyter_plugin.services import compute
 
 
@@ -30,8 +30,8 @@ class RegionController(APIHandler):
             compute_client = compute.Client(
                 await credentials.get_cached(), self.log, None
             )
-            regions = await compute_client.list_region()
-            self.finish(json.dumps(regions))
+            regions = await coalesce.coalesced(self, compute_client.list_region)
+            http_cache.finish_cached(self, regions, http_cache.REGIONS_MAX_AGE)
         except Exception as e:
             self.log.exception(f"Error fetching regions: {str(e)}")
             self.finish({"error": str(e)})
@@ -92,12 +92,11 @@ class GetXpnHostController(APIHandler):
     @tornado.web.authenticated
     async def get(self):
         try:
-            async with aiohttp.ClientSession() as client_session:
-                client = compute.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                xpn_host = await client.get_xpn_host()
-                self.finish(json.dumps(xpn_host))
+            client = compute.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            xpn_host = await client.get_xpn_host()
+            self.finish(json.dumps(xpn_host))
         except Exception as e:
             self.log.exception(f"Error fetching xpn host: {str(e)}")
             self.finish({"error": str(e)})
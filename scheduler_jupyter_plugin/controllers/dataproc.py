@@ -14,11 +14,10 @@
 
 import json
 
-import aiohttp
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
-from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin import credentials, sessions
 from scheduler_jupyter_plugin.services import dataproc
 
 
@@ -28,11 +27,10 @@ class ClusterListController(APIHandler):
         try:
             page_token = self.get_argument("pageToken")
             page_size = self.get_argument("pageSize")
-            async with aiohttp.ClientSession() as client_session:
-                client = dataproc.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                cluster_list = await client.list_clusters(page_size, page_token)
+            client = dataproc.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            cluster_list = await client.list_clusters(page_size, page_token)
             self.finish(json.dumps(cluster_list))
         except Exception as e:
             self.log.exception("Error fetching cluster list")
@@ -45,11 +43,10 @@ class RuntimeController(APIHandler):
         try:
             page_token = self.get_argument("pageToken")
             page_size = self.get_argument("pageSize")
-            async with aiohttp.ClientSession() as client_session:
-                client = dataproc.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                runtime_list = await client.list_runtime(page_size, page_token)
+            client = dataproc.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            runtime_list = await client.list_runtime(page_size, page_token)
             self.finish(json.dumps(runtime_list))
         except Exception as e:
             self.log.exception(f"Error fetching runtime template list: {str(e)}")
@@ -14,12 +14,12 @@
 
 import json
 import re
+import uuid
 
-import aiohttp
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
-from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin import credentials, sessions
 from scheduler_jupyter_plugin.commons import constants
 from scheduler_jupyter_plugin.services import executor
 
@@ -40,12 +40,11 @@ class ExecutorController(APIHandler):
                 raise ValueError(f"Invalid DAG ID: {input_data}")
             if not re.fullmatch(constants.AIRFLOW_JOB_REGEXP, input_data["name"]):
                 raise ValueError(f"Invalid job name: {input_data}")
-            async with aiohttp.ClientSession() as client_session:
-                client = executor.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                result = await client.execute(input_data, project_id, region_id)
-                self.finish(json.dumps(result))
+            client = executor.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            result = await client.execute(input_data, project_id, region_id)
+            self.finish(json.dumps(result))
         except Exception as e:
             self.log.exception(f"Error creating dag schedule: {str(e)}")
             self.finish({"error": str(e)})
@@ -61,6 +60,8 @@ class DownloadOutputController(APIHandler):
             dag_run_id = self.get_argument("dag_run_id")
             project_id = self.get_argument("project_id")
             region_id = self.get_argument("region_id")
+            # Concurrent downloads of an output each need their own id.
+            download_id = self.get_argument("download_id", None) or uuid.uuid4().hex
             if not re.fullmatch(constants.COMPOSER_ENVIRONMENT_REGEXP, composer_name):
                 raise ValueError(f"Invalid Composer environment name: {composer_name}")
             if not re.fullmatch(constants.BUCKET_NAME_REGEXP, bucket_name):
@@ -69,19 +70,21 @@ class DownloadOutputController(APIHandler):
                 raise ValueError(f"Invalid DAG ID: {dag_id}")
             if not re.fullmatch(constants.DAG_RUN_ID_REGEXP, dag_run_id):
                 raise ValueError(f"Invalid DAG Run ID: {dag_run_id}")
-            async with aiohttp.ClientSession() as client_session:
-                client = executor.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                download_status = await client.download_dag_output(
-                    composer_name,
-                    bucket_name,
-                    dag_id,
-                    dag_run_id,
-                    project_id,
-                    region_id,
-                )
-                self.finish(json.dumps({"status": download_status}))
+            client = executor.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            download_status = await client.download_dag_output(
+                composer_name,
+                bucket_name,
+                dag_id,
+                dag_run_id,
+                project_id,
+                region_id,
+                download_id,
+            )
+            self.finish(
+                json.dumps({"status": download_status, "download_id": download_id})
+            )
         except Exception as e:
             self.log.exception("Error download output file")
             self.finish({"error": str(e)})
@@ -93,14 +96,13 @@ class CheckRequiredPackagesController(APIHandler):
         try:
             composer_environment_name = self.get_argument("composer_environment_name")
             region_id = self.get_argument("region_id")
-            async with aiohttp.ClientSession() as client_session:
-                client = executor.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                result = await client.check_required_packages(
-                    composer_environment_name, region_id
-                )
-                self.finish(json.dumps(result))
+            client = executor.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            result = await client.check_required_packages(
+                composer_environment_name, region_id
+            )
+            self.finish(json.dumps(result))
         except Exception as e:
             self.log.exception(f"Error checking packages: {str(e)}")
             self.finish({"error": str(e)})
@@ -12,12 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
 from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin.commons import http_cache
 from scheduler_jupyter_plugin.services import iam
 
 
@@ -28,7 +28,9 @@ class ServiceAccountController(APIHandler):
         try:
             iam_admin_client = iam.Client(await credentials.get_cached(), self.log)
             service_account = await iam_admin_client.list_service_account()
-            self.finish(json.dumps(service_account))
+            http_cache.finish_cached(
+                self, service_account, http_cache.SERVICE_ACCOUNTS_MAX_AGE
+            )
         except Exception as e:
             self.log.exception(f"Error fetching service accounts: {str(e)}")
             self.finish({"error": str(e)})
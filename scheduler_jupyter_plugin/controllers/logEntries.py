@@ -12,25 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-
 import aiohttp
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
 from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin.commons import responses
 from scheduler_jupyter_plugin.services import logEntries
 
 
 class LogEntiresListContoller(APIHandler):
     @tornado.web.authenticated
     async def get(self):
-        """Returns log entries"""
+        """Returns log entries, streamed as they are paged"""
         try:
             filter_query = self.get_argument("filter_query")
             logging_client = logEntries.Client(await credentials.get_cached(), self.log)
-            logs = await logging_client.list_log_entries(filter_query)
-            self.finish(json.dumps(logs))
+            await responses.stream_pages(
+                self,
+                logging_client.iter_log_entries(filter_query),
+                responses.wants_ndjson(self),
+            )
         except Exception as e:
             self.log.exception(f"Error fetching entries: {str(e)}")
             self.finish({"error": str(e)})
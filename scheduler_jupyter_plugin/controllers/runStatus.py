@@ -0,0 +1,151 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import re
+
+import tornado
+from tornado.iostream import StreamClosedError
+from jupyter_server.base.handlers import APIHandler
+
+from scheduler_jupyter_plugin import credentials, sessions, subscriptions
+from scheduler_jupyter_plugin.commons import constants
+from scheduler_jupyter_plugin.services import airflow, vertex
+
+ACTIVE_DAG_RUN_STATES = {"queued", "running"}
+ACTIVE_EXECUTION_JOB_STATES = {
+    "JOB_STATE_QUEUED",
+    "JOB_STATE_PENDING",
+    "JOB_STATE_RUNNING",
+}
+
+# An SSE comment is sent when there has been no event for this many seconds,
+# so that proxies do not drop the idle connection.
+KEEPALIVE_INTERVAL = 15
+
+
+class RunStatusStreamController(APIHandler):
+    """Streams run status changes as server-sent events.
+
+    Clients subscribe to the runs of DAGs (`composer` plus one or more
+    `dag_id` arguments) and/or to the executions of Vertex schedules (one
+    or more `schedule_id` arguments). Each event carries the runs that were
+    added, changed or removed for one subscription.
+    """
+
+    def initialize(self):
+        self._queue = asyncio.Queue()
+        self._closed = False
+
+    def on_connection_close(self):
+        self._closed = True
+        # Wake up the streaming loop so that it can unsubscribe.
+        self._queue.put_nowait(None)
+
+    def _dag_run_subscription(self, project_id, region_id, composer_name, dag_id):
+        async def fetch():
+            client = airflow.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            return await client.list_latest_dag_runs(
+                composer_name, dag_id, project_id, region_id
+            )
+
+        return (
+            ("dag", project_id, region_id, composer_name, dag_id),
+            f"dag/{composer_name}/{dag_id}",
+            fetch,
+            lambda run: run.get("dag_run_id"),
+            lambda run: run.get("state") in ACTIVE_DAG_RUN_STATES,
+        )
+
+    def _schedule_subscription(self, project_id, region_id, schedule_id):
+        async def fetch():
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            jobs = await client.list_notebook_execution_jobs(
+                region_id, schedule_id, "createTime desc", page_size=25
+            )
+            if isinstance(jobs, dict):
+                raise Exception(next(iter(jobs.values()), "Unknown error"))
+            return jobs
+
+        return (
+            ("schedule", project_id, region_id, schedule_id),
+            f"schedule/{schedule_id}",
+            fetch,
+            lambda job: job.get("name"),
+            lambda job: job.get("jobState") in ACTIVE_EXECUTION_JOB_STATES,
+        )
+
+    def _subscriptions(self):
+        project_id = self.get_argument("project_id")
+        region_id = self.get_argument("region_id")
+        dag_ids = self.get_arguments("dag_id")
+        schedule_ids = self.get_arguments("schedule_id")
+        result = []
+        if dag_ids:
+            composer_name = self.get_argument("composer")
+            if not re.fullmatch(constants.COMPOSER_ENVIRONMENT_REGEXP, composer_name):
+                raise ValueError(f"Invalid Composer environment name: {composer_name}")
+            for dag_id in dag_ids:
+                if not re.fullmatch(constants.DAG_ID_REGEXP, dag_id):
+                    raise ValueError(f"Invalid DAG ID: {dag_id}")
+                result.append(
+                    self._dag_run_subscription(
+                        project_id, region_id, composer_name, dag_id
+                    )
+                )
+        for schedule_id in schedule_ids:
+            result.append(
+                self._schedule_subscription(project_id, region_id, schedule_id)
+            )
+        if not result:
+            raise ValueError("No dag_id or schedule_id to subscribe to")
+        return result
+
+    @tornado.web.authenticated
+    async def get(self):
+        try:
+            subscription_list = self._subscriptions()
+        except Exception as e:
+            self.log.exception(f"Error subscribing to run status: {str(e)}")
+            self.finish({"error": str(e)})
+            return
+
+        self.set_header("Content-Type", "text/event-stream")
+        self.set_header("Cache-Control", "no-cache")
+        self.set_header("X-Accel-Buffering", "no")
+        for key, name, fetch, item_id, is_active in subscription_list:
+            subscriptions.subscribe(key, name, fetch, item_id, is_active, self._queue)
+        try:
+            while not self._closed:
+                try:
+                    event = await asyncio.wait_for(
+                        self._queue.get(), KEEPALIVE_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    self.write(": keepalive\n\n")
+                else:
+                    if event is None:
+                        break
+                    self.write(f"data: {json.dumps(event)}\n\n")
+                await self.flush()
+        except StreamClosedError:
+            pass
+        finally:
+            for subscription in subscription_list:
+                subscriptions.unsubscribe(subscription[0], self._queue)
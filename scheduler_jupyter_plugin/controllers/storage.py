@@ -13,12 +13,14 @@
 # limitations under the License.
 
 import json
+import uuid
 
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
-from scheduler_jupyter_plugin import credentials
-from scheduler_jupyter_plugin.services import storage
+from scheduler_jupyter_plugin import credentials, sessions
+from scheduler_jupyter_plugin.commons import http_cache
+from scheduler_jupyter_plugin.services import gcs, storage
 
 
 class DownloadOutputController(APIHandler):
@@ -28,9 +30,13 @@ class DownloadOutputController(APIHandler):
             bucket_name = self.get_argument("bucket_name")
             job_run_id = self.get_argument("job_run_id")
             file_name = self.get_argument("file_name")
-            client = storage.Client(await credentials.get_cached(), self.log)
+            # Concurrent downloads of an object each need their own id.
+            download_id = self.get_argument("download_id", None) or uuid.uuid4().hex
+            client = storage.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
             download_result = await client.download_output(
-                bucket_name, file_name, job_run_id
+                bucket_name, file_name, job_run_id, download_id
             )
             self.finish(
                 json.dumps(
@@ -39,6 +45,7 @@ class DownloadOutputController(APIHandler):
                         "downloaded_filename": download_result.get(
                             "downloaded_filename"
                         ),
+                        "download_id": download_id,
                     }
                 )
             )
@@ -52,9 +59,11 @@ class CloudStorageController(APIHandler):
     async def get(self):
         """Returns cloud storage bucket"""
         try:
-            storage_client = storage.Client(await credentials.get_cached(), self.log)
+            storage_client = storage.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
             csb = await storage_client.list_bucket()
-            self.finish(json.dumps(csb))
+            http_cache.finish_cached(self, csb, http_cache.BUCKETS_MAX_AGE)
         except Exception as e:
             self.log.exception(f"Error fetching cloud storage bucket: {str(e)}")
             self.finish({"error": str(e)})
@@ -68,9 +77,26 @@ class OutputFileExistsController(APIHandler):
             bucket_name = self.get_argument("bucket_name")
             job_run_id = self.get_argument("job_run_id")
             file_name = self.get_argument("file_name")
-            client = storage.Client(await credentials.get_cached(), self.log)
+            client = storage.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
             result = await client.output_file_exists(bucket_name, file_name, job_run_id)
             self.finish(json.dumps(result))
         except Exception as e:
             self.log.exception({"Error in checking output file": str(e)})
             self.finish({"Error in checking output file": str(e)})
+
+
+class DownloadProgressController(APIHandler):
+    @tornado.web.authenticated
+    async def get(self):
+        """Returns the progress of one or all recent output downloads"""
+        try:
+            download_id = self.get_argument("download_id", None)
+            progress = gcs.download_progress(download_id)
+            if progress is None:
+                raise ValueError(f"Unknown download: {download_id}")
+            self.finish(json.dumps(progress))
+        except Exception as e:
+            self.log.exception(f"Error fetching download progress: {str(e)}")
+            self.finish({"error": str(e)})
@@ -14,11 +14,10 @@
 
 import json
 
-import aiohttp
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
-from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin import credentials, sessions
 from scheduler_jupyter_plugin.services import version
 
 
@@ -27,11 +26,10 @@ class LatestVersionController(APIHandler):
     async def get(self):
         try:
             package_name = self.get_argument("packageName")
-            async with aiohttp.ClientSession() as client_session:
-                client = version.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                version_id = await client.get_latest_version(package_name)
+            client = version.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            version_id = await client.get_latest_version(package_name)
 
             self.finish(json.dumps(version_id))
         except Exception as e:
@@ -44,11 +42,10 @@ class UpdatePackageController(APIHandler):
     async def post(self):
         try:
             package_name = self.get_argument("packageName")
-            async with aiohttp.ClientSession() as client_session:
-                client = version.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                is_updated = await client.update_plugin(package_name)
+            client = version.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            is_updated = await client.update_plugin(package_name)
 
             self.finish(json.dumps(is_updated))
         except Exception as e:
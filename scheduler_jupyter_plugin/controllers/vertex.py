@@ -14,11 +14,11 @@
 
 import json
 
-import aiohttp
 import tornado
 from jupyter_server.base.handlers import APIHandler
 
-from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin import credentials, sessions
+from scheduler_jupyter_plugin.commons import coalesce, http_cache, responses
 from scheduler_jupyter_plugin.services import vertex
 
 
@@ -28,13 +28,12 @@ class UIConfigController(APIHandler):
         """Returns available ui config"""
         try:
             region_id = self.get_argument("region_id")
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
 
-                configs = await client.list_uiconfig(region_id)
-                self.finish(json.dumps(configs))
+            configs = await client.list_uiconfig(region_id)
+            http_cache.finish_cached(self, configs, http_cache.UI_CONFIG_MAX_AGE)
         except Exception as e:
             self.log.exception(f"Error fetching ui config: {str(e)}")
             self.finish({"error": str(e)})
@@ -45,12 +44,11 @@ class VertexScheduleCreateController(APIHandler):
     async def post(self):
         try:
             input_data = self.get_json_body()
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                result = await client.create_job_schedule(input_data)
-                self.finish(json.dumps(result))
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            result = await client.create_job_schedule(input_data)
+            self.finish(json.dumps(result))
         except Exception as e:
             self.log.exception(f"Error creating job schedule: {str(e)}")
             self.finish({"error": str(e)})
@@ -61,12 +59,11 @@ class BucketCreateController(APIHandler):
     async def post(self):
         try:
             input_data = self.get_json_body()
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                result = await client.create_new_bucket(input_data)
-                self.finish(json.dumps(result))
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            result = await client.create_new_bucket(input_data)
+            self.finish(json.dumps(result))
         except Exception as e:
             self.log.exception(f"Error creating a new bucket: {str(e)}")
             self.finish({"error": str(e)})
@@ -80,14 +77,14 @@ class ScheduleListController(APIHandler):
             region_id = self.get_argument("region_id")
             page_size = self.get_argument("page_size")
             next_page_token = self.get_argument("page_token", default=None)
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                schedules = await client.list_schedules(
-                    region_id, page_size, next_page_token
-                )
-                self.finish(json.dumps(schedules))
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            schedules = await coalesce.coalesced(
+                self,
+                lambda: client.list_schedules(region_id, page_size, next_page_token),
+            )
+            http_cache.finish_cached(self, schedules, http_cache.RUN_LIST_MAX_AGE)
         except Exception as e:
             self.log.exception(f"Error fetching list of schedules: {str(e)}")
             self.finish({"error": str(e)})
@@ -100,12 +97,11 @@ class SchedulePauseController(APIHandler):
         try:
             region_id = self.get_argument("region_id")
             schedule_id = self.get_argument("schedule_id")
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                resp = await client.pause_schedule(region_id, schedule_id)
-                self.finish(json.dumps(resp))
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            resp = await client.pause_schedule(region_id, schedule_id)
+            self.finish(json.dumps(resp))
         except Exception as e:
             self.log.exception(f"Error pausing the schedule: {str(e)}")
             self.finish({"error": str(e)})
@@ -118,13 +114,12 @@ class ScheduleResumeController(APIHandler):
         try:
             region_id = self.get_argument("region_id")
             schedule_id = self.get_argument("schedule_id")
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
 
-                resp = await client.resume_schedule(region_id, schedule_id)
-                self.finish(json.dumps(resp))
+            resp = await client.resume_schedule(region_id, schedule_id)
+            self.finish(json.dumps(resp))
         except Exception as e:
             self.log.exception(f"Error resuming the schedule: {str(e)}")
             self.finish({"error": str(e)})
@@ -137,13 +132,12 @@ class ScheduleDeleteController(APIHandler):
         try:
             region_id = self.get_argument("region_id")
             schedule_id = self.get_argument("schedule_id")
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
 
-                resp = await client.delete_schedule(region_id, schedule_id)
-                self.finish(json.dumps(resp))
+            resp = await client.delete_schedule(region_id, schedule_id)
+            self.finish(json.dumps(resp))
         except Exception as e:
             self.log.exception(f"Error deleting the schedule: {str(e)}")
             self.finish({"error": str(e)})
@@ -156,13 +150,12 @@ class ScheduleTriggerController(APIHandler):
         try:
             region_id = self.get_argument("region_id")
             schedule_id = self.get_argument("schedule_id")
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
 
-                resp = await client.trigger_schedule(region_id, schedule_id)
-                self.finish(json.dumps(resp))
+            resp = await client.trigger_schedule(region_id, schedule_id)
+            self.finish(json.dumps(resp))
         except Exception as e:
             self.log.exception(f"Error triggering the schedule: {str(e)}")
             self.finish({"error": str(e)})
@@ -176,12 +169,11 @@ class ScheduleUpdateController(APIHandler):
             region_id = self.get_argument("region_id")
             schedule_id = self.get_argument("schedule_id")
             input_data = self.get_json_body()
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                resp = await client.update_schedule(region_id, schedule_id, input_data)
-                self.finish(json.dumps(resp))
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            resp = await client.update_schedule(region_id, schedule_id, input_data)
+            self.finish(json.dumps(resp))
         except Exception as e:
             self.log.exception(f"Error updating the schedule: {str(e)}")
             self.finish({"error": str(e)})
@@ -194,12 +186,11 @@ class ScheduleGetController(APIHandler):
         try:
             region_id = self.get_argument("region_id")
             schedule_id = self.get_argument("schedule_id")
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                resp = await client.get_schedule(region_id, schedule_id)
-                self.finish(json.dumps(resp))
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            resp = await client.get_schedule(region_id, schedule_id)
+            self.finish(json.dumps(resp))
         except Exception as e:
             self.log.exception(f"Error getting the schedule: {str(e)}")
             self.finish({"error": str(e)})
@@ -208,21 +199,23 @@ class ScheduleGetController(APIHandler):
 class NotebookExecutionJobListController(APIHandler):
     @tornado.web.authenticated
     async def get(self):
-        """Returns list of notebook execution jobs"""
+        """Returns list of notebook execution jobs, streamed as they are paged"""
         try:
             region_id = self.get_argument("region_id")
             schedule_id = self.get_argument("schedule_id")
             page_size = self.get_argument("page_size", default=None)
             order_by = self.get_argument("order_by")
             start_date = self.get_argument("start_date", default=None)
-            async with aiohttp.ClientSession() as client_session:
-                client = vertex.Client(
-                    await credentials.get_cached(), self.log, client_session
-                )
-                jobs = await client.list_notebook_execution_jobs(
+            client = vertex.Client(
+                await credentials.get_cached(), self.log, sessions.get_session()
+            )
+            await responses.stream_pages(
+                self,
+                client.iter_notebook_execution_jobs(
                     region_id, schedule_id, order_by, page_size, start_date
-                )
-                self.finish(json.dumps(jobs))
+                ),
+                responses.wants_ndjson(self),
+            )
         except Exception as e:
             self.log.exception(f"Error fetching notebook execution jobs: {str(e)}")
             self.finish({"error": str(e)})
@@ -12,45 +12,126 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import datetime
+import json
+import os
+import time
+
 from google.cloud.jupyter_config.config import (
     async_get_gcloud_config,
     async_run_gcloud_subcommand,
+    clear_gcloud_cache,
 )
+from jupyter_core.paths import jupyter_data_dir
 
 import logging
 
+from scheduler_jupyter_plugin.commons import gcloud_config, metrics
+
+# Cached credentials are refreshed at least this often (in seconds) so that
+# project or region changes made outside of the plugin are eventually seen.
+CREDENTIALS_TTL = 5 * 60
+
+# Cached credentials are dropped this many seconds before the access token
+# they hold expires.
+TOKEN_EXPIRY_MARGIN = 5 * 60
+
+PROJECT_NUMBERS_FILE = os.path.join(
+    jupyter_data_dir(), "scheduler_jupyter_plugin", "project_numbers.json"
+)
+
+_cached_credentials = None
+_cached_until = 0
+_pending_refresh = None
+# Incremented by invalidate(), so that refreshes started before it do not
+# cache what they read.
+_generation = 0
+_project_numbers = None
+
 
 async def _gcp_credentials():
     """Helper method to get the project configured through gcloud"""
     return await async_get_gcloud_config("credential.access_token")
 
 
+async def _gcp_token_expiry():
+    """Helper method to get the expiry time of the gcloud access token"""
+    return await async_get_gcloud_config("credential.token_expiry")
+
+
 async def _gcp_project():
     """Helper method to get the project configured through gcloud"""
-    return await async_get_gcloud_config("configuration.properties.core.project")
+    return gcloud_config.get_property("core", "project")
+
+
+def _load_project_numbers():
+    global _project_numbers
+    if _project_numbers is None:
+        try:
+            with open(PROJECT_NUMBERS_FILE) as f:
+                _project_numbers = json.load(f)
+        except (OSError, ValueError):
+            _project_numbers = {}
+    return _project_numbers
+
+
+def _save_project_number(project, project_number):
+    project_numbers = _load_project_numbers()
+    project_numbers[project] = project_number
+    try:
+        os.makedirs(os.path.dirname(PROJECT_NUMBERS_FILE), exist_ok=True)
+        with open(PROJECT_NUMBERS_FILE, "w") as f:
+            json.dump(project_numbers, f)
+    except OSError as ex:
+        logging.warning(f"Error saving project number cache: {ex}")
 
 
-async def _gcp_project_number():
-    """Helper method to get the project number for the project configured through gcloud"""
-    project = await _gcp_project()
+async def _gcp_project_number(project=None):
+    """Helper method to get the project number for the project configured through gcloud
+
+    Project numbers never change, so they are remembered per project across
+    cache invalidations and server restarts.
+    """
+    project = project or await _gcp_project()
     if not project:
         return None
-    return await async_run_gcloud_subcommand(
-        f'projects describe {project} --format="value(projectNumber)"'
-    )
+    project_number = _load_project_numbers().get(project)
+    if not project_number:
+        with metrics.gcloud_timer("projects describe"):
+            project_number = await async_run_gcloud_subcommand(
+                f'projects describe {project} --format="value(projectNumber)"'
+            )
+        if project_number:
+            _save_project_number(project, project_number)
+    return project_number
 
 
 async def _gcp_region():
     """Helper method to get the project configured through gcloud"""
-    region = await async_get_gcloud_config("configuration.properties.dataproc.region")
+    region = gcloud_config.get_property("dataproc", "region")
     if not region:
-        region = await async_get_gcloud_config(
-            "configuration.properties.compute.region"
-        )
+        region = gcloud_config.get_property("compute", "region")
     return region
 
 
-async def get_cached():
+def _cache_deadline(token_expiry):
+    deadline = time.monotonic() + CREDENTIALS_TTL
+    if not token_expiry:
+        return deadline
+    try:
+        expiry = datetime.datetime.fromisoformat(token_expiry.replace("Z", "+00:00"))
+    except ValueError:
+        return deadline
+    remaining = (
+        expiry - datetime.datetime.now(datetime.timezone.utc)
+    ).total_seconds() - TOKEN_EXPIRY_MARGIN
+    return min(deadline, time.monotonic() + remaining)
+
+
+async def _load_credentials():
+    global _cached_credentials, _cached_until
+    generation = _generation
     credentials = {
         "project_id": "",
         "project_number": 0,
@@ -59,12 +140,16 @@ async def get_cached():
         "config_error": 0,
         "login_error": 0,
     }
+    token_expiry = None
     try:
         credentials["project_id"] = await _gcp_project()
         credentials["region_id"] = await _gcp_region()
         credentials["config_error"] = 0
         credentials["access_token"] = await _gcp_credentials()
-        credentials["project_number"] = await _gcp_project_number()
+        token_expiry = await _gcp_token_expiry()
+        credentials["project_number"] = await _gcp_project_number(
+            credentials["project_id"]
+        )
     except Exception as ex:
         logging.error(f"Error getting gcloud config: {ex}")
 
@@ -78,5 +163,34 @@ async def get_cached():
         credentials["login_error"] = 1
     elif not credentials["project_id"] or not credentials["region_id"]:
         credentials["config_error"] = 1
+    elif generation == _generation:
+        # Only complete credentials are cached, so that fixing a login or
+        # config problem takes effect on the next request.
+        _cached_credentials = credentials
+        _cached_until = _cache_deadline(token_expiry)
 
     return credentials
+
+
+async def get_cached():
+    """Returns the gcloud credentials, reusing them until they go stale.
+
+    Concurrent callers that miss the cache share a single refresh.
+    """
+    global _pending_refresh
+    if _cached_credentials is not None and time.monotonic() < _cached_until:
+        return dict(_cached_credentials)
+
+    if _pending_refresh is None or _pending_refresh.done():
+        _pending_refresh = asyncio.ensure_future(_load_credentials())
+    return dict(await asyncio.shield(_pending_refresh))
+
+
+def invalidate():
+    """Drops the cached credentials after the gcloud config was changed."""
+    global _cached_credentials, _cached_until, _pending_refresh, _generation
+    _generation += 1
+    _cached_credentials = None
+    _cached_until = 0
+    _pending_refresh = None
+    clear_gcloud_cache()
@@ -0,0 +1,30 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local emulator of the Google Cloud APIs the plugin calls.
+
+It serves the parts of the Composer, Airflow, Vertex AI and Cloud Storage
+REST APIs used by the services, over real HTTP, from a generated dataset
+of configurable size, with configurable latency and error injection. Run
+it with `python -m scheduler_jupyter_plugin.emulator` and point gcloud at
+it with the printed API endpoint overrides.
+"""
+
+from scheduler_jupyter_plugin.emulator.app import (
+    Settings,
+    create_app,
+    endpoint_overrides,
+    start,
+)
+from scheduler_jupyter_plugin.emulator.dataset import Dataset
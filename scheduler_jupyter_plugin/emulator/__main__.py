@@ -0,0 +1,82 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+
+from aiohttp import web
+
+from scheduler_jupyter_plugin.emulator import (
+    Dataset,
+    Settings,
+    create_app,
+    endpoint_overrides,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m scheduler_jupyter_plugin.emulator",
+        description="Serves emulated Composer, Airflow, Vertex AI and Cloud Storage APIs.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--project-id", default="emulator-project")
+    parser.add_argument("--region-id", default="us-central1")
+    parser.add_argument("--environments", type=int, default=1)
+    parser.add_argument("--dags", type=int, default=100, help="DAGs per environment")
+    parser.add_argument("--runs-per-dag", type=int, default=10)
+    parser.add_argument("--schedules", type=int, default=20)
+    parser.add_argument("--jobs-per-schedule", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0, help="latency added to every request"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0, help="random extra latency, up to"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="fraction of requests that fail"
+    )
+    parser.add_argument("--error-status", type=int, default=503)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    dataset = Dataset(
+        project_id=args.project_id,
+        region_id=args.region_id,
+        environments=args.environments,
+        dags=args.dags,
+        runs_per_dag=args.runs_per_dag,
+        schedules=args.schedules,
+        jobs_per_schedule=args.jobs_per_schedule,
+        seed=args.seed,
+    )
+    settings = Settings(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    base_url = f"http://{args.host}:{args.port}"
+    print("Point gcloud at the emulator with:")
+    for name, url in endpoint_overrides(base_url).items():
+        print(f"  gcloud config set api_endpoint_overrides/{name} {url}")
+    web.run_app(create_app(dataset, settings), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
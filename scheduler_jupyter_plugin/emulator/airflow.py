@@ -0,0 +1,283 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Emulated Airflow stable REST API of each Composer environment.
+
+Each environment's API is served under `/airflow/<environment>/api/v1`,
+which is the Airflow URI the emulated Composer API reports for it.
+"""
+
+import base64
+import datetime
+import fnmatch
+import json
+
+from aiohttp import web
+
+from scheduler_jupyter_plugin.emulator.common import DATASET, int_arg
+
+API_PATH = "/airflow/{environment}/api/v1"
+
+# Airflow caps page sizes at its `maximum_page_limit` setting.
+DEFAULT_PAGE_LIMIT = 100
+MAXIMUM_PAGE_LIMIT = 100
+
+
+def problem(status, title, detail=""):
+    """Returns an error in the problem+json format used by Airflow."""
+    return web.json_response(
+        {"status": status, "title": title, "detail": detail, "type": "about:blank"},
+        status=status,
+        content_type="application/problem+json",
+    )
+
+
+def not_found(title):
+    return web.HTTPNotFound(
+        text=json.dumps({"status": 404, "title": title, "type": "about:blank"}),
+        content_type="application/problem+json",
+    )
+
+
+def _limit_offset(request):
+    limit = int_arg(request, "limit", DEFAULT_PAGE_LIMIT)
+    return min(limit, MAXIMUM_PAGE_LIMIT), int_arg(request, "offset", 0)
+
+
+def _bool_arg(request, name, default=None):
+    value = request.query.get(name)
+    if value is None:
+        return default
+    return value.lower() == "true"
+
+
+def _parse_time(value):
+    # Unencoded "+" signs in query strings arrive as spaces.
+    value = value.replace(" ", "+").replace("Z", "+00:00")
+    return datetime.datetime.fromisoformat(value)
+
+
+def _order(items, order_by, default):
+    order_by = order_by or default
+    field = order_by.lstrip("-")
+    # Items without a value for the field sort last, like NULLs in Airflow.
+    present = [item for item in items if item.get(field) is not None]
+    missing = [item for item in items if item.get(field) is None]
+    present.sort(key=lambda item: item[field], reverse=order_by.startswith("-"))
+    return present + missing
+
+
+def _environment_dags(request):
+    dags = request.app[DATASET].dags.get(request.match_info["environment"])
+    if dags is None:
+        raise not_found("Environment not found")
+    return dags
+
+
+def _matching_dags(request):
+    dags = list(_environment_dags(request).values())
+    tags = set(request.query.getall("tags", []))
+    if tags:
+        dags = [
+            dag for dag in dags if tags & {tag["name"] for tag in dag.get("tags", [])}
+        ]
+    if _bool_arg(request, "only_active", True):
+        dags = [dag for dag in dags if dag["is_active"]]
+    paused = _bool_arg(request, "paused")
+    if paused is not None:
+        dags = [dag for dag in dags if dag["is_paused"] == paused]
+    pattern = request.query.get("dag_id_pattern")
+    if pattern:
+        # Airflow matches the pattern with SQL ILIKE '%pattern%'.
+        glob = f"*{pattern.replace('%', '*').replace('_', '?')}*".lower()
+        dags = [dag for dag in dags if fnmatch.fnmatchcase(dag["dag_id"].lower(), glob)]
+    return _order(dags, request.query.get("order_by"), "dag_id")
+
+
+def _dag(request):
+    dag = _environment_dags(request).get(request.match_info["dag_id"])
+    if dag is None:
+        raise not_found("DAG not found")
+    return dag
+
+
+async def list_dags(request):
+    dags = _matching_dags(request)
+    limit, offset = _limit_offset(request)
+    return web.json_response(
+        {"dags": dags[offset : offset + limit], "total_entries": len(dags)}
+    )
+
+
+def _apply_dag_update(request, dag, body):
+    update_mask = request.query.getall("update_mask", [])
+    if "is_paused" in body and (not update_mask or "is_paused" in update_mask):
+        dag["is_paused"] = bool(body["is_paused"])
+
+
+async def patch_dags(request):
+    if not request.query.get("dag_id_pattern"):
+        return problem(400, "Bad Request", "dag_id_pattern is required")
+    body = await request.json()
+    dags = _matching_dags(request)
+    limit, offset = _limit_offset(request)
+    dags = dags[offset : offset + limit]
+    for dag in dags:
+        _apply_dag_update(request, dag, body)
+    return web.json_response({"dags": dags, "total_entries": len(dags)})
+
+
+async def get_dag(request):
+    return web.json_response(_dag(request))
+
+
+async def patch_dag(request):
+    dag = _dag(request)
+    _apply_dag_update(request, dag, await request.json())
+    return web.json_response(dag)
+
+
+async def delete_dag(request):
+    _dag(request)
+    del _environment_dags(request)[request.match_info["dag_id"]]
+    return web.Response(status=204)
+
+
+def _filter_by_time(request, runs):
+    for field in ("execution_date", "start_date", "end_date"):
+        for suffix, keep in (
+            ("_gte", lambda value, bound: value >= bound),
+            ("_lte", lambda value, bound: value <= bound),
+        ):
+            bound = request.query.get(field + suffix)
+            if not bound:
+                continue
+            bound = _parse_time(bound)
+            runs = [
+                run
+                for run in runs
+                if run.get(field) and keep(_parse_time(run[field]), bound)
+            ]
+    return runs
+
+
+async def list_dag_runs(request):
+    dag = _dag(request)
+    runs = request.app[DATASET].dag_runs(
+        request.match_info["environment"], dag["dag_id"]
+    )
+    runs = _filter_by_time(request, runs)
+    states = set(request.query.getall("state", []))
+    if states:
+        runs = [run for run in runs if run["state"] in states]
+    runs = _order(runs, request.query.get("order_by"), "execution_date")
+    limit, offset = _limit_offset(request)
+    return web.json_response(
+        {"dag_runs": runs[offset : offset + limit], "total_entries": len(runs)}
+    )
+
+
+async def trigger_dag_run(request):
+    dag = _dag(request)
+    run = request.app[DATASET].trigger_dag_run(
+        request.match_info["environment"], dag["dag_id"]
+    )
+    return web.json_response(run)
+
+
+def _task_instances(request):
+    dag = _dag(request)
+    task_instances = request.app[DATASET].task_instances(
+        request.match_info["environment"],
+        dag["dag_id"],
+        request.match_info["dag_run_id"],
+    )
+    if task_instances is None:
+        raise not_found("DAG run not found")
+    return task_instances
+
+
+async def list_task_instances(request):
+    task_instances = _task_instances(request)
+    return web.json_response(
+        {"task_instances": task_instances, "total_entries": len(task_instances)}
+    )
+
+
+def _task_instance(request):
+    task_id = request.match_info["task_id"]
+    for task_instance in _task_instances(request):
+        if task_instance["task_id"] == task_id:
+            return task_instance
+    raise not_found("Task instance not found")
+
+
+async def get_task_instance(request):
+    return web.json_response(_task_instance(request))
+
+
+async def get_task_log(request):
+    task_instance = _task_instance(request)
+    content = request.app[DATASET].task_log(
+        task_instance["dag_id"],
+        task_instance["dag_run_id"],
+        task_instance["task_id"],
+        request.match_info["try_number"],
+    )
+    if "application/json" not in request.headers.get("Accept", ""):
+        return web.Response(text=content)
+    # Continuation tokens carry the log offset to continue from.
+    token = request.query.get("token")
+    offset = int(base64.urlsafe_b64decode(token).decode()) if token else 0
+    if _bool_arg(request, "full_content", False):
+        offset = 0
+    continuation_token = base64.urlsafe_b64encode(str(len(content)).encode()).decode()
+    return web.json_response(
+        {"content": content[offset:], "continuation_token": continuation_token}
+    )
+
+
+async def list_import_errors(request):
+    import_errors = request.app[DATASET].import_errors.get(
+        request.match_info["environment"]
+    )
+    if import_errors is None:
+        raise not_found("Environment not found")
+    import_errors = _order(
+        import_errors, request.query.get("order_by"), "import_error_id"
+    )
+    limit, offset = _limit_offset(request)
+    return web.json_response(
+        {
+            "import_errors": import_errors[offset : offset + limit],
+            "total_entries": len(import_errors),
+        }
+    )
+
+
+def add_routes(router):
+    dag_path = API_PATH + "/dags/{dag_id}"
+    run_path = dag_path + "/dagRuns/{dag_run_id}"
+    task_path = run_path + "/taskInstances/{task_id}"
+    router.add_get(API_PATH + "/dags", list_dags)
+    router.add_patch(API_PATH + "/dags", patch_dags)
+    router.add_get(dag_path, get_dag)
+    router.add_patch(dag_path, patch_dag)
+    router.add_delete(dag_path, delete_dag)
+    router.add_get(dag_path + "/dagRuns", list_dag_runs)
+    router.add_post(dag_path + "/dagRuns", trigger_dag_run)
+    router.add_get(run_path + "/taskInstances", list_task_instances)
+    router.add_get(task_path, get_task_instance)
+    router.add_get(task_path + "/logs/{try_number}", get_task_log)
+    router.add_get(API_PATH + "/importErrors", list_import_errors)
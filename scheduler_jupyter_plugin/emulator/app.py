@@ -0,0 +1,210 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The emulator web application, with latency and error injection."""
+
+import asyncio
+import collections
+import random
+
+from aiohttp import web
+from aiohttp.web_middlewares import normalize_path_middleware
+
+from scheduler_jupyter_plugin.commons.constants import (
+    AIPLATFORM_SERVICE_NAME,
+    COMPOSER_SERVICE_NAME,
+    STORAGE_SERVICE_NAME,
+)
+from scheduler_jupyter_plugin.emulator import airflow, composer, gcs, vertex
+from scheduler_jupyter_plugin.emulator.common import DATASET, error_response
+from scheduler_jupyter_plugin.emulator.dataset import Dataset
+
+
+class Settings:
+    """Latency and error injection applied to every emulated request.
+
+    Each request is delayed by `latency` seconds plus up to `jitter` more,
+    unless `surface_latency` has a latency for its surface, and fails with
+    `error_status` with probability `error_rate` (or the surface's entry in
+    `surface_error_rate`).
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        error_status=503,
+        surface_latency=None,
+        surface_error_rate=None,
+        seed=None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.surface_latency = dict(surface_latency or {})
+        self.surface_error_rate = dict(surface_error_rate or {})
+        self._random = random.Random(seed)
+
+    def update(self, values):
+        for name in (
+            "latency",
+            "jitter",
+            "error_rate",
+            "error_status",
+            "surface_latency",
+            "surface_error_rate",
+        ):
+            if name in values:
+                setattr(self, name, values[name])
+
+    def delay(self, surface):
+        latency = self.surface_latency.get(surface, self.latency)
+        if self.jitter:
+            latency += self._random.uniform(0, self.jitter)
+        return latency
+
+    def should_fail(self, surface):
+        error_rate = self.surface_error_rate.get(surface, self.error_rate)
+        return error_rate > 0 and self._random.random() < error_rate
+
+    def to_dict(self):
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "error_rate": self.error_rate,
+            "error_status": self.error_status,
+            "surface_latency": self.surface_latency,
+            "surface_error_rate": self.surface_error_rate,
+        }
+
+
+class Stats:
+    def __init__(self):
+        self.requests = collections.Counter()
+        self.injected_errors = collections.Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def to_dict(self):
+        return {
+            "requests": dict(self.requests),
+            "injected_errors": dict(self.injected_errors),
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+SETTINGS = web.AppKey("settings", Settings)
+STATS = web.AppKey("stats", Stats)
+
+
+def surface_for_path(path):
+    if path.startswith("/airflow/"):
+        return "airflow"
+    if path.startswith(("/storage/", "/upload/storage/")):
+        return "gcs"
+    if "/environments" in path:
+        return "composer"
+    if path.startswith(("/v1/", "/ui/")):
+        return "vertex"
+    return None
+
+
+@web.middleware
+async def fault_middleware(request, handler):
+    surface = surface_for_path(request.path)
+    if surface is None:
+        return await handler(request)
+    settings = request.app[SETTINGS]
+    stats = request.app[STATS]
+    stats.requests[surface] += 1
+    stats.in_flight += 1
+    stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+    try:
+        delay = settings.delay(surface)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if settings.should_fail(surface):
+            stats.injected_errors[surface] += 1
+            return error_response(settings.error_status, "Injected error")
+        return await handler(request)
+    finally:
+        stats.in_flight -= 1
+
+
+async def get_stats(request):
+    return web.json_response(request.app[STATS].to_dict())
+
+
+async def get_settings(request):
+    return web.json_response(request.app[SETTINGS].to_dict())
+
+
+async def update_settings(request):
+    settings = request.app[SETTINGS]
+    settings.update(await request.json())
+    return web.json_response(settings.to_dict())
+
+
+def create_app(dataset=None, settings=None):
+    """Returns the emulator application serving `dataset`.
+
+    The `/_emulator/stats` endpoint reports request counts, and the latency
+    and error injection settings can be changed at runtime with a PATCH to
+    `/_emulator/settings`.
+    """
+    app = web.Application(
+        middlewares=[
+            # Some clients join base URLs and paths with a double slash.
+            normalize_path_middleware(append_slash=False, merge_slashes=True),
+            fault_middleware,
+        ]
+    )
+    app[DATASET] = dataset or Dataset()
+    app[SETTINGS] = settings or Settings()
+    app[STATS] = Stats()
+    app.router.add_get("/_emulator/stats", get_stats)
+    app.router.add_get("/_emulator/settings", get_settings)
+    app.router.add_patch("/_emulator/settings", update_settings)
+    composer.add_routes(app.router)
+    airflow.add_routes(app.router)
+    vertex.add_routes(app.router)
+    gcs.add_routes(app.router)
+    return app
+
+
+def endpoint_overrides(base_url):
+    """Returns the gcloud API endpoint overrides that point at the emulator.
+
+    They can be set with `gcloud config set api_endpoint_overrides/<name>`
+    or as `CLOUDSDK_API_ENDPOINT_OVERRIDES_<NAME>` environment variables.
+    """
+    base_url = base_url.rstrip("/")
+    return {
+        COMPOSER_SERVICE_NAME: f"{base_url}/",
+        AIPLATFORM_SERVICE_NAME: f"{base_url}/",
+        STORAGE_SERVICE_NAME: f"{base_url}/storage/v1/",
+    }
+
+
+async def start(app, host="127.0.0.1", port=0):
+    """Serves `app` and returns the runner and the base URL it is served on."""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://{host}:{port}"
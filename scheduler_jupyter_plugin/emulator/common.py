@@ -0,0 +1,70 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers shared by the emulated REST surfaces."""
+
+from aiohttp import web
+
+from scheduler_jupyter_plugin.emulator.dataset import Dataset
+
+DATASET = web.AppKey("dataset", Dataset)
+
+# Google APIs report errors with these status names.
+ERROR_STATUS_NAMES = {
+    400: "INVALID_ARGUMENT",
+    403: "PERMISSION_DENIED",
+    404: "NOT_FOUND",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+}
+
+
+def origin(request):
+    """Returns the scheme and host the emulator was reached on."""
+    return f"{request.scheme}://{request.host}"
+
+
+def error_response(status, message):
+    """Returns an error in the format used by Google APIs."""
+    return web.json_response(
+        {
+            "error": {
+                "code": status,
+                "message": message,
+                "status": ERROR_STATUS_NAMES.get(status, "UNKNOWN"),
+            }
+        },
+        status=status,
+    )
+
+
+def int_arg(request, name, default):
+    try:
+        return int(request.query.get(name, default))
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"Invalid {name}")
+
+
+def token_page(request, items, default_page_size, size_arg="pageSize"):
+    """Returns one page of `items` and the token of the next page, if any.
+
+    Page tokens are the offset of the page, as Google APIs treat them as
+    opaque strings.
+    """
+    page_size = int_arg(request, size_arg, default_page_size) or default_page_size
+    offset = int_arg(request, "pageToken", 0)
+    page = items[offset : offset + page_size]
+    next_offset = offset + page_size
+    return page, str(next_offset) if next_offset < len(items) else None
@@ -0,0 +1,65 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Emulated Cloud Composer environments API.
+
+Environments are served for whatever project and region are asked for.
+"""
+
+import copy
+
+from aiohttp import web
+
+from scheduler_jupyter_plugin.emulator.common import (
+    DATASET,
+    error_response,
+    origin,
+    token_page,
+)
+
+ENVIRONMENTS_PATH = "/v1/projects/{project}/locations/{region}/environments"
+
+
+def _with_airflow_uri(request, environment):
+    environment = copy.deepcopy(environment)
+    name = environment["name"].rsplit("/", 1)[-1]
+    environment["config"]["airflowUri"] = f"{origin(request)}/airflow/{name}"
+    return environment
+
+
+async def list_environments(request):
+    dataset = request.app[DATASET]
+    page, next_page_token = token_page(
+        request, list(dataset.environments.values()), 100
+    )
+    resp = {
+        "environments": [_with_airflow_uri(request, env) for env in page],
+    }
+    if next_page_token:
+        resp["nextPageToken"] = next_page_token
+    return web.json_response(resp)
+
+
+async def get_environment(request):
+    environment = request.app[DATASET].environments.get(
+        request.match_info["environment"]
+    )
+    if environment is None:
+        return error_response(404, "Environment not found")
+    return web.json_response(_with_airflow_uri(request, environment))
+
+
+def add_routes(router):
+    router.add_get(ENVIRONMENTS_PATH, list_environments)
+    router.add_get(ENVIRONMENTS_PATH + "/{environment}", get_environment)
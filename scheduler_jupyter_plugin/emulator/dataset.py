@@ -0,0 +1,504 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generated data served by the upstream emulator.
+
+Everything is derived from a seed, so the same settings always produce the
+same dataset. Only the DAG list is built up front; runs, task instances,
+logs, execution jobs and DAG files are generated the first time they are
+requested, which keeps datasets with hundreds of thousands of runs cheap.
+"""
+
+import base64
+import datetime
+import itertools
+import random
+
+import google_crc32c
+
+from scheduler_jupyter_plugin.commons.constants import TAGS
+
+DAG_RUN_STATES = ["success", "success", "success", "failed", "running", "queued"]
+EXECUTION_JOB_STATES = [
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_RUNNING",
+]
+TASK_IDS = ["start_cluster", "process_notebook", "stop_cluster"]
+MACHINE_TYPES = [
+    ("n1-standard-4", 4, 15 * 2**30),
+    ("n1-standard-8", 8, 30 * 2**30),
+    ("n1-highmem-16", 16, 104 * 2**30),
+]
+WORKBENCH_LABEL = "aiplatform.googleapis.com/colab_enterprise_entry_service"
+
+DAG_FILE_TEMPLATE = """from datetime import datetime, timedelta
+from airflow import DAG
+
+input_notebook = 'gs://{bucket}/dataproc-notebooks/{dag_id}/input_notebooks/{dag_id}.ipynb'
+parameters = '''
+param1:value1
+param2:value2
+'''
+serverless_name = 'projects/{project_id}/locations/{region_id}/batches/{dag_id}'
+stop_cluster_check = 'False'
+time_zone = 'UTC'
+
+default_args = {{
+    'owner': 'emulator',
+    'start_date': datetime(2025, 1, 1),
+    'email': ['owner@example.com'],
+    'email_on_failure': True,
+    'email_on_retry': False,
+    'email_on_success': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=int('5')),
+}}
+
+dag = DAG(
+    '{dag_id}',
+    default_args=default_args,
+    schedule_interval='{schedule}',
+)
+"""
+
+
+def format_time(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def format_rfc3339(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def crc32c(data):
+    return base64.b64encode(google_crc32c.Checksum(data).digest()).decode("ascii")
+
+
+class StoredObject:
+    def __init__(self, bucket, name, data, generation, content_type):
+        self.bucket = bucket
+        self.name = name
+        self.data = data
+        self.generation = generation
+        self.content_type = content_type
+        self.updated = datetime.datetime.now(datetime.timezone.utc)
+
+    def metadata(self):
+        return {
+            "kind": "storage#object",
+            "id": f"{self.bucket}/{self.name}/{self.generation}",
+            "name": self.name,
+            "bucket": self.bucket,
+            "generation": str(self.generation),
+            "contentType": self.content_type,
+            "size": str(len(self.data)),
+            "crc32c": crc32c(self.data),
+            "updated": format_rfc3339(self.updated),
+        }
+
+
+class Dataset:
+    """The Composer, Airflow, Vertex and Cloud Storage state of the emulator.
+
+    `dags` DAGs with `runs_per_dag` runs each are created in each of the
+    `environments` Composer environments, and `schedules` Vertex schedules
+    with `jobs_per_schedule` execution jobs each.
+    """
+
+    def __init__(
+        self,
+        project_id="emulator-project",
+        region_id="us-central1",
+        environments=1,
+        dags=100,
+        runs_per_dag=10,
+        schedules=20,
+        jobs_per_schedule=10,
+        import_errors=5,
+        log_lines=200,
+        seed=0,
+        now=None,
+    ):
+        self.project_id = project_id
+        self.region_id = region_id
+        self.runs_per_dag = runs_per_dag
+        self.jobs_per_schedule = jobs_per_schedule
+        self.log_lines = log_lines
+        self.seed = seed
+        self.now = (now or datetime.datetime.now(datetime.timezone.utc)).replace(
+            minute=0, second=0, microsecond=0
+        )
+        self.environments = {}
+        for index in range(environments):
+            name = f"emulator-env-{index}"
+            self.environments[name] = self._environment(name, index)
+        self.dags = {name: self._dags(name, dags) for name in self.environments.keys()}
+        self.import_errors = {
+            name: self._import_errors(name, import_errors)
+            for name in self.environments.keys()
+        }
+        self.schedules = self._schedules(schedules)
+        self.buckets = {
+            environment["storageConfig"]["bucket"]: {}
+            for environment in self.environments.values()
+        }
+        self._runs = {}
+        self._jobs = {}
+        self._deleted_objects = set()
+        # Maps an upload id to the bucket, object name and bytes received
+        # so far of a resumable upload.
+        self.uploads = {}
+        self._generations = itertools.count(1)
+        self._ids = itertools.count(1)
+
+    def _random(self, *key):
+        return random.Random(":".join(str(part) for part in (self.seed, *key)))
+
+    def _environment(self, name, index):
+        parent = f"projects/{self.project_id}/locations/{self.region_id}"
+        return {
+            "name": f"{parent}/environments/{name}",
+            "uuid": f"00000000-0000-0000-0000-{index:012d}",
+            "state": "RUNNING",
+            "config": {
+                "softwareConfig": {
+                    "imageVersion": "composer-2.9.7-airflow-2.9.3",
+                    "pypiPackages": {"apache-airflow-providers-papermill": ""},
+                },
+                # The Airflow URI is filled in per request, as it depends on
+                # the address the emulator is reached on.
+                "airflowUri": "",
+            },
+            "storageConfig": {"bucket": f"{name}-bucket"},
+            "createTime": format_rfc3339(self.now - datetime.timedelta(days=30)),
+        }
+
+    def _dags(self, environment, count):
+        dags = {}
+        for index in range(count):
+            rng = self._random("dag", environment, index)
+            dag_id = f"emulator_dag_{index:06d}"
+            schedule = rng.choice(["0 * * * *", "0 0 * * *", "*/15 * * * *"])
+            dags[dag_id] = {
+                "dag_id": dag_id,
+                "root_dag_id": None,
+                "description": f"Emulated notebook job {index}",
+                "file_token": f"token-{dag_id}",
+                "fileloc": f"/home/airflow/gcs/dags/dag_{dag_id}.py",
+                "is_active": True,
+                "is_paused": rng.random() < 0.1,
+                "is_subdag": False,
+                "owners": ["emulator"],
+                "schedule_interval": {"__type": "CronExpression", "value": schedule},
+                "timetable_description": schedule,
+                "tags": [{"name": TAGS}],
+                "last_parsed_time": format_time(self.now),
+                "next_dagrun": format_time(self.now + datetime.timedelta(hours=1)),
+                "has_import_errors": False,
+            }
+        return dags
+
+    def _import_errors(self, environment, count):
+        return [
+            {
+                "import_error_id": index + 1,
+                "filename": f"/home/airflow/gcs/dags/dag_broken_{index}.py",
+                "stack_trace": "Traceback (most recent call last):\n"
+                "ModuleNotFoundError: No module named 'missing'",
+                "timestamp": format_time(self.now - datetime.timedelta(hours=index)),
+            }
+            for index in range(count)
+        ]
+
+    def _schedules(self, count):
+        parent = f"projects/{self.project_id}/locations/{self.region_id}"
+        schedules = {}
+        for index in range(count):
+            rng = self._random("schedule", index)
+            schedule_id = str(1000000 + index)
+            cron = rng.choice(["0 * * * *", "0 0 * * *", "30 6 * * 1"])
+            created = self.now - datetime.timedelta(days=rng.randint(1, 90))
+            schedules[schedule_id] = {
+                "name": f"{parent}/schedules/{schedule_id}",
+                "displayName": f"emulator-schedule-{index}",
+                "cron": cron,
+                "state": "PAUSED" if rng.random() < 0.1 else "ACTIVE",
+                "maxConcurrentRunCount": "1",
+                "createTime": format_rfc3339(created),
+                "updateTime": format_rfc3339(created),
+                "nextRunTime": format_rfc3339(self.now + datetime.timedelta(hours=1)),
+                "startedRunCount": str(self.jobs_per_schedule),
+                "lastScheduledRunResponse": {
+                    "scheduledRunTime": format_rfc3339(self.now),
+                    "runResponse": "OK",
+                },
+                "createNotebookExecutionJobRequest": {
+                    "parent": parent,
+                    "notebookExecutionJob": {
+                        "displayName": f"emulator-schedule-{index}",
+                        "labels": {WORKBENCH_LABEL: "workbench"},
+                        "gcsNotebookSource": {
+                            "uri": f"gs://emulator-vertex/notebooks/{index}.ipynb"
+                        },
+                        "gcsOutputUri": f"gs://emulator-vertex/output/{index}",
+                        "customEnvironmentSpec": {
+                            "machineSpec": {"machineType": MACHINE_TYPES[0][0]}
+                        },
+                        "workbenchRuntime": {},
+                        "kernelName": "python3",
+                    },
+                },
+            }
+        return schedules
+
+    def next_id(self):
+        return next(self._ids)
+
+    # Airflow
+
+    def _run(self, dag_id, run_index, rng):
+        start = self.now - datetime.timedelta(hours=run_index)
+        state = "success" if run_index > 1 else rng.choice(DAG_RUN_STATES)
+        if run_index > 1 and rng.random() < 0.1:
+            state = "failed"
+        end = start + datetime.timedelta(minutes=rng.randint(1, 30))
+        return {
+            "dag_id": dag_id,
+            "dag_run_id": f"scheduled__{format_time(start)}",
+            "run_type": "scheduled",
+            "state": state,
+            "execution_date": format_time(start),
+            "logical_date": format_time(start),
+            "start_date": format_time(start),
+            "end_date": None if state in ("running", "queued") else format_time(end),
+            "data_interval_start": format_time(start - datetime.timedelta(hours=1)),
+            "data_interval_end": format_time(start),
+            "external_trigger": False,
+            "conf": {},
+            "note": None,
+        }
+
+    def dag_runs(self, environment, dag_id):
+        """Returns the runs of a DAG, newest first."""
+        key = (environment, dag_id)
+        runs = self._runs.get(key)
+        if runs is None:
+            rng = self._random("runs", environment, dag_id)
+            runs = [self._run(dag_id, index, rng) for index in range(self.runs_per_dag)]
+            self._runs[key] = runs
+        return runs
+
+    def trigger_dag_run(self, environment, dag_id):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        run = {
+            "dag_id": dag_id,
+            "dag_run_id": f"manual__{format_time(now)}",
+            "run_type": "manual",
+            "state": "queued",
+            "execution_date": format_time(now),
+            "logical_date": format_time(now),
+            "start_date": None,
+            "end_date": None,
+            "data_interval_start": format_time(now),
+            "data_interval_end": format_time(now),
+            "external_trigger": True,
+            "conf": {},
+            "note": None,
+        }
+        self.dag_runs(environment, dag_id).insert(0, run)
+        return run
+
+    def task_instances(self, environment, dag_id, dag_run_id):
+        run = next(
+            (
+                run
+                for run in self.dag_runs(environment, dag_id)
+                if run["dag_run_id"] == dag_run_id
+            ),
+            None,
+        )
+        if run is None:
+            return None
+        rng = self._random("tasks", environment, dag_id, dag_run_id)
+        task_instances = []
+        state = run["state"]
+        for index, task_id in enumerate(TASK_IDS):
+            if state in ("running", "queued"):
+                task_state = (
+                    "success" if index == 0 else (state if index == 1 else None)
+                )
+            elif state == "failed":
+                task_state = "success" if index == 0 else "failed"
+            else:
+                task_state = "success"
+            duration = rng.uniform(5, 600)
+            task_instances.append(
+                {
+                    "task_id": task_id,
+                    "dag_id": dag_id,
+                    "dag_run_id": dag_run_id,
+                    "execution_date": run["execution_date"],
+                    "start_date": run["start_date"],
+                    "end_date": run["end_date"],
+                    "duration": duration if task_state else None,
+                    "state": task_state,
+                    "try_number": 2 if task_state == "failed" else 1,
+                    "max_tries": 1,
+                    "map_index": -1,
+                    "operator": "PythonOperator",
+                    "queue": "default",
+                    "pool": "default_pool",
+                }
+            )
+        return task_instances
+
+    def task_log(self, dag_id, dag_run_id, task_id, try_number):
+        lines = [
+            f"[{format_time(self.now)}] {{taskinstance.py:{1000 + index}}} INFO - "
+            f"{dag_id}/{dag_run_id}/{task_id} try {try_number}: log line {index}"
+            for index in range(self.log_lines)
+        ]
+        return "\n".join(lines) + "\n"
+
+    # Vertex
+
+    def _execution_job(self, schedule, index, rng):
+        created = self.now - datetime.timedelta(hours=index)
+        schedule_id = schedule["name"].rsplit("/", 1)[-1]
+        job_id = f"{schedule_id}{index:06d}"
+        state = "JOB_STATE_SUCCEEDED" if index else rng.choice(EXECUTION_JOB_STATES)
+        return {
+            "name": f"projects/{self.project_id}/locations/{self.region_id}/notebookExecutionJobs/{job_id}",
+            "displayName": schedule["displayName"],
+            "scheduleResourceName": schedule["name"],
+            "jobState": state,
+            "createTime": format_rfc3339(created),
+            "updateTime": format_rfc3339(
+                created + datetime.timedelta(minutes=rng.randint(1, 30))
+            ),
+            "gcsNotebookSource": schedule["createNotebookExecutionJobRequest"][
+                "notebookExecutionJob"
+            ]["gcsNotebookSource"],
+            "gcsOutputUri": f"gs://emulator-vertex/output/{job_id}",
+            "labels": {WORKBENCH_LABEL: "workbench"},
+        }
+
+    def execution_jobs(self, schedule_id):
+        """Returns the execution jobs of a schedule, newest first."""
+        jobs = self._jobs.get(schedule_id)
+        if jobs is None:
+            schedule = self.schedules.get(schedule_id)
+            if schedule is None:
+                return []
+            rng = self._random("jobs", schedule_id)
+            jobs = [
+                self._execution_job(schedule, index, rng)
+                for index in range(self.jobs_per_schedule)
+            ]
+            self._jobs[schedule_id] = jobs
+        return jobs
+
+    def add_schedule(self, schedule):
+        """Stores a new schedule, which starts without execution jobs."""
+        schedule_id = str(2000000 + self.next_id())
+        now = format_rfc3339(datetime.datetime.now(datetime.timezone.utc))
+        schedule.update(
+            {
+                "name": f"projects/{self.project_id}/locations/{self.region_id}/schedules/{schedule_id}",
+                "state": "ACTIVE",
+                "createTime": now,
+                "updateTime": now,
+            }
+        )
+        self.schedules[schedule_id] = schedule
+        self._jobs[schedule_id] = []
+        return schedule
+
+    def add_execution_job(self, job):
+        job_id = str(3000000 + self.next_id())
+        now = format_rfc3339(datetime.datetime.now(datetime.timezone.utc))
+        job.update(
+            {
+                "name": f"projects/{self.project_id}/locations/{self.region_id}/notebookExecutionJobs/{job_id}",
+                "jobState": "JOB_STATE_PENDING",
+                "createTime": now,
+                "updateTime": now,
+            }
+        )
+        schedule_id = (job.get("scheduleResourceName") or "").rsplit("/", 1)[-1]
+        if schedule_id in self.schedules:
+            self.execution_jobs(schedule_id).insert(0, job)
+        return job
+
+    def ui_config(self):
+        return {
+            "notebookRuntimeConfig": {
+                "machineConfigs": [
+                    {
+                        "machineType": machine_type,
+                        "cpuCount": cpu_count,
+                        "ramBytes": str(ram_bytes),
+                        "acceleratorConfigs": [],
+                    }
+                    for machine_type, cpu_count, ram_bytes in MACHINE_TYPES
+                ]
+            }
+        }
+
+    # Cloud Storage
+
+    def _dag_file(self, bucket, name):
+        if not (name.startswith("dags/dag_") and name.endswith(".py")):
+            return None
+        dag_id = name[len("dags/dag_") : -len(".py")]
+        for environment, dags in self.dags.items():
+            dag = dags.get(dag_id)
+            environment_bucket = self.environments[environment]["storageConfig"]
+            if dag and environment_bucket["bucket"] == bucket:
+                return DAG_FILE_TEMPLATE.format(
+                    bucket=bucket,
+                    dag_id=dag_id,
+                    project_id=self.project_id,
+                    region_id=self.region_id,
+                    schedule=dag["schedule_interval"]["value"],
+                ).encode()
+        return None
+
+    def get_object(self, bucket, name):
+        """Returns the stored object, generating DAG files on first access."""
+        objects = self.buckets.get(bucket)
+        if objects is None:
+            return None
+        stored = objects.get(name)
+        if stored is None and (bucket, name) not in self._deleted_objects:
+            data = self._dag_file(bucket, name)
+            if data is not None:
+                stored = self.put_object(bucket, name, data, "text/x-python")
+        return stored
+
+    def put_object(self, bucket, name, data, content_type="application/octet-stream"):
+        stored = StoredObject(bucket, name, data, next(self._generations), content_type)
+        self.buckets.setdefault(bucket, {})[name] = stored
+        self._deleted_objects.discard((bucket, name))
+        return stored
+
+    def delete_object(self, bucket, name):
+        if self.get_object(bucket, name) is None:
+            return False
+        del self.buckets[bucket][name]
+        self._deleted_objects.add((bucket, name))
+        return True
@@ -0,0 +1,178 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Emulated Cloud Storage JSON API.
+
+Covers buckets, object metadata, ranged media downloads and resumable
+uploads, including the CRC32C checks the plugin relies on.
+"""
+
+from aiohttp import web
+
+from scheduler_jupyter_plugin.emulator.common import (
+    DATASET,
+    error_response,
+    origin,
+    token_page,
+)
+from scheduler_jupyter_plugin.emulator.dataset import crc32c
+
+BUCKETS_PATH = "/storage/v1/b"
+OBJECTS_PATH = "/storage/v1/b/{bucket}/o"
+UPLOAD_PATH = "/upload/storage/v1/b/{bucket}/o"
+
+
+async def list_buckets(request):
+    names = sorted(request.app[DATASET].buckets.keys())
+    page, next_page_token = token_page(request, names, 1000, "maxResults")
+    resp = {"kind": "storage#buckets", "items": [{"name": name} for name in page]}
+    if next_page_token:
+        resp["nextPageToken"] = next_page_token
+    return web.json_response(resp)
+
+
+async def create_bucket(request):
+    buckets = request.app[DATASET].buckets
+    name = (await request.json()).get("name")
+    if not name:
+        return error_response(400, "Bucket name is required")
+    if name in buckets:
+        return error_response(409, "Bucket already exists")
+    buckets[name] = {}
+    return web.json_response({"kind": "storage#bucket", "name": name})
+
+
+async def list_objects(request):
+    objects = request.app[DATASET].buckets.get(request.match_info["bucket"])
+    if objects is None:
+        return error_response(404, "Bucket not found")
+    prefix = request.query.get("prefix", "")
+    names = sorted(name for name in objects.keys() if name.startswith(prefix))
+    page, next_page_token = token_page(request, names, 1000, "maxResults")
+    resp = {
+        "kind": "storage#objects",
+        "items": [objects[name].metadata() for name in page],
+    }
+    if next_page_token:
+        resp["nextPageToken"] = next_page_token
+    return web.json_response(resp)
+
+
+def _object(request):
+    stored = request.app[DATASET].get_object(
+        request.match_info["bucket"], request.match_info["object"]
+    )
+    generation = request.query.get("generation")
+    if stored is None or (generation and generation != str(stored.generation)):
+        return None
+    return stored
+
+
+async def get_object(request):
+    stored = _object(request)
+    if stored is None:
+        return error_response(404, "No such object")
+    if request.query.get("alt") != "media":
+        return web.json_response(stored.metadata())
+    headers = {
+        "x-goog-generation": str(stored.generation),
+        "x-goog-hash": f"crc32c={crc32c(stored.data)}",
+        "Content-Type": stored.content_type,
+    }
+    range_header = request.headers.get("Range", "")
+    if range_header.startswith("bytes=") and range_header.endswith("-"):
+        offset = int(range_header[len("bytes=") : -1])
+        if offset >= len(stored.data):
+            return error_response(416, "Requested range not satisfiable")
+        headers["Content-Range"] = (
+            f"bytes {offset}-{len(stored.data) - 1}/{len(stored.data)}"
+        )
+        return web.Response(body=stored.data[offset:], status=206, headers=headers)
+    return web.Response(body=stored.data, headers=headers)
+
+
+async def delete_object(request):
+    deleted = request.app[DATASET].delete_object(
+        request.match_info["bucket"], request.match_info["object"]
+    )
+    if not deleted:
+        return error_response(404, "No such object")
+    return web.Response(status=204)
+
+
+async def start_upload(request):
+    dataset = request.app[DATASET]
+    bucket = request.match_info["bucket"]
+    if bucket not in dataset.buckets:
+        return error_response(404, "Bucket not found")
+    name = request.query.get("name")
+    if not name:
+        name = (await request.json()).get("name")
+    if request.query.get("uploadType") == "media":
+        stored = dataset.put_object(bucket, name, await request.read())
+        return web.json_response(stored.metadata())
+    upload_id = str(dataset.next_id())
+    dataset.uploads[upload_id] = {"bucket": bucket, "name": name, "data": bytearray()}
+    location = request.rel_url.with_query(
+        {"uploadType": "resumable", "upload_id": upload_id}
+    )
+    return web.Response(headers={"Location": f"{origin(request)}{location}"})
+
+
+def _parse_content_range(value):
+    """Returns the first byte, last byte and total size of a Content-Range.
+
+    The first and last bytes are None for `bytes */<size>`.
+    """
+    byte_range, _, size = value.partition(" ")[2].partition("/")
+    size = None if size == "*" else int(size)
+    if byte_range == "*":
+        return None, None, size
+    first, _, last = byte_range.partition("-")
+    return int(first), int(last), size
+
+
+async def upload_chunk(request):
+    dataset = request.app[DATASET]
+    upload = dataset.uploads.get(request.query.get("upload_id"))
+    if upload is None:
+        return error_response(404, "No such upload")
+    first, last, size = _parse_content_range(request.headers.get("Content-Range", ""))
+    chunk = await request.read()
+    data = upload["data"]
+    if first is not None:
+        if first > len(data):
+            return error_response(400, "Upload chunk does not follow the last one")
+        data[first:] = chunk[: last - first + 1]
+    if size is None or len(data) < size:
+        headers = {"Range": f"bytes=0-{len(data) - 1}"} if data else {}
+        return web.Response(status=308, headers=headers)
+    data = bytes(data)
+    del dataset.uploads[request.query["upload_id"]]
+    expected_hash = request.headers.get("X-Goog-Hash", "")
+    if expected_hash.startswith("crc32c=") and expected_hash[7:] != crc32c(data):
+        return error_response(400, "Provided CRC32C does not match the data")
+    stored = dataset.put_object(upload["bucket"], upload["name"], data)
+    return web.json_response(stored.metadata())
+
+
+def add_routes(router):
+    object_path = OBJECTS_PATH + "/{object:.+}"
+    router.add_get(BUCKETS_PATH, list_buckets)
+    router.add_post(BUCKETS_PATH, create_bucket)
+    router.add_get(OBJECTS_PATH, list_objects)
+    router.add_get(object_path, get_object)
+    router.add_delete(object_path, delete_object)
+    router.add_post(UPLOAD_PATH, start_upload)
+    router.add_put(UPLOAD_PATH, upload_chunk)
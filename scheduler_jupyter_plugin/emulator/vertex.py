@@ -0,0 +1,167 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Emulated Vertex AI schedules, notebook execution jobs and UI config."""
+
+import datetime
+
+from aiohttp import web
+
+from scheduler_jupyter_plugin.emulator.common import (
+    DATASET,
+    error_response,
+    token_page,
+)
+from scheduler_jupyter_plugin.emulator.dataset import format_rfc3339
+
+LOCATION_PATH = "/v1/projects/{project}/locations/{region}"
+
+
+def _now():
+    return format_rfc3339(datetime.datetime.now(datetime.timezone.utc))
+
+
+def _operation(request, resource_name, metadata=None):
+    dataset = request.app[DATASET]
+    parent = f"projects/{dataset.project_id}/locations/{dataset.region_id}"
+    operation = {
+        "name": f"{parent}/operations/{dataset.next_id()}",
+        "done": True,
+        "response": {"name": resource_name},
+    }
+    if metadata:
+        operation["metadata"] = metadata
+    return operation
+
+
+async def list_schedules(request):
+    schedules = sorted(
+        request.app[DATASET].schedules.values(),
+        key=lambda schedule: schedule["createTime"],
+        reverse=True,
+    )
+    page, next_page_token = token_page(request, schedules, 100)
+    resp = {"schedules": page}
+    if next_page_token:
+        resp["nextPageToken"] = next_page_token
+    return web.json_response(resp)
+
+
+async def create_schedule(request):
+    schedule = request.app[DATASET].add_schedule(await request.json())
+    return web.json_response(schedule)
+
+
+def _schedule_id(request):
+    return request.match_info["schedule"].partition(":")[0]
+
+
+async def get_schedule(request):
+    schedule = request.app[DATASET].schedules.get(_schedule_id(request))
+    if schedule is None:
+        return error_response(404, "Schedule not found")
+    return web.json_response(schedule)
+
+
+async def update_schedule(request):
+    schedule = request.app[DATASET].schedules.get(_schedule_id(request))
+    if schedule is None:
+        return error_response(404, "Schedule not found")
+    update = await request.json()
+    update_mask = request.query.get("updateMask")
+    fields = update_mask.split(",") if update_mask else list(update.keys())
+    for field in fields:
+        if field in update:
+            schedule[field] = update[field]
+    schedule["updateTime"] = _now()
+    return web.json_response(schedule)
+
+
+async def delete_schedule(request):
+    schedule = request.app[DATASET].schedules.pop(_schedule_id(request), None)
+    if schedule is None:
+        return error_response(404, "Schedule not found")
+    return web.json_response(_operation(request, schedule["name"]))
+
+
+async def schedule_action(request):
+    """Handles the `:pause` and `:resume` custom methods."""
+    schedule = request.app[DATASET].schedules.get(_schedule_id(request))
+    action = request.match_info["schedule"].partition(":")[2]
+    if schedule is None:
+        return error_response(404, "Schedule not found")
+    if action == "pause":
+        schedule["state"] = "PAUSED"
+    elif action == "resume":
+        schedule["state"] = "ACTIVE"
+    else:
+        return error_response(400, f"Unknown method: {action}")
+    return web.json_response({})
+
+
+def _filter_schedule_id(filter_arg):
+    # Filters look like `schedule=<name>` or `schedule="<name>"`.
+    name, _, value = (filter_arg or "").partition("=")
+    if name.strip() != "schedule":
+        return None
+    return value.strip().strip('"').rsplit("/", 1)[-1]
+
+
+async def list_execution_jobs(request):
+    dataset = request.app[DATASET]
+    schedule_id = _filter_schedule_id(request.query.get("filter"))
+    if schedule_id is None:
+        jobs = [
+            job
+            for schedule_id in dataset.schedules.keys()
+            for job in dataset.execution_jobs(schedule_id)
+        ]
+    else:
+        jobs = dataset.execution_jobs(schedule_id)
+    order_by = request.query.get("orderBy", "createTime desc").split()
+    if order_by:
+        jobs = sorted(
+            jobs,
+            key=lambda job: job.get(order_by[0], ""),
+            reverse=order_by[-1] == "desc",
+        )
+    page, next_page_token = token_page(request, jobs, 100)
+    resp = {"notebookExecutionJobs": page}
+    if next_page_token:
+        resp["nextPageToken"] = next_page_token
+    return web.json_response(resp)
+
+
+async def create_execution_job(request):
+    job = request.app[DATASET].add_execution_job(await request.json())
+    return web.json_response(
+        _operation(request, job["name"], {"genericMetadata": {"createTime": _now()}})
+    )
+
+
+async def get_ui_config(request):
+    return web.json_response(request.app[DATASET].ui_config())
+
+
+def add_routes(router):
+    schedule_path = LOCATION_PATH + "/schedules/{schedule}"
+    router.add_get(LOCATION_PATH + "/schedules", list_schedules)
+    router.add_post(LOCATION_PATH + "/schedules", create_schedule)
+    router.add_get(schedule_path, get_schedule)
+    router.add_patch(schedule_path, update_schedule)
+    router.add_delete(schedule_path, delete_schedule)
+    router.add_post(schedule_path, schedule_action)
+    router.add_get(LOCATION_PATH + "/notebookExecutionJobs", list_execution_jobs)
+    router.add_post(LOCATION_PATH + "/notebookExecutionJobs", create_execution_job)
+    router.add_get("/ui/projects/{project}/locations/{region}/uiConfig", get_ui_config)
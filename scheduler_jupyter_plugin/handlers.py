@@ -25,24 +25,24 @@ from google.cloud.jupyter_config.config import (
 from jupyter_server.base.handlers import APIHandler
 from jupyter_server.serverapp import ServerApp
 from jupyter_server.utils import url_path_join
-from traitlets import Undefined, Unicode
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from traitlets import Dict, Float, Int, Undefined, Unicode
 from traitlets.config import SingletonConfigurable
 
-from scheduler_jupyter_plugin import credentials, urls
-from scheduler_jupyter_plugin.controllers import (
-    airflow,
-    cloudKms,
-    composer,
-    compute,
-    dataproc,
-    executor,
-    iam,
-    logEntries,
-    storage,
-    version,
-    vertex,
+from scheduler_jupyter_plugin import credentials, sessions, urls
+from scheduler_jupyter_plugin.commons import (
+    lazy,
+    metrics,
+    startup,
+    threadpool,
+    tracing,
 )
 
+# Controllers are named by "<module>.<class>" in the route table and only
+# imported on the first request to one of their routes, as they pull in the
+# Google Cloud client libraries.
+CONTROLLERS_PACKAGE = "scheduler_jupyter_plugin.controllers"
+
 
 class SchedulerPluginConfig(SingletonConfigurable):
     log_path = Unicode(
@@ -50,6 +50,52 @@ class SchedulerPluginConfig(SingletonConfigurable):
         config=True,
         help="File to log ServerApp and Scheduler Jupyter Plugin events.",
     )
+    http_connection_limit = Int(
+        sessions.DEFAULT_CONNECTION_LIMIT,
+        config=True,
+        help="Maximum number of pooled outbound HTTP connections.",
+    )
+    http_connection_limit_per_host = Int(
+        sessions.DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        config=True,
+        help="Maximum number of pooled outbound HTTP connections to a single host.",
+    )
+    http_keepalive_timeout = Float(
+        sessions.DEFAULT_KEEPALIVE_TIMEOUT,
+        config=True,
+        help="Seconds an idle pooled HTTP connection is kept open for reuse.",
+    )
+    http_dns_cache_ttl = Int(
+        sessions.DEFAULT_DNS_CACHE_TTL,
+        config=True,
+        help="Seconds resolved upstream host names are cached for.",
+    )
+    http_host_limits = Dict(
+        {},
+        config=True,
+        help="Outbound request limits per upstream host name pattern, e.g. "
+        '{"*.composer.googleusercontent.com": {"concurrency": 4, "rate": 10, '
+        '"burst": 10}}. A rate of 0 disables rate limiting. Patterns not '
+        "configured keep their default limits.",
+    )
+    trace_buffer_size = Int(
+        tracing.DEFAULT_MAX_TRACES,
+        config=True,
+        help="Number of recent request traces kept for the debug/traces endpoint.",
+    )
+    otlp_traces_endpoint = Unicode(
+        "",
+        config=True,
+        help="OTLP/HTTP endpoint of a local collector to export traces to, e.g. "
+        "http://localhost:4318/v1/traces. Traces are only kept in memory when "
+        "this is empty.",
+    )
+    sdk_thread_pools = Dict(
+        threadpool.DEFAULT_POOL_SIZES,
+        config=True,
+        help="Maximum worker threads per pool for blocking Google SDK calls, "
+        "keyed by pool name (compute, logging).",
+    )
 
 
 class SettingsHandler(APIHandler):
@@ -94,12 +140,14 @@ class LoginHandler(APIHandler):
     @tornado.web.authenticated
     async def post(self):
         cmd = "gcloud auth login"
-        process = subprocess.Popen(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True
-        )
-        output, _ = process.communicate()
+        with metrics.gcloud_timer("auth login"):
+            process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True
+            )
+            output, _ = process.communicate()
         # Check if the authentication was successful
         if process.returncode == 0:
+            credentials.invalidate()
             self.finish({"login": "SUCCEEDED"})
         else:
             self.finish({"login": "FAILED"})
@@ -113,11 +161,18 @@ class ConfigHandler(APIHandler):
         project_id = input_data["projectId"]
         region = input_data["region"]
         try:
-            await async_run_gcloud_subcommand(f"config set project {project_id}")
-            await async_run_gcloud_subcommand(f"config set dataproc/region {region}")
+            with metrics.gcloud_timer("config set"):
+                await async_run_gcloud_subcommand(f"config set project {project_id}")
+            with metrics.gcloud_timer("config set"):
+                await async_run_gcloud_subcommand(
+                    f"config set dataproc/region {region}"
+                )
             self.finish({"config": ERROR_MESSAGE + "successful"})
         except subprocess.CalledProcessError:
             self.finish({"config": ERROR_MESSAGE + "failed"})
+        finally:
+            # Either command may have changed the config before a failure.
+            credentials.invalidate()
 
 
 class UrlHandler(APIHandler):
@@ -127,10 +182,51 @@ class UrlHandler(APIHandler):
     async def get(self):
         url_map = await urls.map()
         self.log.info(f"Service URL map: {url_map}")
+        self.log.debug(f"Service URL lookup stats: {urls.lookup_stats()}")
         self.finish(url_map)
         return
 
 
+class UpstreamStatusHandler(APIHandler):
+    @tornado.web.authenticated
+    async def get(self):
+        self.finish(
+            {
+                "circuit_breakers": sessions.circuit_breakers(),
+                "host_limiters": sessions.host_limiters(),
+            }
+        )
+
+
+class MetricsHandler(APIHandler):
+    @tornado.web.authenticated
+    async def get(self):
+        self.finish(
+            generate_latest(metrics.REGISTRY), set_content_type=CONTENT_TYPE_LATEST
+        )
+
+
+class TracesHandler(APIHandler):
+    @tornado.web.authenticated
+    async def get(self):
+        limit = int(self.get_argument("limit", "50"))
+        min_duration_ms = float(self.get_argument("min_duration_ms", "0"))
+        self.finish(
+            json.dumps(
+                {
+                    "traces": tracing.recent_traces(limit, min_duration_ms),
+                    "exporter": tracing.exporter_stats(),
+                }
+            )
+        )
+
+
+class StartupHandler(APIHandler):
+    @tornado.web.authenticated
+    async def get(self):
+        self.finish(json.dumps(startup.report()))
+
+
 class LogHandler(APIHandler):
     @tornado.web.authenticated
     async def post(self):
@@ -140,6 +236,18 @@ class LogHandler(APIHandler):
         self.finish({"status": "OK"})
 
 
+def route_handler(name, handler):
+    """Returns the handler class registered for the route `name`."""
+    if isinstance(handler, str):
+        module_name, _, class_name = handler.rpartition(".")
+        return lazy.handler(
+            f"{CONTROLLERS_PACKAGE}.{module_name}",
+            class_name,
+            wrap=lambda handler_class: metrics.instrument(handler_class, name),
+        )
+    return metrics.instrument(handler, name)
+
+
 def setup_handlers(web_app):
     host_pattern = ".*$"
 
@@ -156,47 +264,58 @@ def setup_handlers(web_app):
         "configuration": ConfigHandler,
         "getGcpServiceUrls": UrlHandler,
         "log": LogHandler,
-        "composerList": composer.EnvironmentListController,
-        "getComposerEnvironment": composer.EnvironmentGetController,
-        "dagRun": airflow.DagRunController,
-        "dagRunTask": airflow.DagRunTaskController,
-        "dagRunTaskLogs": airflow.DagRunTaskLogsController,
-        "createJobScheduler": executor.ExecutorController,
-        "dagList": airflow.DagListController,
-        "dagDelete": airflow.DagDeleteController,
-        "dagUpdate": airflow.DagUpdateController,
-        "editJobScheduler": airflow.EditDagController,
-        "importErrorsList": airflow.ImportErrorController,
-        "triggerDag": airflow.TriggerDagController,
-        "downloadOutput": executor.DownloadOutputController,
-        "clusterList": dataproc.ClusterListController,
-        "runtimeList": dataproc.RuntimeController,
-        "checkRequiredPackages": executor.CheckRequiredPackagesController,
-        "api/vertex/uiConfig": vertex.UIConfigController,
-        "api/compute/region": compute.RegionController,
-        "api/compute/network": compute.NetworkController,
-        "api/compute/subNetwork": compute.SubNetworkController,
-        "api/compute/sharedNetwork": compute.SharedNetworkController,
-        "api/storage/listBucket": storage.CloudStorageController,
-        "api/iam/listServiceAccount": iam.ServiceAccountController,
-        "api/compute/getXpnHost": compute.GetXpnHostController,
-        "api/vertex/listSchedules": vertex.ScheduleListController,
-        "api/vertex/pauseSchedule": vertex.SchedulePauseController,
-        "api/vertex/resumeSchedule": vertex.ScheduleResumeController,
-        "api/vertex/deleteSchedule": vertex.ScheduleDeleteController,
-        "api/vertex/triggerSchedule": vertex.ScheduleTriggerController,
-        "api/vertex/updateSchedule": vertex.ScheduleUpdateController,
-        "api/vertex/getSchedule": vertex.ScheduleGetController,
-        "api/vertex/createJobScheduler": vertex.VertexScheduleCreateController,
-        "api/storage/createNewBucket": vertex.BucketCreateController,
-        "api/logEntries/listEntries": logEntries.LogEntiresListContoller,
-        "api/vertex/listNotebookExecutionJobs": vertex.NotebookExecutionJobListController,
-        "api/storage/downloadOutput": storage.DownloadOutputController,
-        "api/storage/outputFileExists": storage.OutputFileExistsController,
-        "jupyterlabVersion": version.LatestVersionController,
-        "updatePlugin": version.UpdatePackageController,
-        "api/cloudKms/listKeyRings": cloudKms.KeyRingsController,
-        "api/cloudKms/listCryptoKeys": cloudKms.CryptoKeysController,
+        "upstreamStatus": UpstreamStatusHandler,
+        "metrics": MetricsHandler,
+        "debug/traces": TracesHandler,
+        "debug/startup": StartupHandler,
+        "composerList": "composer.EnvironmentListController",
+        "getComposerEnvironment": "composer.EnvironmentGetController",
+        "dagRun": "airflow.DagRunController",
+        "dagRunTask": "airflow.DagRunTaskController",
+        "dagRunTaskLogs": "airflow.DagRunTaskLogsController",
+        "runStatusStream": "runStatus.RunStatusStreamController",
+        "createJobScheduler": "executor.ExecutorController",
+        "dagList": "airflow.DagListController",
+        "dagListAll": "airflow.AllDagListController",
+        "dagDelete": "airflow.DagDeleteController",
+        "dagUpdate": "airflow.DagUpdateController",
+        "dagBulk": "airflow.DagBulkController",
+        "editJobScheduler": "airflow.EditDagController",
+        "importErrorsList": "airflow.ImportErrorController",
+        "triggerDag": "airflow.TriggerDagController",
+        "downloadOutput": "executor.DownloadOutputController",
+        "clusterList": "dataproc.ClusterListController",
+        "runtimeList": "dataproc.RuntimeController",
+        "checkRequiredPackages": "executor.CheckRequiredPackagesController",
+        "api/vertex/uiConfig": "vertex.UIConfigController",
+        "api/compute/region": "compute.RegionController",
+        "api/compute/network": "compute.NetworkController",
+        "api/compute/subNetwork": "compute.SubNetworkController",
+        "api/compute/sharedNetwork": "compute.SharedNetworkController",
+        "api/storage/listBucket": "storage.CloudStorageController",
+        "api/iam/listServiceAccount": "iam.ServiceAccountController",
+        "api/compute/getXpnHost": "compute.GetXpnHostController",
+        "api/vertex/listSchedules": "vertex.ScheduleListController",
+        "api/vertex/pauseSchedule": "vertex.SchedulePauseController",
+        "api/vertex/resumeSchedule": "vertex.ScheduleResumeController",
+        "api/vertex/deleteSchedule": "vertex.ScheduleDeleteController",
+        "api/vertex/triggerSchedule": "vertex.ScheduleTriggerController",
+        "api/vertex/updateSchedule": "vertex.ScheduleUpdateController",
+        "api/vertex/getSchedule": "vertex.ScheduleGetController",
+        "api/vertex/createJobScheduler": "vertex.VertexScheduleCreateController",
+        "api/storage/createNewBucket": "vertex.BucketCreateController",
+        "api/logEntries/listEntries": "logEntries.LogEntiresListContoller",
+        "api/vertex/listNotebookExecutionJobs": "vertex.NotebookExecutionJobListController",
+        "api/storage/downloadOutput": "storage.DownloadOutputController",
+        "api/storage/outputFileExists": "storage.OutputFileExistsController",
+        "api/storage/downloadProgress": "storage.DownloadProgressController",
+        "jupyterlabVersion": "version.LatestVersionController",
+        "updatePlugin": "version.UpdatePackageController",
+        "api/cloudKms/listKeyRings": "cloudKms.KeyRingsController",
+        "api/cloudKms/listCryptoKeys": "cloudKms.CryptoKeysController",
     }
-    handlers = [(full_path(name), handler) for name, handler in handlersMap.items()]
+    handlers = [
+        (full_path(name), route_handler(name, handler))
+        for name, handler in handlersMap.items()
+    ]
     web_app.add_handlers(host_pattern, handlers)
@@ -12,22 +12,65 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import re
 import subprocess
-import urllib
-from google.cloud import storage
+import urllib.parse
 
 from scheduler_jupyter_plugin import urls
+from scheduler_jupyter_plugin.commons.cache import AsyncTTLCache
 from scheduler_jupyter_plugin.commons.constants import (
     COMPOSER_SERVICE_NAME,
     CONTENT_TYPE,
-    STORAGE_SERVICE_DEFAULT_URL,
-    STORAGE_SERVICE_NAME,
     TAGS,
     HTTP_STATUS_INTERNAL_SERVER_ERROR as HTTP_STATUS_SERVER_ERROR_START,
     HTTP_STATUS_NETWORK_CONNECT_TIMEOUT as HTTP_STATUS_SERVER_ERROR_END,
+    HTTP_STATUS_NOT_FOUND,
     HTTP_STATUS_OK,
 )
+from scheduler_jupyter_plugin.services import gcs
+
+
+class EnvironmentNotFoundError(Exception):
+    pass
+
+
+# Composer environment metadata (Airflow URI, bucket and state) shared by
+# every client, keyed by (project_id, region_id, environment name). Entries
+# are served for up to an hour past their TTL while being refreshed in the
+# background, and missing environments are remembered briefly.
+environment_cache = AsyncTTLCache(
+    ttl=5 * 60,
+    stale_ttl=60 * 60,
+    negative_ttl=30,
+    negative_exceptions=(EnvironmentNotFoundError,),
+)
+
+# DAGs listed per Airflow API request, which is Airflow's default
+# maximum_page_limit, and the number of pages requested at a time.
+DAG_LIST_PAGE_SIZE = 100
+MAX_CONCURRENT_DAG_PAGES = 4
+# Sort orders of the DAG list. Pages are fetched by offset, so the order
+# must be on a unique field not to skip or repeat DAGs across pages.
+DAG_LIST_ORDERS = ("dag_id", "-dag_id")
+
+# Environments whose DAGs are listed at a time when listing every
+# environment, and the seconds each may take to answer by default and at
+# most.
+MAX_CONCURRENT_ENVIRONMENTS = 8
+ENVIRONMENT_LIST_TIMEOUT = 30
+MAX_ENVIRONMENT_LIST_TIMEOUT = 300
+
+# Actions of bulk_dag_action, and the DAGs it updates at a time.
+BULK_DAG_ACTIONS = ("pause", "resume", "trigger", "delete")
+MAX_CONCURRENT_DAG_OPERATIONS = 8
+
+# Airflow task states after which the log of a try no longer changes.
+FINISHED_TASK_STATES = {"success", "failed", "skipped", "upstream_failed", "removed"}
+
+# Full logs of finished task tries, keyed by (airflow_uri, dag_id, dag_run_id,
+# task_id, try number). They never change, so re-reading them is free.
+task_log_cache = AsyncTTLCache(ttl=60 * 60, maxsize=32)
 
 
 class Client:
@@ -44,6 +87,7 @@ class Client:
         self.project_id = credentials["project_id"]
         self.region_id = credentials["region_id"]
         self.client_session = client_session
+        self.gcs_client = gcs.Client(credentials, log, client_session)
 
     def create_headers(self):
         return {
@@ -51,54 +95,241 @@ class Client:
             "Authorization": f"Bearer {self._access_token}",
         }
 
+    async def _fetch_environment_metadata(self, project_id, region_id, composer_name):
+        composer_url = await urls.gcp_service_url(COMPOSER_SERVICE_NAME)
+        api_endpoint = f"{composer_url}v1/projects/{project_id}/locations/{region_id}/environments/{composer_name}"
+        async with self.client_session.get(
+            api_endpoint, headers=self.create_headers()
+        ) as response:
+            if response.status == HTTP_STATUS_OK:
+                resp = await response.json()
+                return {
+                    "airflow_uri": resp.get("config", {}).get("airflowUri", ""),
+                    "bucket": resp.get("storageConfig", {}).get("bucket", ""),
+                    "state": resp.get("state", ""),
+                }
+            elif response.status == HTTP_STATUS_NOT_FOUND:
+                raise EnvironmentNotFoundError(
+                    f"{response.reason} {await response.text()}"
+                )
+            else:
+                raise Exception(f"{response.reason} {await response.text()}")
+
     async def get_airflow_uri_and_bucket(
         self, composer_name, project_id=None, region_id=None
     ):
         try:
             project_id = project_id or self.project_id
             region_id = region_id or self.region_id
-            composer_url = await urls.gcp_service_url(COMPOSER_SERVICE_NAME)
-            api_endpoint = f"{composer_url}v1/projects/{project_id}/locations/{region_id}/environments/{composer_name}"
-            async with self.client_session.get(
-                api_endpoint, headers=self.create_headers()
-            ) as response:
-                if response.status == HTTP_STATUS_OK:
-                    resp = await response.json()
-                    airflow_uri = resp.get("config", {}).get("airflowUri", "")
-                    bucket = resp.get("storageConfig", {}).get("bucket", "")
-                    return {"airflow_uri": airflow_uri, "bucket": bucket}
-                else:
-                    raise Exception(
-                        f"Error getting airflow uri: {response.reason} {await response.text()}"
-                    )
+            environment = await environment_cache.get(
+                (project_id, region_id, composer_name),
+                lambda: self._fetch_environment_metadata(
+                    project_id, region_id, composer_name
+                ),
+            )
+            return dict(environment)
         except Exception as e:
             self.log.exception(f"Error getting airflow uri: {str(e)}")
             raise Exception(f"Error getting airflow uri: {str(e)}")
 
-    async def list_jobs(self, composer_name, project_id, region_id):
+    async def _list_dags_page(self, airflow_uri, query, offset, limit):
+        query = dict(query, limit=limit, offset=offset)
+        api_endpoint = f"{airflow_uri}/api/v1/dags?{urllib.parse.urlencode(query)}"
+        async with self.client_session.get(
+            api_endpoint, headers=self.create_headers()
+        ) as response:
+            if response.status == HTTP_STATUS_OK:
+                return await response.json()
+            elif (
+                response.status >= HTTP_STATUS_SERVER_ERROR_START
+                and response.status <= HTTP_STATUS_SERVER_ERROR_END
+            ):
+                raise RuntimeError(f"{response.reason}")
+            else:
+                raise Exception(f"{response.reason} {await response.text()}")
+
+    async def list_jobs(
+        self,
+        composer_name,
+        project_id,
+        region_id,
+        search=None,
+        order_by=None,
+        paused=None,
+        offset=0,
+        limit=None,
+    ):
+        """Returns the plugin's DAGs in an environment, and its bucket.
+
+        All the matching DAGs from `offset` on are listed, or `limit` of
+        them. The first page gives the total number of DAGs, and the other
+        pages are then fetched concurrently. `search` matches part of the
+        DAG IDs, `order_by` is one of DAG_LIST_ORDERS and `paused` filters
+        on the paused state.
+        """
         airflow_obj = await self.get_airflow_uri_and_bucket(
             composer_name, project_id, region_id
         )
         airflow_uri = airflow_obj.get("airflow_uri")
         try:
-            api_endpoint = f"{airflow_uri}/api/v1/dags?tags={TAGS}"
-            async with self.client_session.get(
-                api_endpoint, headers=self.create_headers()
-            ) as response:
-                if response.status == HTTP_STATUS_OK:
-                    resp = await response.json()
-                    return resp, airflow_obj.get("bucket")
-                elif (
-                    response.status >= HTTP_STATUS_SERVER_ERROR_START
-                    and response.status <= HTTP_STATUS_SERVER_ERROR_END
-                ):
-                    raise RuntimeError(f"{response.reason}")
-                else:
-                    raise Exception(f"{response.reason} {await response.text()}")
+            # A stable order keeps the pages from overlapping.
+            query = {"tags": TAGS, "order_by": order_by or "dag_id"}
+            if search:
+                query["dag_id_pattern"] = search
+            if paused is not None:
+                query["paused"] = "true" if paused else "false"
+            page_size = DAG_LIST_PAGE_SIZE
+            if limit is not None:
+                page_size = min(limit, page_size)
+            first_page = await self._list_dags_page(
+                airflow_uri, query, offset, page_size
+            )
+            dags = first_page.get("dags") or []
+            total_entries = first_page.get("total_entries", len(dags))
+            end = total_entries if limit is None else min(offset + limit, total_entries)
+            # Airflow caps pages at its maximum_page_limit setting.
+            if 0 < len(dags) < page_size:
+                page_size = len(dags)
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_DAG_PAGES)
+
+            async def list_page(page_offset):
+                async with semaphore:
+                    return await self._list_dags_page(
+                        airflow_uri,
+                        query,
+                        page_offset,
+                        min(page_size, end - page_offset),
+                    )
+
+            pages = await asyncio.gather(
+                *(
+                    [
+                        list_page(page_offset)
+                        for page_offset in range(offset + len(dags), end, page_size)
+                    ]
+                    if dags
+                    else []
+                )
+            )
+            # DAGs added or removed while listing can shift the pages.
+            dag_ids = {dag["dag_id"] for dag in dags}
+            for page in pages:
+                for dag in page.get("dags") or []:
+                    if dag["dag_id"] not in dag_ids:
+                        dag_ids.add(dag["dag_id"])
+                        dags.append(dag)
+            resp = {"dags": dags, "total_entries": total_entries}
+            return resp, airflow_obj.get("bucket")
         except Exception as e:
             self.log.exception(f"Error getting dag list: {str(e)}")
             return {"error": str(e)}
 
+    async def _list_environment_jobs(self, environment, timeout, filters):
+        result = dict(environment)
+        try:
+            resp = await asyncio.wait_for(
+                self.list_jobs(
+                    environment["environment"],
+                    environment["project_id"],
+                    environment["region_id"],
+                    **filters,
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            result["error"] = f"Timed out listing DAGs after {timeout} seconds"
+            return result
+        except Exception as e:
+            # The environment metadata lookup raises instead of returning.
+            result["error"] = str(e)
+            return result
+        if isinstance(resp, dict):
+            result["error"] = resp.get("error")
+        else:
+            dags, bucket = resp
+            result.update(dags, bucket=bucket)
+        return result
+
+    async def _list_region_environments(
+        self, composer_client, project_id, region_id, timeout
+    ):
+        try:
+            environments = await asyncio.wait_for(
+                composer_client.list_environments(project_id, region_id), timeout
+            )
+        except asyncio.TimeoutError:
+            environments = {
+                "error": f"Timed out listing environments after {timeout} seconds"
+            }
+        if not isinstance(environments, list):
+            # list_environments returns its error payload instead of raising.
+            raise Exception(f"Error listing environments: {environments}")
+        return [
+            {
+                "environment": environment.name,
+                "project_id": project_id,
+                "region_id": region_id,
+            }
+            for environment in environments
+        ]
+
+    async def iter_all_jobs(
+        self,
+        composer_client,
+        project_id,
+        region_ids,
+        timeout=ENVIRONMENT_LIST_TIMEOUT,
+        **filters,
+    ):
+        """Yields the plugin's DAGs in every environment of the regions.
+
+        The environments of each region are listed with `composer_client`,
+        and then the DAGs of all of them are listed concurrently. Each
+        environment is yielded, as a page of one, as soon as it answers:
+        its DAGs, total_entries and bucket, or the error that listing it
+        failed with, including taking more than `timeout` seconds. Regions
+        whose environments could not be listed are yielded with their
+        error first. `filters` are passed to `list_jobs`.
+        """
+        regions = await asyncio.gather(
+            *[
+                self._list_region_environments(
+                    composer_client, project_id, region_id, timeout
+                )
+                for region_id in region_ids
+            ],
+            return_exceptions=True,
+        )
+        environments = []
+        for region_id, region in zip(region_ids, regions):
+            if isinstance(region, Exception):
+                yield [
+                    {
+                        "project_id": project_id,
+                        "region_id": region_id,
+                        "error": str(region),
+                    }
+                ]
+            else:
+                environments.extend(region)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_ENVIRONMENTS)
+
+        async def list_environment_jobs(environment):
+            async with semaphore:
+                return await self._list_environment_jobs(environment, timeout, filters)
+
+        tasks = [
+            asyncio.ensure_future(list_environment_jobs(environment))
+            for environment in environments
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield [await task]
+        finally:
+            # The client went away before every environment answered.
+            for task in tasks:
+                task.cancel()
+
     async def delete_job(self, composer_name, dag_id, from_page, project_id, region_id):
         airflow_obj = await self.get_airflow_uri_and_bucket(
             composer_name, project_id, region_id
@@ -107,16 +338,29 @@ class Client:
         airflow_bucket = airflow_obj.get("bucket")
         try:
             api_endpoint = f"{airflow_uri}/api/v1/dags/{dag_id}"
-            # Delete the DAG via the Airflow API if from_page is None
-            if from_page is None:
+            blob_name = f"dags/dag_{dag_id}.py"
+
+            async def delete_dag():
+                # Delete the DAG via the Airflow API if from_page is None
+                if from_page is not None:
+                    return
                 async with self.client_session.delete(
                     api_endpoint, headers=self.create_headers()
                 ) as response:
-                    self.log.info(response)
-            bucket = storage.Client().bucket(airflow_obj.get("bucket"))
-            blob_name = f"dags/dag_{dag_id}.py"
-            blob = bucket.blob(blob_name)
-            blob.delete()
+                    if response.status >= 300:
+                        raise Exception(
+                            f"Error deleting Airflow DAG: {response.reason} {await response.text()}"
+                        )
+
+            # The DAG and its file are deleted independently of each other.
+            results = await asyncio.gather(
+                delete_dag(),
+                self.gcs_client.delete(airflow_bucket, blob_name),
+                return_exceptions=True,
+            )
+            errors = [str(e) for e in results if isinstance(e, Exception)]
+            if errors:
+                raise Exception("; ".join(errors))
 
             self.log.info(f"Deleted {blob_name} from bucket {airflow_bucket}")
 
@@ -148,6 +392,56 @@ class Client:
             self.log.exception(f"Error updating status: {str(e)}")
             return {"error": str(e)}
 
+    async def _dag_action(self, composer_name, dag_id, action, project_id, region_id):
+        try:
+            if action == "trigger":
+                resp = await self.dag_trigger(
+                    dag_id, composer_name, project_id, region_id
+                )
+            elif action == "delete":
+                resp = await self.delete_job(
+                    composer_name, dag_id, None, project_id, region_id
+                )
+            else:
+                # update_job resumes DAGs given "true" and pauses them otherwise.
+                status = "true" if action == "resume" else "false"
+                resp = await self.update_job(
+                    composer_name, dag_id, status, project_id, region_id
+                )
+        except Exception as e:
+            resp = {"error": str(e)}
+        if isinstance(resp, dict) and "error" in resp:
+            return {"dag_id": dag_id, "error": resp["error"]}
+        result = {"dag_id": dag_id, "status": 0}
+        if action == "trigger":
+            result["dag_run_id"] = resp.get("dag_run_id")
+        return result
+
+    async def bulk_dag_action(
+        self, composer_name, dag_ids, action, project_id, region_id
+    ):
+        """Applies `action` to each of `dag_ids`, and returns their results.
+
+        DAGs are updated one at a time, at most MAX_CONCURRENT_DAG_OPERATIONS
+        concurrently. Airflow's bulk PATCH /dags is not used: it selects DAGs
+        by an ID pattern, which DAGs nobody asked for can start matching at
+        any time. Each result has the DAG ID and either a status of 0 or the
+        error the action failed with.
+        """
+        # Fails the whole request early when the environment is unusable.
+        await self.get_airflow_uri_and_bucket(composer_name, project_id, region_id)
+        results = {}
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DAG_OPERATIONS)
+
+        async def dag_action(dag_id):
+            async with semaphore:
+                results[dag_id] = await self._dag_action(
+                    composer_name, dag_id, action, project_id, region_id
+                )
+
+        await asyncio.gather(*[dag_action(dag_id) for dag_id in dag_ids])
+        return [results[dag_id] for dag_id in dag_ids]
+
     async def list_dag_runs(
         self, composer_name, dag_id, start_date, end_date, offset, project_id, region_id
     ):
@@ -171,6 +465,26 @@ class Client:
             self.log.exception(f"Error fetching dag run list: {str(e)}")
             return {"error": str(e)}
 
+    async def list_latest_dag_runs(
+        self, composer_name, dag_id, project_id, region_id, limit=25
+    ):
+        """Returns the most recent runs of a DAG, newest first."""
+        airflow_obj = await self.get_airflow_uri_and_bucket(
+            composer_name, project_id, region_id
+        )
+        airflow_uri = airflow_obj.get("airflow_uri")
+        api_endpoint = f"{airflow_uri}/api/v1/dags/{dag_id}/dagRuns?order_by=-execution_date&limit={limit}"
+        async with self.client_session.get(
+            api_endpoint, headers=self.create_headers()
+        ) as response:
+            if response.status == HTTP_STATUS_OK:
+                resp = await response.json()
+                return resp.get("dag_runs", [])
+            else:
+                raise Exception(
+                    f"Error fetching dag run list: {response.reason} {await response.text()}"
+                )
+
     async def list_dag_run_task(
         self, composer_name, dag_id, dag_run_id, project_id, region_id
     ):
@@ -196,6 +510,55 @@ class Client:
             self.log.exception(f"Error fetching dag run task list: {str(e)}")
             return {"error": str(e)}
 
+    async def _is_task_try_finished(
+        self, airflow_uri, dag_id, dag_run_id, task_id, task_try_number
+    ):
+        api_endpoint = f"{airflow_uri}/api/v1/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances/{task_id}"
+        try:
+            async with self.client_session.get(
+                api_endpoint, headers=self.create_headers()
+            ) as response:
+                if response.status != HTTP_STATUS_OK:
+                    return False
+                task_instance = await response.json() or {}
+        except Exception as e:
+            self.log.warning(f"Error fetching task instance state: {str(e)}")
+            return False
+        if task_instance.get("state") in FINISHED_TASK_STATES:
+            return True
+        try:
+            # Earlier tries are over once a retry has started.
+            return int(task_try_number) < int(task_instance.get("try_number") or 0)
+        except ValueError:
+            return False
+
+    async def _read_task_log(self, api_endpoint):
+        async with self.client_session.get(
+            api_endpoint, headers=self.create_headers()
+        ) as response:
+            if response.status == HTTP_STATUS_OK:
+                return await response.text()
+            else:
+                raise Exception(
+                    f"Error listing dag run task logs: {response.reason} {await response.text()}"
+                )
+
+    async def _read_task_log_chunk(self, api_endpoint, continuation_token):
+        headers = self.create_headers()
+        headers["Accept"] = CONTENT_TYPE
+        params = {"full_content": "false"}
+        if continuation_token:
+            params["token"] = continuation_token
+        async with self.client_session.get(
+            api_endpoint, headers=headers, params=params
+        ) as response:
+            if response.status == HTTP_STATUS_OK:
+                return await response.json()
+            else:
+                raise Exception(
+                    f"Error listing dag run task logs: {response.reason} {await response.text()}"
+                )
+
     async def list_dag_run_task_logs(
         self,
         composer_name,
@@ -205,23 +568,55 @@ class Client:
         task_try_number,
         project_id,
         region_id,
+        full_content=True,
+        continuation_token=None,
+        task_state=None,
     ):
+        """Returns the log of a task try.
+
+        With `full_content` set to False only the part of the log after
+        `continuation_token` is returned, along with the token to pass on
+        the next call and whether the log is complete. The full logs of
+        finished tries are cached. A `task_state` already known to the
+        caller saves looking up whether the try has finished.
+        """
         airflow_obj = await self.get_airflow_uri_and_bucket(
             composer_name, project_id, region_id
         )
         airflow_uri = airflow_obj.get("airflow_uri")
         try:
             api_endpoint = f"{airflow_uri}/api/v1/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances/{task_id}/logs/{task_try_number}"
-            async with self.client_session.get(
-                api_endpoint, headers=self.create_headers()
-            ) as response:
-                if response.status == HTTP_STATUS_OK:
-                    resp = await response.text()
-                    return {"content": resp}
-                else:
-                    raise Exception(
-                        f"Error listing dag run task logs: {response.reason} {await response.text()}"
-                    )
+            cache_key = (airflow_uri, dag_id, dag_run_id, task_id, task_try_number)
+            if cache_key in task_log_cache:
+                finished = True
+            elif task_state is not None:
+                finished = task_state in FINISHED_TASK_STATES
+            elif full_content:
+                # Full reads are correct either way, so only skip the cache
+                # rather than looking up the task instance on every read.
+                finished = False
+            else:
+                finished = await self._is_task_try_finished(
+                    airflow_uri, dag_id, dag_run_id, task_id, task_try_number
+                )
+            if finished and (full_content or not continuation_token):
+                content = await task_log_cache.get(
+                    cache_key, lambda: self._read_task_log(api_endpoint)
+                )
+            elif full_content:
+                content = await self._read_task_log(api_endpoint)
+            else:
+                chunk = await self._read_task_log_chunk(
+                    api_endpoint, continuation_token
+                )
+                return {
+                    "content": chunk.get("content", ""),
+                    "continuation_token": chunk.get("continuation_token"),
+                    "end_of_log": finished,
+                }
+            if full_content:
+                return {"content": content}
+            return {"content": content, "continuation_token": None, "end_of_log": True}
         except Exception as e:
             self.log.exception(f"Error fetching dag run task logs: {str(e)}")
             return {"error": str(e)}
@@ -229,21 +624,9 @@ class Client:
     async def get_dag_file(self, dag_id, bucket_name):
         try:
             file_path = f"dags/dag_{dag_id}.py"
-            encoded_path = urllib.parse.quote(file_path, safe="")
-            storage_url = await urls.gcp_service_url(
-                STORAGE_SERVICE_NAME, default_url=STORAGE_SERVICE_DEFAULT_URL
-            )
-            api_endpoint = f"{storage_url}b/{bucket_name}/o/{encoded_path}?alt=media"
-            async with self.client_session.get(
-                api_endpoint, headers=self.create_headers()
-            ) as response:
-                if response.status == HTTP_STATUS_OK:
-                    self.log.info("Dag file response fetched")
-                    return await response.read()
-                else:
-                    raise Exception(
-                        f"Error getting dag file: {response.reason} {await response.text()}"
-                    )
+            file_content = await self.gcs_client.read(bucket_name, file_path)
+            self.log.info("Dag file response fetched")
+            return file_content
         except Exception as e:
             self.log.exception(f"Error reading dag file: {str(e)}")
             return {"error": str(e)}
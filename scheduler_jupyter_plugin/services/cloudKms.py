@@ -14,6 +14,7 @@
 
 from google.cloud import kms_v1
 
+from scheduler_jupyter_plugin.commons import metrics
 from scheduler_jupyter_plugin.commons.constants import CONTENT_TYPE
 
 
@@ -45,10 +46,11 @@ class Client:
             request = kms_v1.ListKeyRingsRequest(
                 parent=f"projects/{project_id}/locations/{region_id}",
             )
-            response = await cloud_kms_client.list_key_rings(request=request)
-            async for item in response:
-                key_ring = item.name.rsplit("/", 1)[-1]
-                key_rings.append(key_ring)
+            with metrics.upstream_timer("kms", "list_key_rings"):
+                response = await cloud_kms_client.list_key_rings(request=request)
+                async for item in response:
+                    key_ring = item.name.rsplit("/", 1)[-1]
+                    key_rings.append(key_ring)
             return key_rings
 
         except Exception as e:
@@ -62,10 +64,11 @@ class Client:
             request = kms_v1.ListCryptoKeysRequest(
                 parent=f"projects/{project_id}/locations/{region_id}/keyRings/{key_ring}",
             )
-            response = await cloud_kms_client.list_crypto_keys(request=request)
-            async for item in response:
-                crypto_key = item.name.rsplit("/", 1)[-1]
-                crypto_keys.append(crypto_key)
+            with metrics.upstream_timer("kms", "list_crypto_keys"):
+                response = await cloud_kms_client.list_crypto_keys(request=request)
+                async for item in response:
+                    crypto_key = item.name.rsplit("/", 1)[-1]
+                    crypto_keys.append(crypto_key)
             return crypto_keys
 
         except Exception as e:
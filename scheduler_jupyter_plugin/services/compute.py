@@ -18,6 +18,7 @@ from google.cloud import compute_v1
 import google.oauth2.credentials as oauth2
 
 from scheduler_jupyter_plugin import urls
+from scheduler_jupyter_plugin.commons import metrics, threadpool
 from scheduler_jupyter_plugin.commons.constants import (
     CONTENT_TYPE,
     HTTP_STATUS_OK,
@@ -48,16 +49,21 @@ class Client:
 
     async def list_region(self):
         try:
-            regions = []
             credentials = oauth2.Credentials(token=self._access_token)
             regions_client = compute_v1.RegionsClient(credentials=credentials)
             request = compute_v1.ListRegionsRequest(
                 project=self.project_id,
             )
-            response = regions_client.list(request=request)
-            for item in response:
-                regions.append(item.name)
-            return regions
+
+            def list_region_names():
+                # Further pages are fetched while iterating over the response.
+                response = regions_client.list(request=request)
+                return [item.name for item in response]
+
+            with metrics.upstream_timer("compute", "list_regions"):
+                return await threadpool.run_blocking(
+                    threadpool.COMPUTE_POOL, list_region_names
+                )
 
         except Exception as e:
             self.log.exception(f"Error fetching regions: {str(e)}")
@@ -71,7 +77,10 @@ class Client:
             request = compute_v1.ListNetworksRequest(
                 project=self.project_id,
             )
-            response = networks_client.list(request=request)
+            with metrics.upstream_timer("compute", "list_networks"):
+                response = await threadpool.run_blocking(
+                    threadpool.COMPUTE_POOL, networks_client.list, request=request
+                )
             for item in response.items:
                 networks.append(
                     proto.Message.to_dict(
@@ -95,7 +104,10 @@ class Client:
                 project=self.project_id,
                 region=region_id,
             )
-            response = subnetworks_client.list(request=request)
+            with metrics.upstream_timer("compute", "list_subnetworks"):
+                response = await threadpool.run_blocking(
+                    threadpool.COMPUTE_POOL, subnetworks_client.list, request=request
+                )
             for item in response.items:
                 if network_id in item.network:
                     sub_networks.append(
@@ -119,7 +131,15 @@ class Client:
             request = compute_v1.ListUsableSubnetworksRequest(
                 project=project_id,
             )
-            response = subnetworks_client.list_usable(request=request)
+
+            def list_usable_subnetworks():
+                # Further pages are fetched while iterating over the response.
+                return list(subnetworks_client.list_usable(request=request))
+
+            with metrics.upstream_timer("compute", "list_usable_subnetworks"):
+                response = await threadpool.run_blocking(
+                    threadpool.COMPUTE_POOL, list_usable_subnetworks
+                )
             for item in response:
                 if region_id in item.subnetwork:
                     shared_networks.append(
@@ -12,28 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
 import shutil
 import subprocess
+import tempfile
 import uuid
 from datetime import datetime, timedelta
-from google.cloud import storage
 from google.api_core.exceptions import NotFound
-import google.oauth2.credentials as oauth2
 from google.cloud.jupyter_config.config import (
     async_run_gcloud_subcommand,
 )
-import aiofiles
 import json
 
-import aiohttp
 import pendulum
 from google.cloud.jupyter_config.config import gcp_account
 from jinja2 import Environment, PackageLoader, select_autoescape
 
 from scheduler_jupyter_plugin import urls
+from scheduler_jupyter_plugin.commons import metrics, tracing
 from scheduler_jupyter_plugin.commons.constants import (
-    COMPOSER_SERVICE_NAME,
     CONTENT_TYPE,
     GCS,
     PACKAGE_NAME,
@@ -44,7 +42,7 @@ from scheduler_jupyter_plugin.commons.constants import (
     DATAPROC_SERVICE_NAME,
 )
 from scheduler_jupyter_plugin.models.models import DescribeJob
-from scheduler_jupyter_plugin.services import airflow
+from scheduler_jupyter_plugin.services import airflow, gcs
 
 
 unique_id = str(uuid.uuid4().hex)
@@ -55,8 +53,6 @@ ROOT_FOLDER = PACKAGE_NAME
 
 
 class Client:
-    client_session = aiohttp.ClientSession()
-
     def __init__(self, credentials, log, client_session):
         self.log = log
         if not (
@@ -69,7 +65,9 @@ class Client:
         self._access_token = credentials["access_token"]
         self.project_id = credentials["project_id"]
         self.region_id = credentials["region_id"]
+        self.client_session = client_session
         self.airflow_client = airflow.Client(credentials, log, client_session)
+        self.gcs_client = gcs.Client(credentials, log, client_session)
 
     def create_headers(self):
         return {
@@ -77,43 +75,28 @@ class Client:
             "Authorization": f"Bearer {self._access_token}",
         }
 
+    @tracing.traced("executor.get_bucket")
     async def get_bucket(self, runtime_env, project_id, region_id):
         try:
-            composer_url = await urls.gcp_service_url(COMPOSER_SERVICE_NAME)
-            if project_id and region_id:
-                api_endpoint = f"{composer_url}v1/projects/{project_id}/locations/{region_id}/environments/{runtime_env}"
-            else:
-                api_endpoint = f"{composer_url}v1/projects/{self.project_id}/locations/{self.region_id}/environments/{runtime_env}"
-            headers = self.create_headers()
-            async with self.client_session.get(
-                api_endpoint, headers=headers
-            ) as response:
-                if response.status == HTTP_STATUS_OK:
-                    resp = await response.json()
-                    gcs_dag_path = resp.get("storageConfig", {}).get("bucket", "")
-                    return gcs_dag_path
-                else:
-                    raise Exception(
-                        f"Error getting composer bucket: {response.reason} {await response.text()}"
-                    )
+            environment = await self.airflow_client.get_airflow_uri_and_bucket(
+                runtime_env, project_id, region_id
+            )
+            return environment.get("bucket", "")
         except Exception as e:
             self.log.exception(f"Error getting bucket name: {str(e)}")
             raise Exception(f"Error getting composer bucket: {str(e)}")
 
+    @tracing.traced("executor.check_file_exists")
     async def check_file_exists(self, bucket_name, file_path, project_id):
         try:
             if not bucket_name:
                 raise ValueError("Bucket name cannot be empty")
-            credentials = oauth2.Credentials(self._access_token)
-            bucket = storage.Client(credentials=credentials, project=project_id).bucket(
-                bucket_name
-            )
-            blob = bucket.blob(file_path)
-            return blob.exists()
+            return await self.gcs_client.exists(bucket_name, file_path)
         except Exception as error:
             self.log.exception(f"Error checking file: {error}")
             raise IOError(f"Error creating dag: {error}")
 
+    @tracing.traced("executor.upload_to_gcs")
     async def upload_to_gcs(
         self,
         gcs_dag_bucket,
@@ -123,9 +106,6 @@ class Client:
         destination_dir=None,
     ):
         try:
-            credentials = oauth2.Credentials(self._access_token)
-            storage_client = storage.Client(credentials=credentials, project=project_id)
-            bucket = storage_client.bucket(gcs_dag_bucket)
             if template_name:
                 env = Environment(
                     loader=PackageLoader(PACKAGE_NAME, TEMPLATES_FOLDER_PATH),
@@ -140,8 +120,7 @@ class Client:
             else:
                 blob_name = f"{file_path.split('/')[-1]}"
 
-            blob = bucket.blob(blob_name)
-            blob.upload_from_filename(file_path)
+            await self.gcs_client.upload(gcs_dag_bucket, blob_name, file_path)
             self.log.info(f"File {file_path} uploaded to gcs successfully")
 
         except Exception as error:
@@ -178,7 +157,8 @@ class Client:
             )
             if multi_tenant == "true":
                 cmd = "config get account"
-                process = await async_run_gcloud_subcommand(cmd)
+                with metrics.gcloud_timer("config get"):
+                    process = await async_run_gcloud_subcommand(cmd)
                 user_email = process.strip()
                 service_account = (
                     cluster_data.get("config", {})
@@ -191,6 +171,7 @@ class Client:
                     return service_account
         return ""
 
+    @tracing.traced("executor.prepare_dag")
     async def prepare_dag(self, job, gcs_dag_bucket, dag_file, project_id, region_id):
         self.log.info("Generating dag file")
         DAG_TEMPLATE_CLUSTER_V1 = "pysparkJobTemplate-v1.txt"
@@ -342,12 +323,14 @@ class Client:
         shutil.copy2(wrapper_papermill_path, LOCAL_DAG_FILE_LOCATION)
         return file_path
 
+    @tracing.traced("executor.check_package_in_env")
     async def check_package_in_env(self, composer_environment_name, region_id):
         try:
             packages = ["apache-airflow-providers-papermill", "ipykernel"]
             packages_to_install = []
             cmd = f"beta composer environments list-packages {composer_environment_name} --location {region_id}"
-            process = await async_run_gcloud_subcommand(cmd)
+            with metrics.gcloud_timer("composer environments list-packages"):
+                process = await async_run_gcloud_subcommand(cmd)
             installed_packages = set(
                 line.split()[0].lower() for line in process.splitlines()[2:]
             )
@@ -364,6 +347,7 @@ class Client:
             self.log.exception(f"Error checking packages: {error}")
             raise IOError(f"Error checking packages: {error}")
 
+    @tracing.traced("executor.install_to_composer_environment")
     async def install_to_composer_environment(
         self, local_kernel, composer_environment_name, packages_to_install, region_id
     ):
@@ -374,7 +358,8 @@ class Client:
                     self.log.info(f"{package} is not installed. Installing...")
                     installing_packages = "true"
                     sub_cmd = f"composer environments update {composer_environment_name} --location {region_id} --update-pypi-package {package}"
-                    await async_run_gcloud_subcommand(sub_cmd)
+                    with metrics.gcloud_timer("composer environments update"):
+                        await async_run_gcloud_subcommand(sub_cmd)
             return {"installing_packages": str(installing_packages)}
         except subprocess.CalledProcessError as install_error:
             self.log.exception(
@@ -393,6 +378,7 @@ class Client:
         with open(file_path, "w") as f:
             json.dump(payload, f, indent=4)
 
+    @tracing.traced("executor.execute")
     async def execute(self, input_data, project_id, region_id):
         try:
             job = DescribeJob(**input_data)
@@ -417,42 +403,61 @@ class Client:
             if install_packages and install_packages.get("error"):
                 raise RuntimeError(install_packages)
 
-            if await self.check_file_exists(
-                gcs_dag_bucket, wrapper_pappermill_file_path, project_id
-            ):
-                print(
-                    f"The file gs://{gcs_dag_bucket}/{wrapper_pappermill_file_path} exists."
-                )
-            else:
-                await self.upload_to_gcs(
+            async def upload_wrapper_file():
+                if await self.check_file_exists(
+                    gcs_dag_bucket, wrapper_pappermill_file_path, project_id
+                ):
+                    print(
+                        f"The file gs://{gcs_dag_bucket}/{wrapper_pappermill_file_path} exists."
+                    )
+                else:
+                    await self.upload_to_gcs(
+                        gcs_dag_bucket,
+                        project_id,
+                        template_name=WRAPPER_PAPPERMILL_FILE,
+                        destination_dir="dataproc-notebooks",
+                    )
+                    print(
+                        f"The file gs://{gcs_dag_bucket}/{wrapper_pappermill_file_path} does not exist."
+                    )
+
+            # creating a json file for payload, in a directory of its own so
+            # that concurrent requests do not overwrite each other's payload
+            payload_dir = tempfile.TemporaryDirectory()
+            payload_file_path = os.path.join(payload_dir.name, PAYLOAD_JSON_FILE_PATH)
+            self.create_payload(payload_file_path, project_id, region_id, input_data)
+
+            # The files the DAG depends on are uploaded concurrently; the DAG
+            # itself is only uploaded once they are all in place.
+            uploads = [
+                upload_wrapper_file(),
+                # uploading payload JSON file to GCS
+                self.upload_to_gcs(
                     gcs_dag_bucket,
                     project_id,
-                    template_name=WRAPPER_PAPPERMILL_FILE,
-                    destination_dir="dataproc-notebooks",
-                )
-                print(
-                    f"The file gs://{gcs_dag_bucket}/{wrapper_pappermill_file_path} does not exist."
-                )
+                    file_path=payload_file_path,
+                    destination_dir=f"dataproc-notebooks/{job_name}/dag_details",
+                ),
+            ]
             # uploading input file while creating the job
             if not job.input_filename.startswith(GCS):
-                await self.upload_to_gcs(
-                    gcs_dag_bucket,
-                    project_id,
-                    file_path=f"./{job.input_filename}",
-                    destination_dir=f"dataproc-notebooks/{job_name}/input_notebooks",
+                uploads.append(
+                    self.upload_to_gcs(
+                        gcs_dag_bucket,
+                        project_id,
+                        file_path=f"./{job.input_filename}",
+                        destination_dir=f"dataproc-notebooks/{job_name}/input_notebooks",
+                    )
                 )
-            # creating a json file for payload
-            self.create_payload(
-                PAYLOAD_JSON_FILE_PATH, project_id, region_id, input_data
-            )
-
-            # uploading payload JSON file to GCS
-            await self.upload_to_gcs(
-                gcs_dag_bucket,
-                project_id,
-                file_path=PAYLOAD_JSON_FILE_PATH,
-                destination_dir=f"dataproc-notebooks/{job_name}/dag_details",
-            )
+            try:
+                # Waits for every upload, as they may still be reading the
+                # payload file when another one fails.
+                results = await asyncio.gather(*uploads, return_exceptions=True)
+            finally:
+                payload_dir.cleanup()
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
 
             file_path = await self.prepare_dag(
                 job, gcs_dag_bucket, dag_file, project_id, region_id
@@ -475,6 +480,7 @@ class Client:
         dag_run_id,
         project_id,
         region_id,
+        download_id=None,
     ):
         try:
             await self.airflow_client.list_dag_run_task(
@@ -484,18 +490,14 @@ class Client:
             return {"error": f"Invalid DAG run ID {dag_run_id}"}
 
         try:
-            credentials = oauth2.Credentials(self._access_token)
-            storage_client = storage.Client(credentials=credentials)
             blob_name = (
                 f"dataproc-output/{dag_id}/output-notebooks/{dag_id}_{dag_run_id}.ipynb"
             )
-            bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(blob_name)
             original_file_name = os.path.basename(blob_name)
             destination_file_name = os.path.join(".", original_file_name)
-            async with aiofiles.open(destination_file_name, "wb") as f:
-                file_data = blob.download_as_bytes()
-                await f.write(file_data)
+            await self.gcs_client.download(
+                bucket_name, blob_name, destination_file_name, download_id=download_id
+            )
             self.log.info(
                 f"Output notebook file '{original_file_name}' downloaded successfully"
             )
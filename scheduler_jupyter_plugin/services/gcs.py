@@ -0,0 +1,463 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Async client for the Cloud Storage JSON API.
+
+Uploads go through resumable upload sessions and downloads are streamed in
+chunks, so objects are never held in memory in full. Every transfer is
+checked against the CRC32C checksum Cloud Storage keeps for the object.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+import urllib
+import uuid
+
+import aiofiles
+import aiohttp
+import google_crc32c
+
+from scheduler_jupyter_plugin import urls
+from scheduler_jupyter_plugin.commons import tracing
+from scheduler_jupyter_plugin.commons.constants import (
+    CONTENT_TYPE,
+    HTTP_STATUS_CREATED,
+    HTTP_STATUS_NOT_FOUND,
+    HTTP_STATUS_OK,
+    HTTP_STATUS_PARTIAL_CONTENT,
+    HTTP_STATUS_RESUME_INCOMPLETE,
+    STORAGE_SERVICE_DEFAULT_URL,
+    STORAGE_SERVICE_NAME,
+)
+
+# Resumable upload chunks must be a multiple of 256 KiB.
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Upper bound on transfers run at once by the *_many methods.
+MAX_CONCURRENT_OPERATIONS = 8
+
+# Number of times a download is attempted before giving up, resuming where
+# the previous attempt stopped.
+MAX_DOWNLOAD_ATTEMPTS = 3
+
+DOWNLOAD_RUNNING = "running"
+DOWNLOAD_DONE = "done"
+DOWNLOAD_FAILED = "failed"
+
+# Finished downloads are reported for this many seconds, so that pollers
+# see how they ended.
+FINISHED_DOWNLOAD_RETENTION = 5 * 60
+
+# Maps a download id to the progress of that download.
+_downloads = {}
+
+
+class ChecksumMismatchError(Exception):
+    pass
+
+
+def _encode_checksum(checksum):
+    return base64.b64encode(checksum.digest()).decode("ascii")
+
+
+def _response_crc32c(response):
+    """Returns the CRC32C from the x-goog-hash headers of a response, if any."""
+    for header in response.headers.getall("x-goog-hash", []):
+        for value in header.split(","):
+            name, _, digest = value.strip().partition("=")
+            if name == "crc32c":
+                return digest
+    return None
+
+
+def _start_download_progress(download_id, destination):
+    progress = {
+        "download_id": download_id,
+        "destination": destination,
+        "state": DOWNLOAD_RUNNING,
+        "bytes_downloaded": 0,
+        "total_bytes": None,
+        "started_at": time.time(),
+        "finished_at": None,
+    }
+    _downloads[download_id] = progress
+    return progress
+
+
+def download_progress(download_id=None):
+    """Returns the progress of one download, or of all recent downloads."""
+    now = time.time()
+    for key, progress in list(_downloads.items()):
+        finished_at = progress["finished_at"]
+        if finished_at and now - finished_at > FINISHED_DOWNLOAD_RETENTION:
+            del _downloads[key]
+    if download_id is not None:
+        progress = _downloads.get(download_id)
+        return dict(progress) if progress else None
+    return [dict(progress) for progress in _downloads.values()]
+
+
+class Client:
+    def __init__(self, credentials, log, client_session):
+        self.log = log
+        if not (
+            ("access_token" in credentials)
+            and ("project_id" in credentials)
+            and ("region_id" in credentials)
+        ):
+            self.log.exception("Missing required credentials")
+            raise ValueError("Missing required credentials")
+        self._access_token = credentials["access_token"]
+        self.project_id = credentials["project_id"]
+        self.region_id = credentials["region_id"]
+        self.client_session = client_session
+
+    def create_headers(self):
+        return {
+            "Content-Type": CONTENT_TYPE,
+            "Authorization": f"Bearer {self._access_token}",
+        }
+
+    async def _storage_url(self):
+        return await urls.gcp_service_url(
+            STORAGE_SERVICE_NAME, default_url=STORAGE_SERVICE_DEFAULT_URL
+        )
+
+    async def _object_url(self, bucket_name, blob_name):
+        storage_url = await self._storage_url()
+        encoded_bucket = urllib.parse.quote(bucket_name, safe="")
+        encoded_name = urllib.parse.quote(blob_name, safe="")
+        return f"{storage_url}b/{encoded_bucket}/o/{encoded_name}"
+
+    async def _upload_url(self, bucket_name):
+        # Media uploads use the same API under an /upload/ path prefix.
+        storage_url = await self._storage_url()
+        base_url, separator, api_path = storage_url.rpartition("/storage/")
+        if separator:
+            upload_url = f"{base_url}/upload/storage/{api_path}"
+        else:
+            upload_url = f"{storage_url}upload/"
+        encoded_bucket = urllib.parse.quote(bucket_name, safe="")
+        return f"{upload_url}b/{encoded_bucket}/o"
+
+    async def get_metadata(self, bucket_name, blob_name):
+        """Returns the object metadata, or None if the object does not exist."""
+        api_endpoint = await self._object_url(bucket_name, blob_name)
+        async with self.client_session.get(
+            api_endpoint, headers=self.create_headers()
+        ) as response:
+            if response.status == HTTP_STATUS_OK:
+                return await response.json()
+            elif response.status == HTTP_STATUS_NOT_FOUND:
+                return None
+            else:
+                raise Exception(
+                    f"Error getting gs://{bucket_name}/{blob_name}: {response.reason} {await response.text()}"
+                )
+
+    async def exists(self, bucket_name, blob_name):
+        return await self.get_metadata(bucket_name, blob_name) is not None
+
+    async def _stream(self, bucket_name, blob_name, consume, chunk_size, progress=None):
+        """Streams the object contents to `consume`, verifying the checksum.
+
+        If the connection drops mid-download, the transfer resumes from the
+        last byte received with a Range request pinned to the same object
+        generation.
+        """
+        api_endpoint = await self._object_url(bucket_name, blob_name)
+        params = {"alt": "media"}
+        checksum = google_crc32c.Checksum()
+        expected_crc32c = None
+        started = False
+        transcoded = False
+        offset = 0
+        attempt = 1
+        while True:
+            headers = self.create_headers()
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            try:
+                async with self.client_session.get(
+                    api_endpoint, headers=headers, params=params
+                ) as response:
+                    if response.status not in (
+                        HTTP_STATUS_OK,
+                        HTTP_STATUS_PARTIAL_CONTENT,
+                    ):
+                        raise Exception(
+                            f"Error downloading gs://{bucket_name}/{blob_name}: {response.reason} {await response.text()}"
+                        )
+                    if offset and response.status != HTTP_STATUS_PARTIAL_CONTENT:
+                        # The whole object would be appended to the bytes
+                        # already received.
+                        raise Exception(
+                            f"Error resuming the download of gs://{bucket_name}/{blob_name}: the Range request was ignored"
+                        )
+                    if not started:
+                        started = True
+                        generation = response.headers.get("x-goog-generation")
+                        if generation:
+                            params["generation"] = generation
+                        expected_crc32c = _response_crc32c(response)
+                        # Checksums are computed over the stored bytes, so they
+                        # cannot be checked when the object was decompressed in
+                        # transit (and such downloads cannot be resumed either).
+                        transcoded = "Content-Encoding" in response.headers
+                        if transcoded:
+                            expected_crc32c = None
+                        elif progress is not None:
+                            progress["total_bytes"] = response.content_length
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        checksum.update(chunk)
+                        await consume(chunk)
+                        offset += len(chunk)
+                        if progress is not None:
+                            progress["bytes_downloaded"] = offset
+                break
+            except (aiohttp.ClientPayloadError, aiohttp.ClientConnectionError) as e:
+                if transcoded or attempt >= MAX_DOWNLOAD_ATTEMPTS:
+                    raise
+                attempt += 1
+                self.log.warning(
+                    f"Download of gs://{bucket_name}/{blob_name} interrupted after {offset} bytes, resuming: {e}"
+                )
+        if expected_crc32c and expected_crc32c != _encode_checksum(checksum):
+            raise ChecksumMismatchError(
+                f"Checksum mismatch downloading gs://{bucket_name}/{blob_name}"
+            )
+
+    @tracing.traced("gcs.read")
+    async def read(self, bucket_name, blob_name):
+        """Returns the contents of a (small) object."""
+        chunks = []
+
+        async def consume(chunk):
+            chunks.append(chunk)
+
+        await self._stream(bucket_name, blob_name, consume, DOWNLOAD_CHUNK_SIZE)
+        return b"".join(chunks)
+
+    @tracing.traced("gcs.download")
+    async def download(
+        self,
+        bucket_name,
+        blob_name,
+        destination,
+        chunk_size=DOWNLOAD_CHUNK_SIZE,
+        download_id=None,
+    ):
+        """Streams an object to a local file.
+
+        Data is written to a `.part` file that is renamed once the download
+        is complete and verified. Progress can be polled with
+        `download_progress(download_id)`, where the id defaults to a new
+        unique one. Returns the id.
+        """
+        download_id = download_id or uuid.uuid4().hex
+        progress = _start_download_progress(download_id, destination)
+        partial_destination = f"{destination}.part"
+        try:
+            async with aiofiles.open(partial_destination, "wb") as f:
+                await self._stream(
+                    bucket_name, blob_name, f.write, chunk_size, progress
+                )
+            os.replace(partial_destination, destination)
+        except Exception as e:
+            progress["state"] = DOWNLOAD_FAILED
+            progress["error"] = str(e)
+            if os.path.exists(partial_destination):
+                os.remove(partial_destination)
+            raise
+        finally:
+            progress["finished_at"] = time.time()
+        progress["state"] = DOWNLOAD_DONE
+        self.log.debug(f"Downloaded gs://{bucket_name}/{blob_name} to {destination}")
+        return download_id
+
+    async def _start_resumable_upload(self, bucket_name, blob_name, size):
+        api_endpoint = await self._upload_url(bucket_name)
+        headers = self.create_headers()
+        headers["X-Upload-Content-Length"] = str(size)
+        async with self.client_session.post(
+            api_endpoint,
+            headers=headers,
+            params={"uploadType": "resumable", "name": blob_name},
+            data=json.dumps({"name": blob_name}),
+        ) as response:
+            if response.status != HTTP_STATUS_OK:
+                raise Exception(
+                    f"Error starting upload to gs://{bucket_name}/{blob_name}: {response.reason} {await response.text()}"
+                )
+            return response.headers["Location"]
+
+    @tracing.traced("gcs.upload")
+    async def upload(
+        self, bucket_name, blob_name, file_path, chunk_size=UPLOAD_CHUNK_SIZE
+    ):
+        """Uploads a local file through a resumable upload session.
+
+        The file is sent in `chunk_size` pieces. The final piece carries the
+        CRC32C of the whole file, which Cloud Storage checks before it
+        finalizes the object. Returns the metadata of the new object.
+        """
+        size = os.path.getsize(file_path)
+        session_url = await self._start_resumable_upload(bucket_name, blob_name, size)
+        # Checksum of the bytes Cloud Storage has confirmed so far.
+        checksum = google_crc32c.Checksum()
+        offset = 0
+        async with aiofiles.open(file_path, "rb") as f:
+            while True:
+                await f.seek(offset)
+                chunk = await f.read(chunk_size)
+                end = offset + len(chunk)
+                if end > size or (not chunk and offset < size):
+                    raise Exception(
+                        f"{file_path} changed while uploading it to gs://{bucket_name}/{blob_name}"
+                    )
+                headers = {"Authorization": f"Bearer {self._access_token}"}
+                if chunk:
+                    headers["Content-Range"] = f"bytes {offset}-{end - 1}/{size}"
+                else:
+                    headers["Content-Range"] = f"bytes */{size}"
+                if end == size:
+                    file_checksum = checksum.copy()
+                    file_checksum.update(chunk)
+                    expected_crc32c = _encode_checksum(file_checksum)
+                    headers["X-Goog-Hash"] = f"crc32c={expected_crc32c}"
+                async with self.client_session.put(
+                    session_url, headers=headers, data=chunk
+                ) as response:
+                    if response.status in (HTTP_STATUS_OK, HTTP_STATUS_CREATED):
+                        metadata = await response.json()
+                        break
+                    elif response.status != HTTP_STATUS_RESUME_INCOMPLETE:
+                        raise Exception(
+                            f"Error uploading {file_path} to gs://{bucket_name}/{blob_name}: {response.reason} {await response.text()}"
+                        )
+                    # Cloud Storage may persist only part of a chunk; the
+                    # Range header says how much it has kept.
+                    persisted = response.headers.get("Range")
+                    confirmed = (
+                        int(persisted.rpartition("-")[2]) + 1 if persisted else 0
+                    )
+                    checksum.update(chunk[: confirmed - offset])
+                    offset = confirmed
+        if metadata.get("crc32c") != expected_crc32c:
+            raise ChecksumMismatchError(
+                f"Checksum mismatch uploading {file_path} to gs://{bucket_name}/{blob_name}"
+            )
+        self.log.debug(f"Uploaded {file_path} to gs://{bucket_name}/{blob_name}")
+        return metadata
+
+    @tracing.traced("gcs.delete")
+    async def delete(self, bucket_name, blob_name):
+        api_endpoint = await self._object_url(bucket_name, blob_name)
+        async with self.client_session.delete(
+            api_endpoint, headers=self.create_headers()
+        ) as response:
+            if response.status >= 300:
+                raise Exception(
+                    f"Error deleting gs://{bucket_name}/{blob_name}: {response.reason} {await response.text()}"
+                )
+
+    async def list_buckets(self, project_id=None):
+        """Returns the names of all buckets in the project."""
+        storage_url = await self._storage_url()
+        api_endpoint = f"{storage_url}b"
+        params = {
+            "project": project_id or self.project_id,
+            "fields": "items/name,nextPageToken",
+        }
+        bucket_names = []
+        while True:
+            async with self.client_session.get(
+                api_endpoint, headers=self.create_headers(), params=params
+            ) as response:
+                if response.status != HTTP_STATUS_OK:
+                    raise Exception(
+                        f"Error listing buckets: {response.reason} {await response.text()}"
+                    )
+                resp = await response.json()
+            bucket_names.extend(item["name"] for item in resp.get("items", []))
+            if not resp.get("nextPageToken"):
+                return bucket_names
+            params["pageToken"] = resp["nextPageToken"]
+
+    async def create_bucket(self, bucket_name, project_id=None):
+        storage_url = await self._storage_url()
+        async with self.client_session.post(
+            f"{storage_url}b",
+            headers=self.create_headers(),
+            params={"project": project_id or self.project_id},
+            data=json.dumps({"name": bucket_name}),
+        ) as response:
+            if response.status != HTTP_STATUS_OK:
+                raise Exception(
+                    f"Error creating bucket {bucket_name}: {response.reason} {await response.text()}"
+                )
+            return await response.json()
+
+    async def _run_many(self, operations, max_concurrency):
+        """Runs the coroutines concurrently, at most `max_concurrency` at a time.
+
+        Results are returned in order; failures are returned as exceptions
+        rather than cancelling the other operations.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(operation):
+            async with semaphore:
+                return await operation
+
+        return await asyncio.gather(
+            *[run(operation) for operation in operations], return_exceptions=True
+        )
+
+    async def upload_many(
+        self, bucket_name, uploads, max_concurrency=MAX_CONCURRENT_OPERATIONS
+    ):
+        """Uploads several `(file_path, blob_name)` pairs concurrently."""
+        return await self._run_many(
+            [
+                self.upload(bucket_name, blob_name, file_path)
+                for file_path, blob_name in uploads
+            ],
+            max_concurrency,
+        )
+
+    async def download_many(
+        self, bucket_name, downloads, max_concurrency=MAX_CONCURRENT_OPERATIONS
+    ):
+        """Downloads several `(blob_name, destination)` pairs concurrently."""
+        return await self._run_many(
+            [
+                self.download(bucket_name, blob_name, destination)
+                for blob_name, destination in downloads
+            ],
+            max_concurrency,
+        )
+
+    async def delete_many(
+        self, bucket_name, blob_names, max_concurrency=MAX_CONCURRENT_OPERATIONS
+    ):
+        """Deletes several objects concurrently."""
+        return await self._run_many(
+            [self.delete(bucket_name, blob_name) for blob_name in blob_names],
+            max_concurrency,
+        )
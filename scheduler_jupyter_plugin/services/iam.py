@@ -18,6 +18,8 @@ import google.oauth2.credentials as oauth2
 from google.cloud import iam_admin_v1
 from google.cloud.iam_admin_v1 import types
 
+from scheduler_jupyter_plugin.commons import metrics
+
 
 class Client:
     def __init__(self, credentials, log):
@@ -40,10 +42,11 @@ class Client:
             request = types.ListServiceAccountsRequest()
             request.name = f"projects/{self.project_id}"
 
-            accounts = await iam_client.list_service_accounts(request=request)
             account_list = []
-            async for account in accounts:
-                account_list.append(json.loads(proto.Message.to_json(account)))
+            with metrics.upstream_timer("iam", "list_service_accounts"):
+                accounts = await iam_client.list_service_accounts(request=request)
+                async for account in accounts:
+                    account_list.append(json.loads(proto.Message.to_json(account)))
 
             return account_list
         except Exception as e:
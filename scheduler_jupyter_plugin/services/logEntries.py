@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+
 from google.cloud import logging
 import google.oauth2.credentials as oauth2
 
+from scheduler_jupyter_plugin.commons import metrics, threadpool
+
 
 class Client:
     def __init__(self, credentials, log):
@@ -30,39 +34,68 @@ class Client:
         self.project_id = credentials["project_id"]
         self.region_id = credentials["region_id"]
 
+    async def iter_log_entries(self, filter_query=None, page_size=1000):
+        """Yields formatted log entries, newest first, a page at a time."""
+        log_entries = None
+
+        def fetch_page():
+            nonlocal log_entries
+            if log_entries is None:
+                # Creating the client and listing the entries already sends
+                # the first request. Further pages are fetched while
+                # iterating over the entries.
+                credentials = oauth2.Credentials(token=self._access_token)
+                logging_client = logging.Client(
+                    project=self.project_id, credentials=credentials
+                )
+                log_entries = logging_client.list_entries(
+                    filter_=filter_query,
+                    page_size=page_size,
+                    order_by="timestamp desc",
+                )
+            return [
+                format_log_entry(item.to_api_repr())
+                for item in itertools.islice(log_entries, page_size)
+            ]
+
+        while True:
+            with metrics.upstream_timer("logging", "list_entries"):
+                page = await threadpool.run_blocking(
+                    threadpool.LOGGING_POOL, fetch_page
+                )
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+
     async def list_log_entries(self, filter_query=None):
         try:
             logs = []
-            credentials = oauth2.Credentials(token=self._access_token)
-            logging_client = logging.Client(
-                project=self.project_id, credentials=credentials
-            )
-            log_entries = logging_client.list_entries(
-                filter_=filter_query, page_size=1000, order_by="timestamp desc"
-            )
-            for item in log_entries:
-                log_dict = item.to_api_repr()
-                formatted_res = {
-                    "timestamp": log_dict.get("timestamp"),
-                    "severity": log_dict.get("severity"),
-                    "summary": "",
-                }
-                # extracting error message
-                if log_dict.get("textPayload"):
-                    formatted_res["summary"] = log_dict["textPayload"]
-                if log_dict.get("jsonPayload"):
-                    formatted_res["summary"] = (
-                        f"{formatted_res['summary']} {log_dict['jsonPayload']['message']}"
-                    )
-                if log_dict.get("protoPayload"):
-                    formatted_res["summary"] = log_dict["protoPayload"]["status"][
-                        "message"
-                    ]
-                if log_dict.get("httpRequest"):
-                    formatted_res["summary"] = log_dict["httpRequest"]["statusMessage"]
-                logs.append(formatted_res)
+            async for page in self.iter_log_entries(filter_query):
+                logs.extend(page)
             return logs
 
         except Exception as e:
             self.log.exception(f"Error fetching log entries: {str(e)}")
             return {"Error fetching log entries": str(e)}
+
+
+def format_log_entry(log_dict):
+    """Returns the timestamp, severity and summary of a log entry."""
+    formatted_res = {
+        "timestamp": log_dict.get("timestamp"),
+        "severity": log_dict.get("severity"),
+        "summary": "",
+    }
+    # extracting error message
+    if log_dict.get("textPayload"):
+        formatted_res["summary"] = log_dict["textPayload"]
+    if log_dict.get("jsonPayload"):
+        formatted_res["summary"] = (
+            f"{formatted_res['summary']} {log_dict['jsonPayload']['message']}"
+        )
+    if log_dict.get("protoPayload"):
+        formatted_res["summary"] = log_dict["protoPayload"]["status"]["message"]
+    if log_dict.get("httpRequest"):
+        formatted_res["summary"] = log_dict["httpRequest"]["statusMessage"]
+    return formatted_res
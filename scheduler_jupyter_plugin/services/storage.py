@@ -14,14 +14,13 @@
 
 
 import os
-from google.cloud import storage
-import google.oauth2.credentials as oauth2
-import aiofiles
 import time
 
+from scheduler_jupyter_plugin.services import gcs
+
 
 class Client:
-    def __init__(self, credentials, log):
+    def __init__(self, credentials, log, client_session):
         self.log = log
         if not (
             ("access_token" in credentials)
@@ -33,16 +32,13 @@ class Client:
         self._access_token = credentials["access_token"]
         self.project_id = credentials["project_id"]
         self.region_id = credentials["region_id"]
+        self.gcs_client = gcs.Client(credentials, log, client_session)
 
-    async def download_output(self, bucket_name, file_name, job_run_id):
+    async def download_output(
+        self, bucket_name, file_name, job_run_id, download_id=None
+    ):
         try:
-            credentials = oauth2.Credentials(self._access_token)
-            storage_client = storage.Client(
-                credentials=credentials, project=self.project_id
-            )
             blob_name = f"{job_run_id}/{file_name}"
-            bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(blob_name)
             original_file_name = os.path.basename(blob_name)
 
             timestamp = time.strftime("%H%M%S")
@@ -50,9 +46,9 @@ class Client:
             unique_file_name = f"{base_name}_{job_run_id}_{timestamp}{extension}"
             destination_file_name = os.path.join(".", unique_file_name)
 
-            async with aiofiles.open(destination_file_name, "wb") as f:
-                file_data = blob.download_as_bytes()
-                await f.write(file_data)
+            await self.gcs_client.download(
+                bucket_name, blob_name, destination_file_name, download_id=download_id
+            )
             self.log.info(
                 f"Output notebook file '{unique_file_name}' downloaded successfully"
             )
@@ -63,15 +59,7 @@ class Client:
 
     async def list_bucket(self):
         try:
-            cloud_storage_buckets = []
-            credentials = oauth2.Credentials(self._access_token)
-            storage_client = storage.Client(
-                credentials=credentials, project=self.project_id
-            )
-            buckets = storage_client.list_buckets()
-            for bucket in buckets:
-                cloud_storage_buckets.append(bucket.name)
-            return cloud_storage_buckets
+            return await self.gcs_client.list_buckets(self.project_id)
 
         except Exception as e:
             self.log.exception(f"Error fetching cloud storage buckets: {str(e)}")
@@ -79,14 +67,8 @@ class Client:
 
     async def output_file_exists(self, bucket_name, file_name, job_run_id):
         try:
-            credentials = oauth2.Credentials(self._access_token)
-            storage_client = storage.Client(
-                credentials=credentials, project=self.project_id
-            )
             blob_name = f"{job_run_id}/{file_name}"
-            bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(blob_name)
-            if blob.exists():
+            if await self.gcs_client.exists(bucket_name, blob_name):
                 return "true"
             else:
                 return "false"
@@ -13,14 +13,12 @@
 # limitations under the License.
 
 
-import aiohttp
 import json
 from cron_descriptor import get_description
 
-import google.oauth2.credentials as oauth2
-from google.cloud import storage
-
+from scheduler_jupyter_plugin import urls
 from scheduler_jupyter_plugin.commons.constants import (
+    AIPLATFORM_SERVICE_NAME,
     CONTENT_TYPE,
     HTTP_STATUS_OK,
     HTTP_STATUS_FORBIDDEN,
@@ -31,11 +29,10 @@ from scheduler_jupyter_plugin.models.models import (
     DescribeBucketName,
     DescribeUpdateVertexJob,
 )
+from scheduler_jupyter_plugin.services import gcs
 
 
 class Client:
-    client_session = aiohttp.ClientSession()
-
     def __init__(self, credentials, log, client_session):
         self.log = log
         if not (
@@ -49,6 +46,7 @@ class Client:
         self.project_id = credentials["project_id"]
         self.region_id = credentials["region_id"]
         self.client_session = client_session
+        self.gcs_client = gcs.Client(credentials, log, client_session)
 
     def create_headers(self):
         return {
@@ -56,34 +54,31 @@ class Client:
             "Authorization": f"Bearer {self._access_token}",
         }
 
+    async def _aiplatform_url(self, region_id):
+        # Vertex AI endpoints are regional unless overridden in gcloud config.
+        return await urls.gcp_service_url(
+            AIPLATFORM_SERVICE_NAME,
+            default_url=f"https://{region_id}-aiplatform.googleapis.com/",
+        )
+
     async def create_gcs_bucket(self, bucket_name):
         try:
             if not bucket_name:
                 raise ValueError("Bucket name cannot be empty")
-            credentials = oauth2.Credentials(token=self._access_token)
-            storage_client = storage.Client(
-                credentials=credentials, project=self.project_id
-            )
-            storage_client.create_bucket(bucket_name)
+            await self.gcs_client.create_bucket(bucket_name, self.project_id)
         except Exception as error:
             self.log.exception(f"Error in creating Bucket: {error}")
             raise IOError(f"Error in creating Bucket: {error}")
 
     async def upload_to_gcs(self, bucket_name, file_path, job_name):
         input_notebook = file_path.split("/")[-1]
-        credentials = oauth2.Credentials(self._access_token)
-        storage_client = storage.Client(
-            credentials=credentials, project=self.project_id
-        )
-        bucket = storage_client.bucket(bucket_name)
         blob_name = None
+        uploads = []
 
         if "gs:" not in file_path:
             # uploading the input file
             blob_name = f"{job_name}/{input_notebook}"
-            blob = bucket.blob(blob_name)
-            blob.upload_from_filename(file_path)
-            self.log.info(f"File {input_notebook} uploaded to gcs successfully")
+            uploads.append((file_path, blob_name))
 
             # creating json file containing the input file path
             metadata = {"inputFilePath": f"gs://{bucket_name}/{blob_name}"}
@@ -96,9 +91,14 @@ class Client:
             json.dump(metadata, f, indent=4)
 
         # uploading json file containing the input file path
-        json_blob_name = f"{job_name}/{json_file_name}"
-        json_blob = bucket.blob(json_blob_name)
-        json_blob.upload_from_filename(json_file_name)
+        uploads.append((json_file_name, f"{job_name}/{json_file_name}"))
+
+        results = await self.gcs_client.upload_many(bucket_name, uploads)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        if blob_name:
+            self.log.info(f"File {input_notebook} uploaded to gcs successfully")
 
         return blob_name if blob_name else file_path
 
@@ -124,7 +124,7 @@ class Client:
                 file_path if "gs://" in file_path else f"gs://{bucket_name}/{file_path}"
             )
 
-            api_endpoint = f"https://{job.region}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{job.region}/schedules"
+            api_endpoint = f"{await self._aiplatform_url(job.region)}v1/projects/{self.project_id}/locations/{job.region}/schedules"
             headers = self.create_headers()
             payload = {
                 "displayName": job.display_name,
@@ -225,7 +225,7 @@ class Client:
     async def list_uiconfig(self, region_id):
         try:
             uiconfig = []
-            api_endpoint = f"https://{region_id}-aiplatform.googleapis.com/ui/projects/{self.project_id}/locations/{region_id}/uiConfig"
+            api_endpoint = f"{await self._aiplatform_url(region_id)}ui/projects/{self.project_id}/locations/{region_id}/uiConfig"
 
             headers = self.create_headers()
             async with self.client_session.get(
@@ -276,10 +276,10 @@ class Client:
             result = {}
 
             if next_page_token:
-                api_endpoint = f"https://{region_id}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{region_id}/schedules?orderBy=createTime desc&pageToken={next_page_token}&pageSize={page_size}&filter=createNotebookExecutionJobRequest:*"
+                api_endpoint = f"{await self._aiplatform_url(region_id)}v1/projects/{self.project_id}/locations/{region_id}/schedules?orderBy=createTime desc&pageToken={next_page_token}&pageSize={page_size}&filter=createNotebookExecutionJobRequest:*"
 
             else:
-                api_endpoint = f"https://{region_id}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{region_id}/schedules?orderBy=createTime desc&pageSize={page_size}&filter=createNotebookExecutionJobRequest:*"
+                api_endpoint = f"{await self._aiplatform_url(region_id)}v1/projects/{self.project_id}/locations/{region_id}/schedules?orderBy=createTime desc&pageSize={page_size}&filter=createNotebookExecutionJobRequest:*"
 
             headers = self.create_headers()
             async with self.client_session.get(
@@ -353,7 +353,7 @@ class Client:
     async def pause_schedule(self, region_id, schedule_id):
         try:
             api_endpoint = (
-                f"https://{region_id}-aiplatform.googleapis.com/v1/{schedule_id}:pause"
+                f"{await self._aiplatform_url(region_id)}v1/{schedule_id}:pause"
             )
 
             headers = self.create_headers()
@@ -378,7 +378,7 @@ class Client:
     async def resume_schedule(self, region_id, schedule_id):
         try:
             api_endpoint = (
-                f"https://{region_id}-aiplatform.googleapis.com/v1/{schedule_id}:resume"
+                f"{await self._aiplatform_url(region_id)}v1/{schedule_id}:resume"
             )
 
             headers = self.create_headers()
@@ -403,7 +403,7 @@ class Client:
     async def delete_schedule(self, region_id, schedule_id):
         try:
             api_endpoint = (
-                f"https://{region_id}-aiplatform.googleapis.com/v1/{schedule_id}"
+                f"{await self._aiplatform_url(region_id)}v1/{schedule_id}"
             )
 
             headers = self.create_headers()
@@ -428,7 +428,7 @@ class Client:
     async def get_schedule(self, region_id, schedule_id):
         try:
             api_endpoint = (
-                f"https://{region_id}-aiplatform.googleapis.com/v1/{schedule_id}"
+                f"{await self._aiplatform_url(region_id)}v1/{schedule_id}"
             )
 
             headers = self.create_headers()
@@ -451,7 +451,7 @@ class Client:
     async def trigger_schedule(self, region_id, schedule_id):
         try:
             data = await self.get_schedule(region_id, schedule_id)
-            api_endpoint = f"https://{region_id}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{region_id}/notebookExecutionJobs"
+            api_endpoint = f"{await self._aiplatform_url(region_id)}v1/projects/{self.project_id}/locations/{region_id}/notebookExecutionJobs"
 
             headers = self.create_headers()
 
@@ -555,7 +555,7 @@ class Client:
                 item for item in keys if not any(key in item for key in keys_to_filter)
             ]
             update_mask = ",".join(filtered_keys)
-            api_endpoint = f"https://{region_id}-aiplatform.googleapis.com/v1/{schedule_id}?updateMask={update_mask}"
+            api_endpoint = f"{await self._aiplatform_url(region_id)}v1/{schedule_id}?updateMask={update_mask}"
 
             headers = self.create_headers()
             async with self.client_session.patch(
@@ -574,49 +574,59 @@ class Client:
             self.log.exception(f"Error updating schedule: {str(e)}")
             return {"error": str(e)}
 
-    async def list_notebook_execution_jobs(
+    async def iter_notebook_execution_jobs(
         self, region_id, schedule_id, order_by, page_size=None, start_date=None
     ):
-        try:
-            execution_jobs = []
-            if page_size:
-                api_endpoint = f"https://{region_id}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{region_id}/notebookExecutionJobs?filter=schedule={schedule_id}&pageSize={page_size}&orderBy={order_by}"
-            else:
-                api_endpoint = f"https://{region_id}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{region_id}/notebookExecutionJobs?filter=schedule={schedule_id}&orderBy={order_by}"
-
-            headers = self.create_headers()
+        """Yields the notebook execution jobs of a schedule a page at a time.
+
+        Only the first `page_size` jobs are listed when it is given, and all
+        of them otherwise. With a `start_date`, only the jobs created in the
+        same month are yielded.
+        """
+        api_endpoint = f"{await self._aiplatform_url(region_id)}v1/projects/{self.project_id}/locations/{region_id}/notebookExecutionJobs"
+        params = {"filter": f"schedule={schedule_id}", "orderBy": order_by}
+        if page_size:
+            params["pageSize"] = page_size
+        while True:
             async with self.client_session.get(
-                api_endpoint, headers=headers
+                api_endpoint, params=params, headers=self.create_headers()
             ) as response:
-                if response.status == HTTP_STATUS_OK:
-                    resp = await response.json()
-                    if not resp:
-                        return execution_jobs
-                    else:
-                        jobs = resp.get("notebookExecutionJobs")
-                        for job in jobs:
-                            if start_date:
-                                # 1. Get the date part (YYYY-MM-DD)
-                                start_date_only = start_date.partition("T")[0]
-                                job_create_date = job.get("createTime", "").partition("T")[0]
-
-                                # 2. Extract YYYY-MM by splitting on the hyphen and joining the first two elements.
-                                #    Example: '2025-10-13' -> ['2025', '10', '13'] -> '2025-10'
-                                start_year_month = "-".join(start_date_only.split("-")[:2])
-                                job_year_month = "-".join(job_create_date.split("-")[:2])
-
-                                if start_year_month == job_year_month:
-                                    execution_jobs.append(job)
-                            else:
-                                execution_jobs.append(job)
-                        return execution_jobs
-                else:
+                if response.status != HTTP_STATUS_OK:
                     self.log.exception(
                         f"Error fetching notebook execution jobs: {response.reason} {await response.text()}"
                     )
                     raise Exception(
                         f"Error fetching notebook execution jobs: {response.reason} {await response.text()}"
                     )
+                resp = await response.json()
+            if not resp:
+                return
+            jobs = resp.get("notebookExecutionJobs", [])
+            if start_date:
+                # Compare the YYYY-MM part of the dates, e.g. '2025-10-13' -> '2025-10'.
+                start_year_month = start_date.partition("T")[0][:7]
+                jobs = [
+                    job
+                    for job in jobs
+                    if job.get("createTime", "").partition("T")[0][:7]
+                    == start_year_month
+                ]
+            yield jobs
+            next_page_token = resp.get("nextPageToken")
+            if page_size or not next_page_token:
+                return
+            params["pageToken"] = next_page_token
+
+    async def list_notebook_execution_jobs(
+        self, region_id, schedule_id, order_by, page_size=None, start_date=None
+    ):
+        try:
+            execution_jobs = []
+            async for jobs in self.iter_notebook_execution_jobs(
+                region_id, schedule_id, order_by, page_size, start_date
+            ):
+                execution_jobs.extend(jobs)
+            return execution_jobs
         except Exception as e:
             self.log.exception(
                 f"Error fetching list of notebook execution jobs: {str(e)}"
@@ -0,0 +1,110 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import aiohttp
+
+from scheduler_jupyter_plugin.commons import ratelimit, resilience
+
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 60.0
+DEFAULT_DNS_CACHE_TTL = 300
+
+
+class SessionRegistry:
+    """Owns the pooled aiohttp session shared by every service client.
+
+    The session itself is created lazily on first use so that it is bound
+    to the running event loop rather than to whatever loop exists while the
+    server extension is being loaded. It is handed out wrapped in a
+    ResilientSession, whose circuit breakers and host limiters outlive
+    reopened sessions.
+    """
+
+    def __init__(
+        self,
+        limit=DEFAULT_CONNECTION_LIMIT,
+        limit_per_host=DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl=DEFAULT_DNS_CACHE_TTL,
+        host_limits=None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.host_limits = ratelimit.merge_host_limits(host_limits)
+        self._session = None
+        self.breakers = {}
+        self.limiters = {}
+
+    def get(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self._session = resilience.ResilientSession(
+                aiohttp.ClientSession(connector=connector),
+                self.breakers,
+                self.limiters,
+                self.host_limits,
+            )
+        return self._session
+
+    async def close(self):
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_registry = None
+
+
+def setup(**kwargs):
+    """Replaces the process-wide registry; called when the extension loads."""
+    global _registry
+    _registry = SessionRegistry(**kwargs)
+    return _registry
+
+
+def get_session():
+    """Returns the shared aiohttp session, creating it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = SessionRegistry()
+    return _registry.get()
+
+
+def circuit_breakers():
+    """Returns the state and request counts of each upstream host's breaker."""
+    if _registry is None:
+        return {}
+    return {host: breaker.stats() for host, breaker in _registry.breakers.items()}
+
+
+def host_limiters():
+    """Returns the limits, queue depth and queue wait times per upstream host."""
+    if _registry is None:
+        return {}
+    return {host: limiter.stats() for host, limiter in _registry.limiters.items()}
+
+
+async def close():
+    """Closes the shared session; called when the Jupyter server shuts down."""
+    if _registry is not None:
+        await _registry.close()
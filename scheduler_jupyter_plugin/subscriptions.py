@@ -0,0 +1,158 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared pollers that push run status changes to subscribed clients.
+
+There is at most one poller per subscription key, however many clients
+are subscribed to it. Each poller fetches a list of items, and subscribers
+only receive the items that were added, changed or removed since the
+previous poll.
+"""
+
+import asyncio
+import logging
+
+from scheduler_jupyter_plugin.commons import tracing
+
+# Polls are made this often while items keep changing...
+MIN_POLL_INTERVAL = 5
+# ...and back off up to this interval while nothing changes, or up to
+# ACTIVE_POLL_INTERVAL while any item is still in progress.
+MAX_POLL_INTERVAL = 60
+ACTIVE_POLL_INTERVAL = 15
+
+_pollers = {}
+
+
+class Poller:
+    """Polls `fetch()` and publishes the changes to every subscriber queue.
+
+    `item_id(item)` identifies items across polls and `is_active(item)` says
+    whether an item may still change soon.
+    """
+
+    def __init__(self, name, fetch, item_id, is_active):
+        self.name = name
+        self._fetch = fetch
+        self._item_id = item_id
+        self._is_active = is_active
+        self.subscribers = set()
+        self.items = None
+        self.interval = MIN_POLL_INTERVAL
+        self.polls = 0
+        self._task = None
+
+    def start(self):
+        # Polls for every subscriber, not for the request that started it.
+        self._task = tracing.start_background_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def add_subscriber(self, queue):
+        self.subscribers.add(queue)
+        if self.items is not None:
+            # Late subscribers start from the last known state.
+            queue.put_nowait(
+                {
+                    "subscription": self.name,
+                    "changed": list(self.items.values()),
+                    "removed": [],
+                }
+            )
+
+    def _publish(self, event):
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+    def _update(self, items):
+        items = {self._item_id(item): item for item in items}
+        previous = self.items or {}
+        changed = [item for key, item in items.items() if previous.get(key) != item]
+        removed = [key for key in previous if key not in items]
+        first_poll = self.items is None
+        self.items = items
+        if changed or removed or first_poll:
+            self._publish(
+                {"subscription": self.name, "changed": changed, "removed": removed}
+            )
+            return True
+        return False
+
+    def _next_interval(self, changed):
+        if changed:
+            return MIN_POLL_INTERVAL
+        limit = MAX_POLL_INTERVAL
+        if any(self._is_active(item) for item in (self.items or {}).values()):
+            limit = ACTIVE_POLL_INTERVAL
+        return min(self.interval * 2, limit)
+
+    async def _run(self):
+        while True:
+            self.polls += 1
+            try:
+                changed = self._update(await self._fetch())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Error polling {self.name}: {str(e)}")
+                self._publish({"subscription": self.name, "error": str(e)})
+                changed = False
+            self.interval = self._next_interval(changed)
+            await asyncio.sleep(self.interval)
+
+
+def subscribe(key, name, fetch, item_id, is_active, queue):
+    """Subscribes `queue` to the changes for `key`.
+
+    A poller is started for the key if there is none yet; otherwise the
+    existing poller is shared and `fetch` is ignored.
+    """
+    poller = _pollers.get(key)
+    if poller is None:
+        poller = Poller(name, fetch, item_id, is_active)
+        _pollers[key] = poller
+        poller.start()
+    poller.add_subscriber(queue)
+
+
+def unsubscribe(key, queue):
+    """Removes a subscriber, stopping the poller once nobody is left."""
+    poller = _pollers.get(key)
+    if poller is None:
+        return
+    poller.subscribers.discard(queue)
+    if not poller.subscribers:
+        poller.stop()
+        del _pollers[key]
+
+
+def stats():
+    """Returns the subscriber count, interval and poll count per poller."""
+    return {
+        poller.name: {
+            "subscribers": len(poller.subscribers),
+            "interval": poller.interval,
+            "polls": poller.polls,
+        }
+        for poller in _pollers.values()
+    }
+
+
+async def close():
+    """Stops every poller; used as a server shutdown hook."""
+    for poller in _pollers.values():
+        poller.stop()
+    _pollers.clear()
@@ -12,11 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import json
+import urllib
+
 import aiohttp
+import google_crc32c
 from google.cloud import jupyter_config
+from multidict import CIMultiDict
 
 from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin.commons import gcloud_config
 
 
 async def mock_credentials():
@@ -34,11 +40,44 @@ async def mock_config(field_name):
     return None
 
 
+def mock_property(section, name):
+    return None
+
+
+def mock_section(section):
+    return {}
+
+
+class MockStreamReader:
+    def __init__(self, body, fail_after=None):
+        self._body = body
+        self._fail_after = fail_after
+
+    async def iter_chunked(self, n):
+        for start in range(0, len(self._body), n):
+            if self._fail_after is not None and start >= self._fail_after:
+                raise aiohttp.ClientPayloadError("Response payload is not completed")
+            yield self._body[start : start + n]
+
+
 class MockResponse:
-    def __init__(self, json, status=200, text=None):
+    def __init__(
+        self,
+        json,
+        status=200,
+        text=None,
+        reason="",
+        headers=None,
+        body=b"",
+        fail_after=None,
+    ):
         self._json = json
         self._text = text
         self.status = status
+        self.reason = reason
+        self.headers = CIMultiDict(headers or {})
+        self.content_length = len(body)
+        self.content = MockStreamReader(body, fail_after)
 
     async def __aenter__(self):
         return self
@@ -54,12 +93,20 @@ class MockResponse:
 
 
 class MockClientSession:
+    closed = False
+
+    def __init__(self, *args, **kwargs):
+        pass
+
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, *args, **kwargs):
         return
 
+    async def close(self):
+        self.closed = True
+
     def get(self, api_endpoint, headers=None):
         return MockResponse(
             {
@@ -85,51 +132,29 @@ class MockClientSession:
 def patch_mocks(monkeypatch):
     monkeypatch.setattr(credentials, "get_cached", mock_credentials)
     monkeypatch.setattr(jupyter_config, "async_get_gcloud_config", mock_config)
+    monkeypatch.setattr(gcloud_config, "get_property", mock_property)
+    monkeypatch.setattr(gcloud_config, "get_section", mock_section)
     monkeypatch.setattr(aiohttp, "ClientSession", MockClientSession)
 
 
-class MockGetScheduleClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
+class MockGetScheduleClientSession(MockClientSession):
     def get(self, api_endpoint, headers=None):
         return MockResponse(
             {"createNotebookExecutionJobRequest": {"notebookExecutionJob": {}}}
         )
 
 
-class MockPostClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
+class MockPostClientSession(MockClientSession):
     def post(self, api_endpoint, headers=None):
         return MockResponse({})
 
 
-class MockDeleteSchedulesClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
+class MockDeleteSchedulesClientSession(MockClientSession):
     def delete(self, api_endpoint, headers=None):
         return MockResponse({"name": "mock-name", "done": True})
 
 
-class MockListUIConfigClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
+class MockListUIConfigClientSession(MockClientSession):
     def get(self, api_endpoint, headers=None):
         return MockResponse(
             {
@@ -153,26 +178,14 @@ class MockListUIConfigClientSession:
         )
 
 
-class MockListNotebookExecutionJobsClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
-    def get(self, api_endpoint, headers=None):
+class MockListNotebookExecutionJobsClientSession(MockClientSession):
+    def get(self, api_endpoint, params=None, headers=None):
         return MockResponse(
             {"notebookExecutionJobs": [{"name": "mock-name"}, {"name": "mock-name1"}]}
         )
 
 
-class MockListSchedulesClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
+class MockListSchedulesClientSession(MockClientSession):
     def get(self, api_endpoint, headers=None):
         return MockResponse(
                 {
@@ -201,12 +214,106 @@ class MockListSchedulesClientSession:
         )
 
 
-class MockTriggerSchedulesClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
+class MockTriggerSchedulesClientSession(MockClientSession):
     def post(self, api_endpoint, headers=None, json={}):
         return MockResponse({"name": "mock-name"})
+
+
+def crc32c(data):
+    return base64.b64encode(google_crc32c.Checksum(data).digest()).decode()
+
+
+class MockGCSClientSession(MockClientSession):
+    """An in-memory stand-in for the Cloud Storage JSON API."""
+
+    def __init__(self, *args, **kwargs):
+        self.objects = {}
+        self.buckets = []
+        self.requests = []
+        self.uploads = {}
+        # Number of bytes dropped from the next upload chunk, to simulate the
+        # service persisting only part of a chunk.
+        self.short_persist = 0
+        # Number of bytes after which the next download is cut off.
+        self.interrupt_after = None
+
+    def _parse(self, api_endpoint):
+        path = urllib.parse.urlparse(api_endpoint).path
+        parts = [urllib.parse.unquote(part) for part in path.split("/")]
+        if "o" in parts:
+            index = parts.index("o")
+            return parts[index - 1], "/".join(parts[index + 1 :])
+        return None, None
+
+    def _metadata(self, bucket, name):
+        data = self.objects[(bucket, name)]
+        return {
+            "bucket": bucket,
+            "name": name,
+            "size": str(len(data)),
+            "crc32c": crc32c(data),
+        }
+
+    def get(self, api_endpoint, headers=None, params=None):
+        self.requests.append(("GET", api_endpoint, dict(params or {})))
+        bucket, name = self._parse(api_endpoint)
+        if bucket is None:
+            return MockResponse({"items": [{"name": name} for name in self.buckets]})
+        if (bucket, name) not in self.objects:
+            return MockResponse({}, status=404, reason="Not Found")
+        if params and params.get("alt") == "media":
+            data = self.objects[(bucket, name)]
+            response_headers = {
+                "x-goog-hash": f"crc32c={crc32c(data)}",
+                "x-goog-generation": "1",
+            }
+            status = 200
+            if headers and "Range" in headers:
+                data = data[int(headers["Range"][len("bytes=") : -1]) :]
+                status = 206
+            fail_after, self.interrupt_after = self.interrupt_after, None
+            return MockResponse(
+                None,
+                status=status,
+                headers=response_headers,
+                body=data,
+                fail_after=fail_after,
+            )
+        return MockResponse(self._metadata(bucket, name))
+
+    def post(self, api_endpoint, headers=None, params=None, data=None):
+        self.requests.append(("POST", api_endpoint, params))
+        if params and params.get("uploadType") == "resumable":
+            bucket = api_endpoint.split("/b/")[1].split("/")[0]
+            session_url = f"https://upload.example.com/{len(self.uploads)}"
+            self.uploads[session_url] = (bucket, params["name"], b"")
+            return MockResponse({}, headers={"Location": session_url})
+        bucket = json.loads(data)
+        self.buckets.append(bucket["name"])
+        return MockResponse(bucket)
+
+    def put(self, api_endpoint, headers=None, data=None):
+        self.requests.append(("PUT", api_endpoint, None))
+        bucket, name, received = self.uploads[api_endpoint]
+        content_range = headers["Content-Range"].split(" ")[1]
+        byte_range, _, total = content_range.partition("/")
+        if byte_range != "*":
+            start = int(byte_range.split("-")[0])
+            assert start == len(received)
+            received += data[: len(data) - self.short_persist]
+            self.short_persist = 0
+        self.uploads[api_endpoint] = (bucket, name, received)
+        if len(received) < int(total):
+            persisted = {"Range": f"bytes=0-{len(received) - 1}"} if received else {}
+            return MockResponse({}, status=308, headers=persisted)
+        if headers.get("X-Goog-Hash") != f"crc32c={crc32c(received)}":
+            return MockResponse({}, status=400, reason="Bad Request")
+        self.objects[(bucket, name)] = received
+        return MockResponse(self._metadata(bucket, name))
+
+    def delete(self, api_endpoint, headers=None):
+        self.requests.append(("DELETE", api_endpoint, None))
+        bucket, name = self._parse(api_endpoint)
+        if self.objects.pop((bucket, name), None) is None:
+            return MockResponse({}, status=404, reason="Not Found")
+        return MockResponse(None, status=204)
@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import subprocess
+import urllib.parse
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
@@ -24,7 +27,7 @@ import pytest
 from google.cloud import jupyter_config
 
 from scheduler_jupyter_plugin import credentials
-from scheduler_jupyter_plugin.services import airflow
+from scheduler_jupyter_plugin.services import airflow, composer
 
 
 async def mock_get_airflow_uri_and_bucket(
@@ -33,9 +36,31 @@ async def mock_get_airflow_uri_and_bucket(
     return {"airflow_uri": "https://mock_airflow_uri", "bucket": "mock_bucket"}
 
 
+class MockPagedDagsClientSession(mocks.MockClientSession):
+    def __init__(self, dags=250, max_page_size=100):
+        self.dags = [{"dag_id": f"dag_{i:03}"} for i in range(dags)]
+        self.max_page_size = max_page_size
+        self.queries = []
+
+    def get(self, api_endpoint, headers=None):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(api_endpoint).query)
+        self.queries.append(query)
+        offset = int(query["offset"][0])
+        limit = min(int(query["limit"][0]), self.max_page_size)
+        return mocks.MockResponse(
+            {
+                "dags": self.dags[offset : offset + limit],
+                "total_entries": len(self.dags),
+            }
+        )
+
+
 async def test_list_jobs(monkeypatch, jp_fetch):
     mocks.patch_mocks(monkeypatch)
-
+    client_session = MockPagedDagsClientSession()
+    monkeypatch.setattr(
+        aiohttp, "ClientSession", lambda *args, **kwargs: client_session
+    )
     monkeypatch.setattr(
         airflow.Client, "get_airflow_uri_and_bucket", mock_get_airflow_uri_and_bucket
     )
@@ -49,16 +74,138 @@ async def test_list_jobs(monkeypatch, jp_fetch):
             "composer": mock_composer,
             "project_id": mock_project_id,
             "region_id": mock_region_id,
+            "search": "dag_",
+            "paused": "false",
         },
     )
 
     assert response.code == 200
+    dags, bucket = json.loads(response.body)
+    assert bucket == "mock_bucket"
+    assert dags["total_entries"] == 250
+    assert [dag["dag_id"] for dag in dags["dags"]] == [
+        f"dag_{i:03}" for i in range(250)
+    ]
+    assert sorted(int(query["offset"][0]) for query in client_session.queries) == [
+        0,
+        100,
+        200,
+    ]
+    for query in client_session.queries:
+        assert query["tags"] == ["scheduler_jupyter_plugin"]
+        assert query["order_by"] == ["dag_id"]
+        assert query["dag_id_pattern"] == ["dag_"]
+        assert query["paused"] == ["false"]
+
+
+async def test_list_jobs_server_page_limit(monkeypatch):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(
+        airflow.Client, "get_airflow_uri_and_bucket", mock_get_airflow_uri_and_bucket
+    )
+    client_session = MockPagedDagsClientSession(dags=120, max_page_size=25)
+    client = airflow.Client(await mocks.mock_credentials(), MagicMock(), client_session)
+
+    dags, _ = await client.list_jobs("mock-url", None, None, offset=10, limit=100)
+
+    assert [dag["dag_id"] for dag in dags["dags"]] == [
+        f"dag_{i:03}" for i in range(10, 110)
+    ]
+    assert len(client_session.queries) == 4
+
+
+@pytest.mark.parametrize(
+    "argument, value, error",
+    [
+        ("order_by", "dag_id;drop", "Invalid DAG order: dag_id;drop"),
+        # Not unique, so offset pages could skip DAGs.
+        ("order_by", "is_paused", "Invalid DAG order: is_paused"),
+        ("limit", "0", "Invalid limit: 0"),
+        ("offset", "-1", "Invalid offset: -1"),
+    ],
+)
+async def test_list_jobs_invalid_filter(monkeypatch, jp_fetch, argument, value, error):
+    mocks.patch_mocks(monkeypatch)
+    response = await jp_fetch(
+        "scheduler-plugin",
+        "dagList",
+        params={
+            "composer": "mock-url",
+            "project_id": "mock-project-id",
+            "region_id": "mock-region-id",
+            argument: value,
+        },
+    )
     payload = json.loads(response.body)
-    assert (
-        payload[0]["api_endpoint"]
-        == "https://mock_airflow_uri/api/v1/dags?tags=scheduler_jupyter_plugin"
+    assert payload == {"error": error}
+
+
+async def mock_list_environments(self, project_id=None, region_id=None):
+    if region_id == "forbidden-region":
+        return {"Error fetching environments list": "Forbidden"}
+    return [
+        SimpleNamespace(name=f"{region_id}-{name}")
+        for name in ("env", "slow", "broken")
+    ]
+
+
+async def mock_list_environment_jobs(
+    self, composer_name, project_id, region_id, **filters
+):
+    if composer_name.endswith("slow"):
+        await asyncio.sleep(10)
+    if composer_name.endswith("broken"):
+        return {"error": "Internal Server Error"}
+    dags = [{"dag_id": f"{composer_name}-{filters['search']}"}]
+    return {"dags": dags, "total_entries": 1}, f"{composer_name}-bucket"
+
+
+async def test_list_all_jobs(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(composer.Client, "list_environments", mock_list_environments)
+    monkeypatch.setattr(airflow.Client, "list_jobs", mock_list_environment_jobs)
+
+    response = await jp_fetch(
+        "scheduler-plugin",
+        "dagListAll",
+        params=[
+            ("region_id", "region-1"),
+            ("region_id", "forbidden-region"),
+            ("search", "nightly"),
+            ("timeout", "0.2"),
+            ("format", "ndjson"),
+        ],
     )
-    assert payload[0]["headers"]["Authorization"] == f"Bearer mock-token"
+
+    lines = [json.loads(line) for line in response.body.decode().splitlines()]
+    results = {line.get("environment", line["region_id"]): line for line in lines}
+    assert len(lines) == 4
+    assert lines[0]["region_id"] == "forbidden-region"
+    assert "Forbidden" in lines[0]["error"]
+    assert results["region-1-env"] == {
+        "environment": "region-1-env",
+        "project_id": "credentials-project",
+        "region_id": "region-1",
+        "dags": [{"dag_id": "region-1-env-nightly"}],
+        "total_entries": 1,
+        "bucket": "region-1-env-bucket",
+    }
+    assert results["region-1-broken"]["error"] == "Internal Server Error"
+    assert "Timed out" in results["region-1-slow"]["error"]
+    # Environments are streamed as they answer.
+    assert lines[-1]["environment"] == "region-1-slow"
+
+
+@pytest.mark.parametrize("timeout", ["0", "-1", "nan", "inf", "301", "soon"])
+async def test_list_all_jobs_invalid_timeout(monkeypatch, jp_fetch, timeout):
+    mocks.patch_mocks(monkeypatch)
+    response = await jp_fetch(
+        "scheduler-plugin", "dagListAll", params={"timeout": timeout}
+    )
+    payload = json.loads(response.body)
+    assert payload == {
+        "error": f"Invalid timeout: {timeout}, expected seconds between 0 and 300"
+    }
 
 
 async def test_list_dag_with_missing_argument(monkeypatch, jp_fetch):
@@ -133,13 +280,7 @@ async def test_list_dag_with_invalid_credentials(monkeypatch, jp_fetch):
         assert payload["status"] == expected_status
 
 
-class MockClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
+class MockClientSession(mocks.MockClientSession):
     def patch(self, api_endpoint, json, headers=None):
         if json["is_paused"] is False:
             return mocks.MockResponse({})
@@ -403,3 +544,178 @@ async def test_invalid_dag_id(monkeypatch, jp_fetch):
     assert "results" not in payload
     assert "error" in payload
     assert "Invalid DAG ID" in payload["error"]
+
+
+async def test_bulk_dag_action(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+    calls = []
+
+    async def bulk_dag_action(
+        self, composer_name, dag_ids, action, project_id, region_id
+    ):
+        calls.append((composer_name, dag_ids, action))
+        return [{"dag_id": dag_id, "status": 0} for dag_id in dag_ids]
+
+    monkeypatch.setattr(airflow.Client, "bulk_dag_action", bulk_dag_action)
+
+    async def post(body):
+        response = await jp_fetch(
+            "scheduler-plugin",
+            "dagBulk",
+            params={
+                "composer": "composer",
+                "project_id": "mock-project-id",
+                "region_id": "mock-region-id",
+            },
+            method="POST",
+            body=json.dumps(body),
+        )
+        return json.loads(response.body)
+
+    payload = await post({"action": "pause", "dag_ids": ["dag_1", "dag_2", "dag_1"]})
+    assert [result["dag_id"] for result in payload["results"]] == ["dag_1", "dag_2"]
+    assert calls == [("composer", ["dag_1", "dag_2"], "pause")]
+
+    payload = await post({"action": "archive", "dag_ids": ["dag_1"]})
+    assert payload == {"error": "Invalid action: archive"}
+    payload = await post({"action": "delete", "dag_ids": ["dag_1", "../dag"]})
+    assert payload == {"error": "Invalid DAG ID: ../dag"}
+    assert len(calls) == 1
+
+
+class MockEnvironmentClientSession(mocks.MockClientSession):
+    def __init__(self, status=200):
+        self.status = status
+        self.calls = 0
+
+    def get(self, api_endpoint, headers=None):
+        self.calls += 1
+        return mocks.MockResponse(
+            {
+                "config": {"airflowUri": "https://mock_airflow_uri"},
+                "storageConfig": {"bucket": "mock_bucket"},
+                "state": "RUNNING",
+            },
+            status=self.status,
+        )
+
+
+async def test_airflow_uri_and_bucket_cached(monkeypatch):
+    mocks.patch_mocks(monkeypatch)
+    airflow.environment_cache.invalidate()
+    client_session = MockEnvironmentClientSession()
+    client = airflow.Client(await mocks.mock_credentials(), MagicMock(), client_session)
+
+    for _ in range(3):
+        environment = await client.get_airflow_uri_and_bucket(
+            "mock-composer", "mock-project-id", "mock-region-id"
+        )
+    assert environment["airflow_uri"] == "https://mock_airflow_uri"
+    assert environment["bucket"] == "mock_bucket"
+    assert client_session.calls == 1
+    airflow.environment_cache.invalidate()
+
+
+async def test_missing_environment_cached(monkeypatch):
+    mocks.patch_mocks(monkeypatch)
+    airflow.environment_cache.invalidate()
+    client_session = MockEnvironmentClientSession(status=404)
+    client = airflow.Client(await mocks.mock_credentials(), MagicMock(), client_session)
+
+    for _ in range(2):
+        with pytest.raises(Exception, match="Error getting airflow uri"):
+            await client.get_airflow_uri_and_bucket(
+                "mock-composer", "mock-project-id", "mock-region-id"
+            )
+    assert client_session.calls == 1
+    airflow.environment_cache.invalidate()
+
+
+class MockTaskLogClientSession(mocks.MockClientSession):
+    def __init__(self, state):
+        self.state = state
+        self.state_requests = 0
+        self.log_requests = []
+
+    def get(self, api_endpoint, headers=None, params=None):
+        if "/logs/" not in api_endpoint:
+            self.state_requests += 1
+            return mocks.MockResponse({"state": self.state, "try_number": 1})
+        self.log_requests.append(params)
+        if params is None:
+            return mocks.MockResponse(None, text="line 1\nline 2\n")
+        if params.get("token") == "token-1":
+            return mocks.MockResponse(
+                {"content": "line 2\n", "continuation_token": "token-2"}
+            )
+        return mocks.MockResponse(
+            {"content": "line 1\n", "continuation_token": "token-1"}
+        )
+
+
+async def test_task_logs_incremental(monkeypatch):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(
+        airflow.Client, "get_airflow_uri_and_bucket", mock_get_airflow_uri_and_bucket
+    )
+    client_session = MockTaskLogClientSession("running")
+    client = airflow.Client(await mocks.mock_credentials(), MagicMock(), client_session)
+    args = ("mock-composer", "dag", "run-1", "task", "1", "project", "region")
+
+    first = await client.list_dag_run_task_logs(*args, full_content=False)
+    second = await client.list_dag_run_task_logs(
+        *args, full_content=False, continuation_token=first["continuation_token"]
+    )
+
+    assert first == {
+        "content": "line 1\n",
+        "continuation_token": "token-1",
+        "end_of_log": False,
+    }
+    assert second["content"] == "line 2\n"
+    assert client_session.log_requests[1] == {
+        "full_content": "false",
+        "token": "token-1",
+    }
+
+
+async def test_finished_task_logs_cached(monkeypatch):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(
+        airflow.Client, "get_airflow_uri_and_bucket", mock_get_airflow_uri_and_bucket
+    )
+    airflow.task_log_cache.invalidate()
+    client_session = MockTaskLogClientSession("success")
+    client = airflow.Client(await mocks.mock_credentials(), MagicMock(), client_session)
+    args = ("mock-composer", "dag", "run-2", "task", "1", "project", "region")
+
+    full = await client.list_dag_run_task_logs(*args, task_state="success")
+    incremental = await client.list_dag_run_task_logs(*args, full_content=False)
+
+    assert full == {"content": "line 1\nline 2\n"}
+    assert incremental == {
+        "content": "line 1\nline 2\n",
+        "continuation_token": None,
+        "end_of_log": True,
+    }
+    assert client_session.log_requests == [None]
+    assert client_session.state_requests == 0
+    airflow.task_log_cache.invalidate()
+
+
+async def test_full_task_logs_without_state_skip_lookup(monkeypatch):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(
+        airflow.Client, "get_airflow_uri_and_bucket", mock_get_airflow_uri_and_bucket
+    )
+    airflow.task_log_cache.invalidate()
+    client_session = MockTaskLogClientSession("success")
+    client = airflow.Client(await mocks.mock_credentials(), MagicMock(), client_session)
+    args = ("mock-composer", "dag", "run-3", "task", "1", "project", "region")
+
+    for _ in range(2):
+        full = await client.list_dag_run_task_logs(*args)
+        assert full == {"content": "line 1\nline 2\n"}
+    assert client_session.log_requests == [None, None]
+    assert client_session.state_requests == 0
+    airflow.task_log_cache.invalidate()
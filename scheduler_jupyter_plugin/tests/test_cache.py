@@ -0,0 +1,75 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from scheduler_jupyter_plugin.commons.cache import AsyncTTLCache
+
+
+class NotFound(Exception):
+    pass
+
+
+class Loader:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = AsyncTTLCache(ttl=60)
+    load = Loader("value")
+    results = await asyncio.gather(*[cache.get("key", load) for _ in range(5)])
+    assert results == ["value"] * 5
+    assert load.calls == 1
+
+
+async def test_stale_value_is_served_while_revalidating():
+    cache = AsyncTTLCache(ttl=0, stale_ttl=60)
+    load = Loader("old", "new")
+    assert await cache.get("key", load) == "old"
+    assert await cache.get("key", load) == "old"
+    await asyncio.sleep(0.01)
+    assert load.calls == 2
+    assert cache._entries["key"][0] == "new"
+
+
+async def test_negative_results_are_cached():
+    cache = AsyncTTLCache(ttl=60, negative_ttl=60, negative_exceptions=(NotFound,))
+    load = Loader(NotFound("missing"), "value")
+    for _ in range(2):
+        with pytest.raises(NotFound):
+            await cache.get("key", load)
+    assert load.calls == 1
+
+    cache.invalidate("key")
+    assert await cache.get("key", load) == "value"
+
+
+async def test_other_errors_are_not_cached():
+    cache = AsyncTTLCache(ttl=60, negative_ttl=60, negative_exceptions=(NotFound,))
+    load = Loader(RuntimeError("unavailable"), "value")
+    with pytest.raises(RuntimeError):
+        await cache.get("key", load)
+    assert await cache.get("key", load) == "value"
@@ -0,0 +1,84 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+
+import pytest
+
+from scheduler_jupyter_plugin.commons import coalesce
+from scheduler_jupyter_plugin.services import compute
+from scheduler_jupyter_plugin.tests import mocks
+
+
+async def test_concurrent_calls_share_one_load():
+    single_flight = coalesce.SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["value"]
+
+    results = await asyncio.gather(
+        *[single_flight.do(("op", "a"), load) for _ in range(3)],
+        single_flight.do(("op", "b"), load),
+    )
+
+    assert results == [["value"]] * 4
+    assert calls == 2
+    assert single_flight.stats() == {"op": {"calls": 4, "coalesced": 2}}
+
+    await single_flight.do(("op", "a"), load)
+    assert calls == 3
+
+
+async def test_errors_are_shared():
+    single_flight = coalesce.SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    results = await asyncio.gather(
+        single_flight.do(("op",), load),
+        single_flight.do(("op",), load),
+        return_exceptions=True,
+    )
+    assert [str(result) for result in results] == ["upstream failed"] * 2
+
+
+async def test_identical_requests_are_coalesced(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+    calls = 0
+
+    async def mock_list_region(self):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return ["us-central1"]
+
+    monkeypatch.setattr(compute.Client, "list_region", mock_list_region)
+    coalesced_before = coalesce.stats().get("RegionController", {}).get("coalesced", 0)
+
+    responses = await asyncio.gather(
+        *[jp_fetch("scheduler-plugin", "api/compute/region") for _ in range(3)]
+    )
+
+    assert [json.loads(response.body) for response in responses] == [
+        ["us-central1"]
+    ] * 3
+    assert calls == 1
+    assert coalesce.stats()["RegionController"]["coalesced"] == coalesced_before + 2
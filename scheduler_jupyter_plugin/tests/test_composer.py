@@ -19,13 +19,7 @@ import aiohttp
 from scheduler_jupyter_plugin.tests import mocks
 
 
-class MockClientSession:
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        return
-
+class MockClientSession(mocks.MockClientSession):
     def get(self, api_endpoint, headers=None):
         return mocks.MockResponse(
             {
@@ -0,0 +1,121 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import datetime
+
+import pytest
+
+from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin.commons import gcloud_config
+
+
+@pytest.fixture
+def gcloud(monkeypatch, tmp_path):
+    calls = {"config": 0, "describe": 0}
+    token_expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+        hours=1
+    )
+    config = {
+        "configuration.properties.core.project": "mock-project",
+        "configuration.properties.dataproc.region": "mock-region",
+        "credential.access_token": "mock-token",
+        "credential.token_expiry": token_expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+    async def mock_config(field):
+        calls["config"] += 1
+        await asyncio.sleep(0)
+        return config.get(field)
+
+    def mock_property(section, name):
+        return config.get(f"configuration.properties.{section}.{name}")
+
+    async def mock_subcommand(cmd):
+        calls["describe"] += 1
+        return "12345"
+
+    monkeypatch.setattr(credentials, "async_get_gcloud_config", mock_config)
+    monkeypatch.setattr(credentials, "async_run_gcloud_subcommand", mock_subcommand)
+    monkeypatch.setattr(gcloud_config, "get_property", mock_property)
+    monkeypatch.setattr(
+        credentials, "PROJECT_NUMBERS_FILE", str(tmp_path / "project_numbers.json")
+    )
+    monkeypatch.setattr(credentials, "_project_numbers", None)
+    credentials.invalidate()
+    yield config, calls
+    credentials.invalidate()
+
+
+async def test_get_cached_reuses_credentials(gcloud):
+    config, calls = gcloud
+    first = await credentials.get_cached()
+    config_calls = calls["config"]
+    second = await credentials.get_cached()
+
+    assert first == second
+    assert first["project_number"] == "12345"
+    assert first["login_error"] == 0 and first["config_error"] == 0
+    assert calls["config"] == config_calls
+
+
+async def test_get_cached_single_flight(gcloud):
+    _, calls = gcloud
+    results = await asyncio.gather(*[credentials.get_cached() for _ in range(10)])
+
+    assert all(r["access_token"] == "mock-token" for r in results)
+    assert calls["describe"] == 1
+    assert calls["config"] == 2
+
+
+async def test_get_cached_respects_token_expiry(gcloud):
+    config, calls = gcloud
+    config["credential.token_expiry"] = "2000-01-01T00:00:00Z"
+    await credentials.get_cached()
+    config_calls = calls["config"]
+    await credentials.get_cached()
+
+    assert calls["config"] == 2 * config_calls
+
+
+async def test_invalidate_keeps_project_number(gcloud):
+    _, calls = gcloud
+    await credentials.get_cached()
+    credentials.invalidate()
+    credentials._project_numbers = None
+    await credentials.get_cached()
+
+    assert calls["describe"] == 1
+
+
+async def test_login_error_is_not_cached(gcloud):
+    config, calls = gcloud
+    config["credential.access_token"] = None
+    assert (await credentials.get_cached())["login_error"] == 1
+
+    config["credential.access_token"] = "mock-token"
+    assert (await credentials.get_cached())["login_error"] == 0
+
+
+async def test_refresh_started_before_invalidate_is_not_cached(gcloud):
+    config, calls = gcloud
+    refresh = asyncio.ensure_future(credentials.get_cached())
+    # Until the refresh has read the project and waits for the token.
+    while not calls["config"]:
+        await asyncio.sleep(0)
+    credentials.invalidate()
+    config["configuration.properties.core.project"] = "other-project"
+    await refresh
+
+    assert (await credentials.get_cached())["project_id"] == "other-project"
@@ -0,0 +1,219 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextlib
+import logging
+import time
+
+import aiohttp
+
+from scheduler_jupyter_plugin import emulator
+from scheduler_jupyter_plugin.services import airflow, composer, gcs, vertex
+
+CREDENTIALS = {
+    "access_token": "emulator-token",
+    "project_id": "emulator-project",
+    "region_id": "us-central1",
+}
+ENVIRONMENT = "emulator-env-0"
+
+
+@contextlib.asynccontextmanager
+async def running_emulator(monkeypatch, environments=1):
+    dataset = emulator.Dataset(
+        environments=environments, dags=250, runs_per_dag=30, schedules=3
+    )
+    app = emulator.create_app(dataset)
+    runner, base_url = await emulator.start(app)
+    for name, url in emulator.endpoint_overrides(base_url).items():
+        monkeypatch.setenv(f"CLOUDSDK_API_ENDPOINT_OVERRIDES_{name.upper()}", url)
+    airflow.environment_cache.invalidate()
+    async with aiohttp.ClientSession() as session:
+        yield app, dataset, session
+    airflow.environment_cache.invalidate()
+    await runner.cleanup()
+
+
+async def test_composer_and_airflow(monkeypatch):
+    async with running_emulator(monkeypatch) as (app, dataset, session):
+        log = logging.getLogger()
+        environments = await composer.Client(
+            CREDENTIALS, log, session
+        ).list_environments()
+        assert [environment.name for environment in environments] == [ENVIRONMENT]
+
+        client = airflow.Client(CREDENTIALS, log, session)
+        dags, bucket = await client.list_jobs(ENVIRONMENT, None, None)
+        assert bucket == f"{ENVIRONMENT}-bucket"
+        assert dags["total_entries"] == 250
+        assert len({dag["dag_id"] for dag in dags["dags"]}) == 250
+
+        dags, _ = await client.list_jobs(
+            ENVIRONMENT, None, None, search="00019", order_by="-dag_id"
+        )
+        dag_ids = [dag["dag_id"] for dag in dags["dags"]]
+        assert len(dag_ids) == 11 and all("00019" in dag_id for dag_id in dag_ids)
+        assert dag_ids == sorted(dag_ids, reverse=True)
+
+        dag_id = dags["dags"][0]["dag_id"]
+        runs = await client.list_latest_dag_runs(ENVIRONMENT, dag_id, None, None)
+        assert len(runs) == 25
+        assert runs[0]["execution_date"] > runs[-1]["execution_date"]
+
+        tasks = await client.list_dag_run_task(
+            ENVIRONMENT, dag_id, runs[5]["dag_run_id"], None, None
+        )
+        task_id = tasks["task_instances"][0]["task_id"]
+        log_content = await client.list_dag_run_task_logs(
+            ENVIRONMENT, dag_id, runs[5]["dag_run_id"], task_id, 1, None, None
+        )
+        assert log_content["content"].count("\n") == dataset.log_lines
+
+        assert await client.update_job(ENVIRONMENT, dag_id, "false", None, None) == 0
+        assert dataset.dags[ENVIRONMENT][dag_id]["is_paused"]
+
+        job = await client.edit_jobs(dag_id, bucket)
+        assert job["retry_count"] == 1
+        assert job["parameters"] == ["param1:value1", "param2:value2"]
+
+
+async def test_list_all_environments(monkeypatch):
+    async with running_emulator(monkeypatch, environments=3) as (
+        app,
+        dataset,
+        session,
+    ):
+        log = logging.getLogger()
+        composer_client = composer.Client(CREDENTIALS, log, session)
+        client = airflow.Client(CREDENTIALS, log, session)
+        del dataset.dags["emulator-env-2"]
+
+        results = [
+            result
+            async for page in client.iter_all_jobs(
+                composer_client, "emulator-project", ["us-central1"]
+            )
+            for result in page
+        ]
+        results = {result["environment"]: result for result in results}
+        assert sorted(results) == ["emulator-env-0", "emulator-env-1", "emulator-env-2"]
+        assert results["emulator-env-0"]["total_entries"] == 250
+        assert len(results["emulator-env-1"]["dags"]) == 250
+        assert "Environment not found" in results["emulator-env-2"]["error"]
+
+        app[emulator.app.SETTINGS].update({"surface_latency": {"airflow": 0.5}})
+        pages = [
+            page
+            async for page in client.iter_all_jobs(
+                composer_client, "emulator-project", ["us-central1"], timeout=0.1
+            )
+        ]
+        assert len(pages) == 3
+        assert all("Timed out" in result["error"] for (result,) in pages)
+        # The emulator is still answering the requests that timed out.
+        while app[emulator.app.STATS].in_flight:
+            await asyncio.sleep(0.05)
+
+
+async def test_bulk_dag_actions(monkeypatch):
+    async with running_emulator(monkeypatch) as (app, dataset, session):
+        client = airflow.Client(CREDENTIALS, logging.getLogger(), session)
+        stats = app[emulator.app.STATS]
+        dags = dataset.dags[ENVIRONMENT]
+
+        # Paused one DAG at a time, leaving DAGs sharing their prefix alone.
+        dag_ids = [f"emulator_dag_{i:06}" for i in range(200, 250)]
+        dags["emulator_dag_000249_new"] = dict(
+            dags["emulator_dag_000249"], dag_id="emulator_dag_000249_new"
+        )
+        requests = stats.requests["airflow"]
+        results = await client.bulk_dag_action(
+            ENVIRONMENT, dag_ids, "pause", None, None
+        )
+        assert results == [{"dag_id": dag_id, "status": 0} for dag_id in dag_ids]
+        assert stats.requests["airflow"] - requests == len(dag_ids)
+        assert all(dags[dag_id]["is_paused"] for dag_id in dag_ids)
+        assert not dags["emulator_dag_000249_new"]["is_paused"]
+        assert not dags["emulator_dag_000020"]["is_paused"]
+
+        results = await client.bulk_dag_action(
+            ENVIRONMENT, dag_ids, "resume", None, None
+        )
+        assert [result["status"] for result in results] == [0] * len(dag_ids)
+        assert not any(dags[dag_id]["is_paused"] for dag_id in dag_ids)
+
+        results = await client.bulk_dag_action(
+            ENVIRONMENT, ["emulator_dag_000001", "missing_dag"], "trigger", None, None
+        )
+        assert results[0]["dag_run_id"]
+        assert "DAG not found" in results[1]["error"]
+
+        dataset.put_object(
+            f"{ENVIRONMENT}-bucket", "dags/dag_emulator_dag_000002.py", b""
+        )
+        results = await client.bulk_dag_action(
+            ENVIRONMENT, ["emulator_dag_000002", "missing_dag"], "delete", None, None
+        )
+        assert results[0] == {"dag_id": "emulator_dag_000002", "status": 0}
+        assert "DAG not found" in results[1]["error"]
+        assert "emulator_dag_000002" not in dags
+
+
+async def test_vertex(monkeypatch):
+    async with running_emulator(monkeypatch) as (app, dataset, session):
+        client = vertex.Client(CREDENTIALS, logging.getLogger(), session)
+        schedules = await client.list_schedules("us-central1")
+        assert len(schedules["schedules"]) == 3
+
+        schedule_name = schedules["schedules"][0]["name"]
+        jobs = await client.list_notebook_execution_jobs(
+            "us-central1", schedule_name.rsplit("/", 1)[-1], "createTime desc"
+        )
+        assert len(jobs) == dataset.jobs_per_schedule
+
+        assert await client.pause_schedule("us-central1", schedule_name) == {}
+        schedule = await client.get_schedule("us-central1", schedule_name)
+        assert schedule["state"] == "PAUSED"
+
+
+async def test_gcs_round_trip(monkeypatch, tmp_path):
+    async with running_emulator(monkeypatch) as (app, dataset, session):
+        client = gcs.Client(CREDENTIALS, logging.getLogger(), session)
+        source = tmp_path / "notebook.ipynb"
+        source.write_bytes(b"x" * (600 * 1024))
+        bucket = f"{ENVIRONMENT}-bucket"
+
+        await client.upload(bucket, "notebooks/n.ipynb", str(source), 256 * 1024)
+        await client.download(bucket, "notebooks/n.ipynb", str(tmp_path / "copy"))
+        assert (tmp_path / "copy").read_bytes() == source.read_bytes()
+
+        await client.delete(bucket, "notebooks/n.ipynb")
+        assert not await client.exists(bucket, "notebooks/n.ipynb")
+
+
+async def test_latency_and_error_injection(monkeypatch):
+    async with running_emulator(monkeypatch) as (app, dataset, session):
+        settings = app[emulator.app.SETTINGS]
+        client = vertex.Client(CREDENTIALS, logging.getLogger(), session)
+
+        settings.update({"surface_latency": {"vertex": 0.2}})
+        start = time.perf_counter()
+        await client.list_uiconfig("us-central1")
+        assert time.perf_counter() - start >= 0.2
+
+        settings.update({"surface_latency": {}, "error_rate": 1.0})
+        result = await client.list_uiconfig("us-central1")
+        assert "Injected error" in result["Error fetching ui config"]
+        assert app[emulator.app.STATS].injected_errors["vertex"] == 1
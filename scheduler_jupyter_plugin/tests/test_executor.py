@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import subprocess
 import unittest
@@ -19,11 +20,11 @@ from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import aiohttp
 import pytest
-from google.cloud import storage
 
 from scheduler_jupyter_plugin import credentials
 from scheduler_jupyter_plugin.services import airflow
 from scheduler_jupyter_plugin.services import executor
+from scheduler_jupyter_plugin.tests import mocks
 from scheduler_jupyter_plugin.tests.test_airflow import MockClientSession
 
 
@@ -100,18 +101,17 @@ async def test_download_dag_output(monkeypatch, returncode, expected_result, jp_
     async def mock_list_dag_run_task(*args, **kwargs):
         return None
 
-    monkeypatch.setattr(airflow.Client, "list_dag_run_task", mock_list_dag_run_task)
-    monkeypatch.setattr(aiohttp, "ClientSession", MockClientSession)
-    mock_blob = MagicMock()
-    mock_blob.download_as_bytes.return_value = b"mock file content"
-
-    mock_bucket = MagicMock()
-    mock_bucket.blob.return_value = mock_blob
+    class MockOutputClientSession(mocks.MockGCSClientSession):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            blob_name = (
+                "dataproc-output/mock-dag-id/output-notebooks/mock-dag-id_258.ipynb"
+            )
+            self.objects[("mock_bucket", blob_name)] = b"mock file content"
 
-    mock_storage_client = MagicMock()
-    mock_storage_client.bucket.return_value = mock_bucket
+    monkeypatch.setattr(airflow.Client, "list_dag_run_task", mock_list_dag_run_task)
+    monkeypatch.setattr(aiohttp, "ClientSession", MockOutputClientSession)
     monkeypatch.setattr(credentials, "get_cached", mock_credentials)
-    monkeypatch.setattr(storage, "Client", lambda credentials=None: mock_storage_client)
 
     mock_composer_name = "mock-composer"
     mock_bucket_name = "mock_bucket"
@@ -137,6 +137,8 @@ async def test_download_dag_output(monkeypatch, returncode, expected_result, jp_
     assert response.code == 200
     payload = json.loads(response.body)
     assert payload["status"] == 0
+    with open("mock-dag-id_258.ipynb", "rb") as f:
+        assert f.read() == b"mock file content"
 
 
 async def test_invalid_composer_name(monkeypatch, jp_fetch):
@@ -249,3 +251,36 @@ async def test_invalid_dag_run_id(monkeypatch, jp_fetch):
     assert "status" not in payload
     assert "error" in payload
     assert "Invalid DAG Run ID" in payload["error"]
+
+
+async def test_execute_waits_for_uploads_before_cleanup(monkeypatch):
+    client = executor.Client(await mocks.mock_credentials(), MagicMock(), None)
+    read_payloads = []
+
+    async def get_bucket(runtime_env, project_id, region_id):
+        return "mock-bucket"
+
+    async def check_file_exists(bucket_name, file_path, project_id):
+        return True
+
+    async def upload_to_gcs(gcs_dag_bucket, project_id, file_path=None, **kwargs):
+        if "input_notebooks" in kwargs["destination_dir"]:
+            raise IOError("input upload failed")
+        await asyncio.sleep(0.05)
+        with open(file_path) as f:
+            read_payloads.append(json.load(f))
+
+    monkeypatch.setattr(client, "get_bucket", get_bucket)
+    monkeypatch.setattr(client, "check_file_exists", check_file_exists)
+    monkeypatch.setattr(client, "upload_to_gcs", upload_to_gcs)
+    input_data = {
+        "dag_id": "test_dag_id",
+        "name": "test_job_name",
+        "composer_environment_name": "test_env",
+        "input_filename": "test_input_file.ipynb",
+    }
+
+    result = await client.execute(input_data, "mock-project", "mock-region")
+
+    assert result == {"error": "input upload failed"}
+    assert read_payloads[0]["job"]["dag_id"] == "test_dag_id"
@@ -0,0 +1,75 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from scheduler_jupyter_plugin.commons import gcloud_config
+
+
+@pytest.fixture
+def config_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("CLOUDSDK_CONFIG", str(tmp_path))
+    monkeypatch.delenv("CLOUDSDK_ACTIVE_CONFIG_NAME", raising=False)
+    monkeypatch.delenv("CLOUDSDK_CORE_PROJECT", raising=False)
+    monkeypatch.setattr(gcloud_config, "_installation_properties_path", "")
+    (tmp_path / "configurations").mkdir()
+    return tmp_path
+
+
+def write_config(config_dir, name, content):
+    path = config_dir / "configurations" / f"config_{name}"
+    path.write_text(content)
+    # Make sure the change is visible even on coarse mtime filesystems.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reads_active_configuration(config_dir):
+    (config_dir / "active_config").write_text("work")
+    write_config(config_dir, "default", "[core]\nproject = default-project\n")
+    write_config(
+        config_dir,
+        "work",
+        "[core]\nproject = work-project\n\n"
+        "[api_endpoint_overrides]\ncomposer = https://composer.example.com/\n",
+    )
+
+    assert gcloud_config.active_config_name() == "work"
+    assert gcloud_config.get_property("core", "project") == "work-project"
+    assert gcloud_config.get_section("api_endpoint_overrides") == {
+        "composer": "https://composer.example.com/"
+    }
+    assert gcloud_config.get_property("dataproc", "region") is None
+
+
+def test_rereads_changed_files(config_dir):
+    write_config(config_dir, "default", "[core]\nproject = first\n")
+    assert gcloud_config.get_property("core", "project") == "first"
+
+    write_config(config_dir, "default", "[core]\nproject = second\n")
+    assert gcloud_config.get_property("core", "project") == "second"
+
+
+def test_environment_overrides_files(config_dir, monkeypatch):
+    write_config(config_dir, "default", "[core]\nproject = from-file\n")
+    monkeypatch.setenv("CLOUDSDK_CORE_PROJECT", "from-env")
+
+    assert gcloud_config.get_property("core", "project") == "from-env"
+
+
+def test_missing_configuration(config_dir):
+    assert gcloud_config.active_config_name() == "default"
+    assert gcloud_config.get_property("core", "project") is None
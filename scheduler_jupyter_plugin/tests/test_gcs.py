@@ -0,0 +1,184 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+
+import pytest
+
+from scheduler_jupyter_plugin.services import gcs
+from scheduler_jupyter_plugin.tests import mocks
+
+
+@pytest.fixture
+def session(monkeypatch):
+    mocks.patch_mocks(monkeypatch)
+    return mocks.MockGCSClientSession()
+
+
+@pytest.fixture
+def client(session):
+    return gcs.Client(
+        {"access_token": "mock-token", "project_id": "mock-project", "region_id": ""},
+        logging.getLogger(),
+        session,
+    )
+
+
+async def test_resumable_upload_in_chunks(client, session, tmp_path):
+    file_path = tmp_path / "notebook.ipynb"
+    file_path.write_bytes(b"0123456789abcdef")
+    session.short_persist = 1
+
+    metadata = await client.upload("bucket", "dir/notebook.ipynb", file_path, 4)
+
+    assert session.objects[("bucket", "dir/notebook.ipynb")] == b"0123456789abcdef"
+    assert metadata["crc32c"] == mocks.crc32c(b"0123456789abcdef")
+    upload_request = session.requests[0]
+    assert upload_request[1].startswith(
+        "https://storage.googleapis.com/upload/storage/v1/b/bucket/o"
+    )
+    # One extra chunk has to be sent because the service kept 3 of 4 bytes.
+    assert len([r for r in session.requests if r[0] == "PUT"]) == 5
+
+
+async def test_upload_empty_file(client, session, tmp_path):
+    file_path = tmp_path / "empty.json"
+    file_path.write_bytes(b"")
+
+    await client.upload("bucket", "empty.json", file_path)
+
+    assert session.objects[("bucket", "empty.json")] == b""
+
+
+async def test_upload_file_changed_during_upload(
+    client, session, monkeypatch, tmp_path
+):
+    file_path = tmp_path / "notebook.ipynb"
+    file_path.write_bytes(b"0123456789abcdef")
+    # The file grew after its size was taken.
+    monkeypatch.setattr(gcs.os.path, "getsize", lambda path: 6)
+
+    with pytest.raises(Exception, match="changed while uploading"):
+        await client.upload("bucket", "dir/notebook.ipynb", file_path, 4)
+
+
+async def test_download_and_read(client, session, tmp_path):
+    session.objects[("bucket", "out/result.ipynb")] = b"x" * 100
+    destination = tmp_path / "result.ipynb"
+
+    await client.download("bucket", "out/result.ipynb", destination, chunk_size=7)
+
+    assert destination.read_bytes() == b"x" * 100
+    assert await client.read("bucket", "out/result.ipynb") == b"x" * 100
+
+
+async def test_download_checksum_mismatch(client, session, monkeypatch, tmp_path):
+    session.objects[("bucket", "file")] = b"contents"
+    monkeypatch.setattr(mocks, "crc32c", lambda data: "AAAAAA==")
+
+    with pytest.raises(gcs.ChecksumMismatchError):
+        await client.download("bucket", "file", tmp_path / "file")
+
+
+async def test_exists_and_delete(client, session):
+    session.objects[("bucket", "dags/dag_1.py")] = b"dag"
+
+    assert await client.exists("bucket", "dags/dag_1.py")
+    await client.delete("bucket", "dags/dag_1.py")
+    assert not await client.exists("bucket", "dags/dag_1.py")
+    with pytest.raises(Exception, match="Not Found"):
+        await client.delete("bucket", "dags/dag_1.py")
+
+
+async def test_many_operations_report_each_result(client, session, tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file{i}"
+        path.write_bytes(f"contents {i}".encode())
+        paths.append((path, f"file{i}"))
+
+    results = await client.upload_many("bucket", paths, max_concurrency=2)
+    assert [result["name"] for result in results] == ["file0", "file1", "file2"]
+
+    results = await client.delete_many("bucket", ["file0", "missing"])
+    assert results[0] is None
+    assert isinstance(results[1], Exception)
+    assert set(session.objects) == {("bucket", "file1"), ("bucket", "file2")}
+
+
+async def test_interrupted_download_resumes(client, session, tmp_path):
+    session.objects[("bucket", "out/result.ipynb")] = b"0123456789" * 10
+    session.interrupt_after = 42
+    destination = tmp_path / "result.ipynb"
+
+    await client.download(
+        "bucket", "out/result.ipynb", destination, chunk_size=7, download_id="d1"
+    )
+
+    assert destination.read_bytes() == b"0123456789" * 10
+    assert not (tmp_path / "result.ipynb.part").exists()
+    media_requests = [r for r in session.requests if r[2] and "alt" in r[2]]
+    assert len(media_requests) == 2
+    assert media_requests[1][2]["generation"] == "1"
+    progress = gcs.download_progress("d1")
+    assert progress["state"] == gcs.DOWNLOAD_DONE
+    assert progress["bytes_downloaded"] == progress["total_bytes"] == 100
+
+
+async def test_resumed_download_requires_partial_content(
+    client, session, tmp_path, monkeypatch
+):
+    session.objects[("bucket", "out/result.ipynb")] = b"0123456789" * 10
+    session.interrupt_after = 42
+    get = session.get
+
+    def get_ignoring_range(api_endpoint, headers=None, params=None):
+        headers = {k: v for k, v in (headers or {}).items() if k != "Range"}
+        return get(api_endpoint, headers=headers, params=params)
+
+    monkeypatch.setattr(session, "get", get_ignoring_range)
+    destination = tmp_path / "result.ipynb"
+
+    with pytest.raises(Exception, match="Range request was ignored"):
+        await client.download("bucket", "out/result.ipynb", destination, chunk_size=7)
+    assert not (tmp_path / "result.ipynb.part").exists()
+
+
+async def test_concurrent_downloads_have_their_own_progress(client, session, tmp_path):
+    session.objects[("bucket", "out/result.ipynb")] = b"0123456789" * 10
+
+    download_ids = await asyncio.gather(
+        *[
+            client.download("bucket", "out/result.ipynb", tmp_path / f"result{i}")
+            for i in range(2)
+        ]
+    )
+
+    assert len(set(download_ids)) == 2
+    for download_id in download_ids:
+        assert gcs.download_progress(download_id)["state"] == gcs.DOWNLOAD_DONE
+
+
+async def test_failed_download_reports_progress(client, session, tmp_path):
+    session.objects[("bucket", "file")] = b"contents"
+    destination = tmp_path / "file"
+
+    with pytest.raises(Exception, match="Not Found"):
+        await client.download("bucket", "missing", destination, download_id="d2")
+
+    assert not destination.exists()
+    assert not (tmp_path / "file.part").exists()
+    assert gcs.download_progress("d2")["state"] == gcs.DOWNLOAD_FAILED
+    assert "d2" in [p["download_id"] for p in gcs.download_progress()]
@@ -0,0 +1,73 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+import tornado
+
+from scheduler_jupyter_plugin.commons import http_cache
+from scheduler_jupyter_plugin.services import compute, iam
+from scheduler_jupyter_plugin.tests import mocks
+
+
+def test_error_payloads_are_detected():
+    assert http_cache.is_error({"error": "failed"})
+    assert http_cache.is_error({"Error fetching regions": "failed"})
+    assert not http_cache.is_error({"schedules": []})
+    assert not http_cache.is_error(["error"])
+
+
+async def test_unchanged_response_is_not_modified(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+    regions = ["us-central1", "europe-west1"]
+
+    async def mock_list_region(self):
+        return regions
+
+    monkeypatch.setattr(compute.Client, "list_region", mock_list_region)
+
+    response = await jp_fetch("scheduler-plugin", "api/compute/region")
+    assert json.loads(response.body) == regions
+    assert response.headers["Cache-Control"] == "private, max-age=86400"
+    etag = response.headers["Etag"]
+
+    with pytest.raises(tornado.httpclient.HTTPClientError) as e:
+        await jp_fetch(
+            "scheduler-plugin",
+            "api/compute/region",
+            headers={"If-None-Match": etag},
+        )
+    assert e.value.code == 304
+    assert not e.value.response.body
+
+    regions.append("asia-east1")
+    response = await jp_fetch(
+        "scheduler-plugin", "api/compute/region", headers={"If-None-Match": etag}
+    )
+    assert json.loads(response.body) == regions
+    assert response.headers["Etag"] != etag
+
+
+async def test_errors_are_not_cached(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+
+    async def mock_list_service_account(self):
+        return {"error": "permission denied"}
+
+    monkeypatch.setattr(iam.Client, "list_service_account", mock_list_service_account)
+
+    response = await jp_fetch("scheduler-plugin", "api/iam/listServiceAccount")
+    assert json.loads(response.body) == {"error": "permission denied"}
+    assert response.headers["Cache-Control"] == "no-store"
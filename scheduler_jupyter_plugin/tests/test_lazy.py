@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+from unittest import mock
+
+from jupyter_server.serverapp import ServerWebApplication
+from tornado import httputil, web
+
+from scheduler_jupyter_plugin import handlers
+from scheduler_jupyter_plugin.commons import lazy
+
+DEFERRED_MODULES = (
+    "google.cloud.compute_v1",
+    "google.cloud.kms_v1",
+    "google.cloud.iam_admin_v1",
+    "google.cloud.logging",
+    "cron_descriptor",
+    "pendulum",
+    "scheduler_jupyter_plugin.controllers.",
+)
+
+
+def test_extension_import_defers_controllers():
+    # A fresh interpreter, as other tests import the controllers.
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, scheduler_jupyter_plugin; print('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    imported = [
+        name for name in output.splitlines() if name.startswith(DEFERRED_MODULES)
+    ]
+    assert imported == []
+
+
+def test_handler_imports_module_on_first_request(tmp_path, monkeypatch):
+    (tmp_path / "lazy_test_controllers.py").write_text(
+        "from tornado import web\n\n"
+        "class Controller(web.RequestHandler):\n"
+        "    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_test_controllers", raising=False)
+
+    handler = lazy.handler(
+        "lazy_test_controllers",
+        "Controller",
+        wrap=lambda handler_class: type("Controller", (handler_class,), {}),
+    )
+    assert handler.__name__ == "Controller"
+    assert "lazy_test_controllers" not in sys.modules
+
+    request = httputil.HTTPServerRequest(uri="/", connection=mock.Mock())
+    instance = handler(web.Application(), request)
+    controller_class = sys.modules["lazy_test_controllers"].Controller
+    assert isinstance(instance, controller_class)
+    assert type(instance) is handler.resolve()
+    assert "lazy_test_controllers" in lazy.import_report()
+    monkeypatch.delitem(sys.modules, "lazy_test_controllers")
+
+
+def test_resolved_handlers_are_authenticated():
+    # jupyter_server only checks the stand-ins, whose methods are unset.
+    web_app = mock.Mock(settings={"base_url": "/"})
+    handlers.setup_handlers(web_app)
+    (_, routes), _ = web_app.add_handlers.call_args
+    missing_authentication = []
+    for path, handler in routes:
+        handler = handler.resolve() if hasattr(handler, "resolve") else handler
+        missing_authentication.extend(
+            ServerWebApplication._check_handler_auth(None, path, handler)
+        )
+    assert missing_authentication == []
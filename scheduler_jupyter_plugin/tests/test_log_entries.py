@@ -13,12 +13,14 @@
 # limitations under the License.
 
 import json
+import threading
 from unittest.mock import MagicMock, Mock
 
 import pytest
 from google.cloud import logging
 
 from scheduler_jupyter_plugin import credentials
+from scheduler_jupyter_plugin.services import logEntries
 
 
 async def mock_credentials():
@@ -71,3 +73,22 @@ async def test_list_log_entries(monkeypatch, returncode, expected_result, jp_fet
     assert response.code == 200
     payload = json.loads(response.body)
     assert payload == expected_result
+
+
+async def test_log_entries_listed_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def mock_logging_client(credentials=None, project=None):
+        threads.append(threading.current_thread())
+        mock_logging_client = MagicMock()
+        mock_logging_client.list_entries.side_effect = lambda **kwargs: (
+            threads.append(threading.current_thread()) or iter([])
+        )
+        return mock_logging_client
+
+    monkeypatch.setattr(logging, "Client", mock_logging_client)
+    client = logEntries.Client(await mock_credentials(), MagicMock())
+
+    assert [page async for page in client.iter_log_entries("mock-query")] == []
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
@@ -0,0 +1,90 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+
+import pytest
+
+from scheduler_jupyter_plugin.commons import metrics, resilience
+from scheduler_jupyter_plugin.services import compute
+from scheduler_jupyter_plugin.tests import mocks
+
+
+def sample(name, **labels):
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_service_for_host():
+    assert metrics.service_for_host("composer.googleapis.com") == "composer"
+    assert (
+        metrics.service_for_host("abc-dot-us-central1.composer.googleusercontent.com")
+        == "airflow"
+    )
+    assert metrics.service_for_host("us-central1-aiplatform.googleapis.com") == "vertex"
+    assert metrics.service_for_host("example.com") == "other"
+
+
+def test_gcloud_failures_are_counted():
+    before = sample(
+        "scheduler_plugin_gcloud_subprocess_failures_total", command="test cmd"
+    )
+    with pytest.raises(subprocess.CalledProcessError):
+        with metrics.gcloud_timer("test cmd"):
+            raise subprocess.CalledProcessError(1, "gcloud")
+    assert (
+        sample("scheduler_plugin_gcloud_subprocess_failures_total", command="test cmd")
+        == before + 1
+    )
+    assert sample(
+        "scheduler_plugin_gcloud_subprocess_duration_seconds_count",
+        command="test cmd",
+    ) == (before + 1)
+
+
+async def test_upstream_calls_are_measured():
+    labels = {"service": "gcs", "method": "GET"}
+    before = sample("scheduler_plugin_upstream_duration_seconds_count", **labels)
+    client = resilience.ResilientSession(mocks.MockClientSession())
+    async with client.get("https://storage.googleapis.com/storage/v1/b"):
+        pass
+    assert (
+        sample("scheduler_plugin_upstream_duration_seconds_count", **labels)
+        == before + 1
+    )
+    assert sample("scheduler_plugin_upstream_requests_total", code="200", **labels)
+
+
+async def test_metrics_endpoint(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+
+    async def mock_list_region(self):
+        return {"Error fetching regions": "denied"}
+
+    monkeypatch.setattr(compute.Client, "list_region", mock_list_region)
+    handler = {"handler": "api/compute/region", "method": "GET"}
+    errors_before = sample("scheduler_plugin_handler_errors_total", **handler)
+
+    await jp_fetch("scheduler-plugin", "api/compute/region")
+
+    response = await jp_fetch("scheduler-plugin", "metrics")
+    assert response.headers["Content-Type"].startswith("text/plain")
+    body = response.body.decode()
+    assert "scheduler_plugin_handler_duration_seconds_bucket" in body
+    assert "scheduler_plugin_thread_pool_queued" in body
+    assert (
+        sample("scheduler_plugin_handler_errors_total", **handler) == errors_before + 1
+    )
+    assert sample(
+        "scheduler_plugin_response_size_bytes_sum", handler=handler["handler"]
+    )
@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import pytest
+
+from scheduler_jupyter_plugin.commons import ratelimit, resilience
+from scheduler_jupyter_plugin.tests import mocks
+
+
+def test_limits_for_matches_configured_patterns_first():
+    host_limits = ratelimit.merge_host_limits(
+        {"*.example.com": {"concurrency": 1}, "*": {"concurrency": 20}}
+    )
+    assert ratelimit.limits_for("api.example.com", host_limits)["concurrency"] == 1
+    assert (
+        ratelimit.limits_for("x-dot-us.composer.googleusercontent.com", host_limits)
+        == ratelimit.DEFAULT_HOST_LIMITS["*.composer.googleusercontent.com"]
+    )
+    assert ratelimit.limits_for("storage.googleapis.com", host_limits) == {
+        "concurrency": 20
+    }
+
+
+async def test_concurrency_is_bounded():
+    limiter = ratelimit.HostLimiter("host", concurrency=2)
+    max_active = 0
+
+    async def request():
+        nonlocal max_active
+        await limiter.acquire()
+        max_active = max(max_active, limiter.active)
+        await asyncio.sleep(0.01)
+        limiter.release()
+
+    await asyncio.gather(*[request() for _ in range(5)])
+
+    stats = limiter.stats()
+    assert max_active == 2
+    assert stats["active"] == 0 and stats["waiting"] == 0
+    assert stats["requests"] == 5
+    assert stats["delayed"] == 3
+    assert stats["wait_seconds_max"] >= 0.01
+
+
+async def test_rate_is_limited():
+    bucket = ratelimit.TokenBucket(rate=100, burst=2)
+    started_at = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    # Two requests go through at once, the other four at 100 per second.
+    assert time.monotonic() - started_at >= 0.035
+
+
+class MockFailingClientSession(mocks.MockClientSession):
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def get(self, api_endpoint, headers=None):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+async def test_session_releases_slots(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0)
+    client = resilience.ResilientSession(
+        MockFailingClientSession(
+            [
+                mocks.MockResponse(None, status=503),
+                mocks.MockResponse({"ok": True}),
+                ValueError("unexpected"),
+            ]
+        )
+    )
+    url = "https://upstream.example.com/api"
+
+    async with client.get(url) as response:
+        assert response.status == 200
+        assert client.limiter_for(url).active == 1
+    with pytest.raises(ValueError):
+        async with client.get(url):
+            pass
+
+    stats = client.limiter_for(url).stats()
+    assert stats["active"] == 0
+    assert stats["requests"] == 3
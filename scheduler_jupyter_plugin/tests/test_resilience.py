@@ -0,0 +1,160 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from scheduler_jupyter_plugin.commons import resilience
+from scheduler_jupyter_plugin.tests import mocks
+
+URL = "https://upstream.example.com/api"
+
+
+class MockSequenceClientSession(mocks.MockClientSession):
+    """Answers requests with the given responses, in order."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def _next(self, method, api_endpoint):
+        self.calls.append(method)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def get(self, api_endpoint, headers=None):
+        return self._next("GET", api_endpoint)
+
+    def post(self, api_endpoint, headers=None, json=None):
+        return self._next("POST", api_endpoint)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0)
+
+
+async def test_idempotent_requests_are_retried():
+    session = MockSequenceClientSession(
+        [
+            mocks.MockResponse(None, status=503),
+            aiohttp.ClientConnectionError("reset"),
+            mocks.MockResponse({"ok": True}),
+        ]
+    )
+    client = resilience.ResilientSession(session)
+
+    async with client.get(URL) as response:
+        assert response.status == 200
+        assert await response.json() == {"ok": True}
+    assert session.calls == ["GET"] * 3
+    assert client.breaker_for(URL).stats()["retries"] == 2
+
+
+async def test_posts_are_only_retried_when_not_processed():
+    session = MockSequenceClientSession(
+        [
+            mocks.MockResponse(None, status=429, headers={"Retry-After": "0"}),
+            mocks.MockResponse(None, status=500),
+            mocks.MockResponse({"ok": True}),
+        ]
+    )
+    client = resilience.ResilientSession(session)
+
+    async with client.post(URL, json={}) as response:
+        assert response.status == 500
+    assert session.calls == ["POST", "POST"]
+
+
+async def test_long_retry_after_is_not_waited_for():
+    session = MockSequenceClientSession(
+        [mocks.MockResponse(None, status=429, headers={"Retry-After": "3600"})]
+    )
+    client = resilience.ResilientSession(session)
+
+    async with client.get(URL) as response:
+        assert response.status == 429
+    assert session.calls == ["GET"]
+
+
+def test_retry_after_date():
+    response = mocks.MockResponse(
+        None, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    )
+    assert resilience.retry_after_delay(response) == 0.0
+    assert resilience.retry_after_delay(mocks.MockResponse(None)) is None
+
+
+async def test_circuit_opens_and_recovers(monkeypatch):
+    monkeypatch.setattr(resilience, "MAX_ATTEMPTS", 1)
+    session = MockSequenceClientSession(
+        [mocks.MockResponse(None, status=502)] * resilience.FAILURE_THRESHOLD
+        + [mocks.MockResponse({"ok": True})]
+    )
+    client = resilience.ResilientSession(session)
+    for _ in range(resilience.FAILURE_THRESHOLD):
+        async with client.get(URL) as response:
+            assert response.status == 502
+    breaker = client.breaker_for(URL)
+    assert breaker.state == resilience.OPEN
+
+    with pytest.raises(resilience.CircuitOpenError):
+        async with client.get(URL):
+            pass
+    assert len(session.calls) == resilience.FAILURE_THRESHOLD
+    assert breaker.stats()["rejected"] == 1
+
+    breaker.opened_at -= breaker.reset_timeout
+    async with client.get(URL) as response:
+        assert response.status == 200
+    assert breaker.state == resilience.CLOSED
+
+
+class MockHangingResponse(mocks.MockResponse):
+    async def __aenter__(self):
+        await asyncio.Event().wait()
+
+
+async def test_abandoned_trial_request_does_not_keep_circuit_open():
+    session = MockSequenceClientSession(
+        [MockHangingResponse(None), ValueError("bad URL"), mocks.MockResponse({})]
+    )
+    client = resilience.ResilientSession(session)
+    breaker = client.breaker_for(URL)
+    breaker.state = resilience.OPEN
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout
+
+    async def get():
+        async with client.get(URL) as response:
+            return response.status
+
+    # Cancelled while the trial request is in flight.
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(get(), 0.05)
+    assert breaker.state == resilience.HALF_OPEN
+    with pytest.raises(ValueError):
+        await get()
+    assert await get() == 200
+    assert breaker.state == resilience.CLOSED
+    assert breaker.stats()["rejected"] == 0
+
+
+async def test_upstream_status_endpoint(jp_fetch):
+    response = await jp_fetch("scheduler-plugin", "upstreamStatus")
+    assert response.code == 200
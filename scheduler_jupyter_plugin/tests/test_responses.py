@@ -0,0 +1,126 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+from tornado.iostream import StreamClosedError
+
+from scheduler_jupyter_plugin.commons import responses
+from scheduler_jupyter_plugin.tests import mocks
+
+
+class MockPagedJobsClientSession(mocks.MockClientSession):
+    pages = [
+        {"notebookExecutionJobs": [{"name": "job-1"}, {"name": "job-2"}]},
+        {"notebookExecutionJobs": [{"name": "job-3"}]},
+    ]
+    fail_on_page = None
+
+    def get(self, api_endpoint, params=None, headers=None):
+        page = int((params or {}).get("pageToken", 0))
+        if page == self.fail_on_page:
+            return mocks.MockResponse(None, status=500, reason="Internal Error")
+        resp = dict(self.pages[page])
+        if page + 1 < len(self.pages):
+            resp["nextPageToken"] = str(page + 1)
+        return mocks.MockResponse(resp)
+
+
+def fetch_jobs(jp_fetch, **kwargs):
+    return jp_fetch(
+        "scheduler-plugin",
+        "api/vertex/listNotebookExecutionJobs",
+        params={
+            "region_id": "mock-region",
+            "schedule_id": "mock-schedule",
+            "order_by": "createTime desc",
+            **kwargs.pop("params", {}),
+        },
+        **kwargs,
+    )
+
+
+def test_dumps_without_orjson(monkeypatch):
+    value = {"b": [1, 2.5, None], "a": {1: "x"}}
+    expected = json.dumps(value, sort_keys=True).encode()
+    assert json.loads(responses.dumps(value, sort_keys=True)) == json.loads(expected)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(value, sort_keys=True) == expected
+
+
+def test_compressor_output_is_valid_gzip():
+    compressor = responses.Compressor("gzip")
+    data = compressor.compress(b"[1,") + compressor.compress(b"2]")
+    data += compressor.finish()
+    assert gzip.decompress(data) == b"[1,2]"
+
+
+async def test_pages_are_streamed_as_one_array(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(aiohttp, "ClientSession", MockPagedJobsClientSession)
+
+    response = await fetch_jobs(jp_fetch, headers={"Accept-Encoding": "gzip"})
+
+    assert json.loads(response.body) == [
+        {"name": "job-1"},
+        {"name": "job-2"},
+        {"name": "job-3"},
+    ]
+    assert response.headers["X-Consumed-Content-Encoding"] == "gzip"
+
+
+async def test_pages_are_streamed_as_ndjson(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(aiohttp, "ClientSession", MockPagedJobsClientSession)
+
+    response = await fetch_jobs(jp_fetch, params={"format": "ndjson"})
+
+    assert response.headers["Content-Type"] == responses.NDJSON_CONTENT_TYPE
+    lines = response.body.decode().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["job-1", "job-2", "job-3"]
+
+
+async def test_stream_errors(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+    monkeypatch.setattr(aiohttp, "ClientSession", MockPagedJobsClientSession)
+
+    monkeypatch.setattr(MockPagedJobsClientSession, "fail_on_page", 0)
+    response = await fetch_jobs(jp_fetch)
+    assert "Internal Error" in json.loads(response.body)["error"]
+
+    monkeypatch.setattr(MockPagedJobsClientSession, "fail_on_page", 1)
+    response = await fetch_jobs(jp_fetch, params={"format": "ndjson"})
+    lines = [json.loads(line) for line in response.body.decode().splitlines()]
+    assert [line.get("name") for line in lines[:2]] == ["job-1", "job-2"]
+    assert "Internal Error" in lines[-1]["error"]
+
+
+async def test_stream_closes_pages_when_client_goes_away():
+    handler = MagicMock()
+    handler.request.headers = {}
+    handler.flush = AsyncMock(side_effect=StreamClosedError())
+    closed = []
+
+    async def pages():
+        try:
+            yield [{"name": "job-1"}]
+            yield [{"name": "job-2"}]
+        finally:
+            closed.append(True)
+
+    assert await responses.stream_pages(handler, pages()) == 1
+    assert closed == [True]
@@ -0,0 +1,36 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from scheduler_jupyter_plugin import sessions
+
+
+async def test_session_is_shared_until_closed():
+    registry = sessions.SessionRegistry(limit_per_host=2, dns_cache_ttl=30)
+    session = registry.get()
+    assert registry.get() is session
+    assert session.connector.limit_per_host == 2
+
+    await registry.close()
+    assert session.closed
+
+    reopened = registry.get()
+    assert reopened is not session
+    await registry.close()
+
+
+async def test_extension_load_sets_up_registry(jp_serverapp):
+    session = sessions.get_session()
+    assert sessions.get_session() is session
+    await jp_serverapp.cleanup_extensions()
+    assert session.closed
@@ -0,0 +1,56 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import sys
+
+from scheduler_jupyter_plugin.commons import startup
+
+
+def test_import_timer_records_nested_imports(tmp_path, monkeypatch):
+    package = tmp_path / "startup_test_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("from . import outer\n")
+    (package / "outer.py").write_text("import time\nfrom . import inner\n")
+    (package / "inner.py").write_text("import time\ntime.sleep(0.05)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    timer = startup.ImportTimer("startup_test_pkg")
+    timer.install()
+    try:
+        import startup_test_pkg  # noqa: F401
+    finally:
+        timer.uninstall()
+        for name in ("", ".outer", ".inner"):
+            sys.modules.pop(f"startup_test_pkg{name}", None)
+
+    records = {record["module"]: record for record in timer.records}
+    assert [record["module"] for record in timer.records] == [
+        "startup_test_pkg.inner",
+        "startup_test_pkg.outer",
+        "startup_test_pkg",
+    ]
+    inner, outer = records["startup_test_pkg.inner"], records["startup_test_pkg.outer"]
+    assert (inner["depth"], outer["depth"]) == (2, 1)
+    assert inner["self_ms"] >= 50
+    assert outer["cumulative_ms"] >= inner["cumulative_ms"]
+    assert outer["self_ms"] < inner["self_ms"]
+
+
+async def test_startup_endpoint(jp_fetch):
+    response = await jp_fetch("scheduler-plugin", "debug/startup")
+
+    profile = json.loads(response.body)
+    assert profile["deep_mode"] is False
+    assert "handler registration" in profile["phases_ms"]
+    assert profile["total_ms"] >= profile["phases_ms"]["handler registration"]
@@ -13,13 +13,14 @@
 # limitations under the License.
 
 import json
-from unittest.mock import MagicMock, Mock
+from unittest.mock import Mock
 
+import aiohttp
 import pytest
-from google.cloud import storage
 
 from scheduler_jupyter_plugin import credentials
 from scheduler_jupyter_plugin.services import vertex
+from scheduler_jupyter_plugin.tests import mocks
 
 
 async def mock_credentials():
@@ -59,18 +60,14 @@ async def test_download_output(monkeypatch, returncode, expected_result, jp_fetc
     monkeypatch.setattr(
         vertex.Client, "list_notebook_execution_jobs", mock_list_notebook_execution_jobs
     )
-    mock_blob = MagicMock()
-    mock_blob.download_as_bytes.return_value = b"mock file content"
 
-    mock_bucket = MagicMock()
-    mock_bucket.blob.return_value = mock_blob
+    class MockOutputClientSession(mocks.MockGCSClientSession):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.objects[("mock_bucket", "258/mock-file")] = b"mock file content"
 
-    mock_storage_client = MagicMock()
-    mock_storage_client.bucket.return_value = mock_bucket
     monkeypatch.setattr(credentials, "get_cached", mock_credentials)
-    monkeypatch.setattr(
-        storage, "Client", lambda credentials=None, project=None: mock_storage_client
-    )
+    monkeypatch.setattr(aiohttp, "ClientSession", MockOutputClientSession)
 
     mock_bucket_name = "mock_bucket"
     mock_job_run_id = "258"
@@ -83,6 +80,7 @@ async def test_download_output(monkeypatch, returncode, expected_result, jp_fetc
             "bucket_name": mock_bucket_name,
             "job_run_id": mock_job_run_id,
             "file_name": mock_file_name,
+            "download_id": "mock-download",
         },
         method="POST",
         allow_nonstandard_methods=True,
@@ -90,25 +88,27 @@ async def test_download_output(monkeypatch, returncode, expected_result, jp_fetc
     assert response.code == 200
     payload = json.loads(response.body)
     assert payload["status"] == expected_result["status"]
+    assert payload["download_id"] == "mock-download"
     assert (
         payload["downloaded_filename"].find(expected_result["downloaded_filename"])
         != -1
     )
 
+    response = await jp_fetch(
+        "scheduler-plugin",
+        "api/storage/downloadProgress",
+        params={"download_id": "mock-download"},
+    )
+    assert response.code == 200
+    progress = json.loads(response.body)
+    assert progress["state"] == "done"
+    assert progress["bytes_downloaded"] == len(b"mock file content")
+
 
 @pytest.mark.parametrize("returncode, expected_result", [(0, [])])
 async def test_list_bucket(monkeypatch, returncode, expected_result, jp_fetch):
-    mock_blob = MagicMock()
-    mock_buckets = MagicMock()
-    mock_buckets.blob.return_value = mock_blob
-
-    mock_storage_client = MagicMock()
-    mock_storage_client.list_buckets.return_value = mock_buckets
-
     monkeypatch.setattr(credentials, "get_cached", mock_credentials)
-    monkeypatch.setattr(
-        storage, "Client", lambda credentials=None, project=None: mock_storage_client
-    )
+    monkeypatch.setattr(aiohttp, "ClientSession", mocks.MockGCSClientSession)
 
     response = await jp_fetch(
         "scheduler-plugin",
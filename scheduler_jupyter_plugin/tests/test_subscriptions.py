@@ -0,0 +1,135 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+
+import pytest
+
+from scheduler_jupyter_plugin import subscriptions
+
+
+class Source:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        result = self.results[0] if len(self.results) == 1 else self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(subscriptions, "MIN_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(subscriptions, "ACTIVE_POLL_INTERVAL", 0.02)
+    monkeypatch.setattr(subscriptions, "MAX_POLL_INTERVAL", 0.04)
+    yield
+    for poller in subscriptions._pollers.values():
+        poller.stop()
+    subscriptions._pollers.clear()
+
+
+def subscribe(queue, fetch, key="key"):
+    subscriptions.subscribe(
+        key,
+        "runs",
+        fetch,
+        lambda run: run["id"],
+        lambda run: run["state"] == "running",
+        queue,
+    )
+
+
+async def test_subscribers_share_one_poller_and_get_deltas():
+    fetch = Source(
+        [{"id": 1, "state": "running"}, {"id": 2, "state": "success"}],
+        [{"id": 1, "state": "success"}, {"id": 2, "state": "success"}],
+        [{"id": 1, "state": "success"}],
+    )
+    first, second = asyncio.Queue(), asyncio.Queue()
+    subscribe(first, fetch)
+    subscribe(second, fetch)
+
+    events = [await asyncio.wait_for(first.get(), 1) for _ in range(3)]
+    assert events[0]["changed"] == [
+        {"id": 1, "state": "running"},
+        {"id": 2, "state": "success"},
+    ]
+    assert events[1] == {
+        "subscription": "runs",
+        "changed": [{"id": 1, "state": "success"}],
+        "removed": [],
+    }
+    assert events[2]["changed"] == []
+    assert events[2]["removed"] == [2]
+    assert [await second.get() for _ in range(3)] == events
+    assert subscriptions.stats()["runs"]["subscribers"] == 2
+
+
+async def test_late_subscriber_gets_current_state():
+    fetch = Source([{"id": 1, "state": "success"}])
+    first, second = asyncio.Queue(), asyncio.Queue()
+    subscribe(first, fetch)
+    await asyncio.wait_for(first.get(), 1)
+
+    subscribe(second, fetch)
+    event = second.get_nowait()
+    assert event["changed"] == [{"id": 1, "state": "success"}]
+
+
+async def test_interval_backs_off_while_nothing_changes():
+    fetch = Source([{"id": 1, "state": "success"}])
+    queue = asyncio.Queue()
+    subscribe(queue, fetch)
+    await asyncio.sleep(0.2)
+
+    assert queue.qsize() == 1
+    assert subscriptions.stats()["runs"]["interval"] == 0.04
+
+
+async def test_errors_are_pushed():
+    fetch = Source(Exception("upstream down"))
+    queue = asyncio.Queue()
+    subscribe(queue, fetch)
+
+    event = await asyncio.wait_for(queue.get(), 1)
+    assert event == {"subscription": "runs", "error": "upstream down"}
+
+
+async def test_poller_stops_without_subscribers():
+    fetch = Source([])
+    queue = asyncio.Queue()
+    subscribe(queue, fetch)
+    await asyncio.wait_for(queue.get(), 1)
+
+    subscriptions.unsubscribe("key", queue)
+    calls = fetch.calls
+    await asyncio.sleep(0.05)
+    assert fetch.calls == calls
+    assert subscriptions.stats() == {}
+
+
+async def test_stream_requires_a_subscription(jp_fetch):
+    response = await jp_fetch(
+        "scheduler-plugin",
+        "runStatusStream",
+        params={"project_id": "mock-project", "region_id": "mock-region"},
+    )
+    assert response.code == 200
+    payload = json.loads(response.body)
+    assert payload == {"error": "No dag_id or schedule_id to subscribe to"}
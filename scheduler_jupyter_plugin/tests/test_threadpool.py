@@ -0,0 +1,70 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from scheduler_jupyter_plugin.commons import threadpool
+
+
+@pytest.fixture
+def pools():
+    threadpool.configure({"test": 1})
+    yield
+    threadpool.configure()
+
+
+async def test_runs_off_the_event_loop(pools):
+    loop_thread = threading.current_thread()
+    thread = await threadpool.run_blocking("test", threading.current_thread)
+    assert thread is not loop_thread
+    assert thread.name.startswith("scheduler-test")
+
+
+async def test_exceptions_are_propagated(pools):
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await threadpool.run_blocking("test", fail)
+    assert threadpool.stats()["test"]["completed"] == 1
+
+
+async def test_queue_depth_and_wait_time(pools):
+    release = threading.Event()
+    first = asyncio.ensure_future(threadpool.run_blocking("test", release.wait))
+    second = asyncio.ensure_future(threadpool.run_blocking("test", lambda: "done"))
+    await asyncio.sleep(0.05)
+
+    stats = threadpool.stats()["test"]
+    assert stats["max_workers"] == 1
+    assert stats["active"] == 1
+    assert stats["queued"] == 1
+    # The second call was queued before this point, so it waits at least
+    # until the first one is released.
+    queued_at = time.perf_counter()
+    await asyncio.sleep(0.05)
+    released_at = time.perf_counter()
+
+    release.set()
+    assert await second == "done"
+    await first
+    stats = threadpool.stats()["test"]
+    assert stats["queued"] == 0
+    assert stats["active"] == 0
+    assert stats["completed"] == 2
+    assert stats["wait_seconds_max"] >= released_at - queued_at
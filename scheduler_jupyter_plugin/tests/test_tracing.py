@@ -0,0 +1,134 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from scheduler_jupyter_plugin.commons import tracing
+from scheduler_jupyter_plugin.services import compute
+from scheduler_jupyter_plugin.tests import mocks
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    tracing.configure()
+    yield
+    tracing.configure()
+
+
+async def test_spans_nest_across_tasks():
+    @tracing.traced("child")
+    async def child(fail):
+        await asyncio.sleep(0)
+        if fail:
+            raise ValueError("failed")
+
+    with tracing.span("root", attribute="value"):
+        await asyncio.gather(child(False), child(True), return_exceptions=True)
+
+    [trace] = tracing.recent_traces()
+    assert trace["name"] == "root"
+    assert trace["error"]
+    root, *children = trace["spans"]
+    assert root["attributes"] == {"attribute": "value"}
+    assert [span["parent_id"] for span in children] == [root["span_id"]] * 2
+    assert sorted(str(span["error"]) for span in children) == ["None", "failed"]
+    assert tracing.current_span() is None
+
+
+def test_traces_with_too_many_spans_are_kept():
+    with tracing.span("root"):
+        for _ in range(tracing.MAX_SPANS_PER_TRACE + 100):
+            with tracing.span("child"):
+                pass
+
+    [trace] = tracing.recent_traces()
+    assert trace["name"] == "root"
+    assert len(trace["spans"]) == tracing.MAX_SPANS_PER_TRACE + 1
+    assert trace["dropped_spans"] == 100
+
+
+async def test_background_tasks_start_their_own_traces():
+    @tracing.traced("poll")
+    async def poll():
+        return tracing.current_span().trace
+
+    with tracing.span("request") as request_span:
+        task = tracing.start_background_task(poll())
+        assert tracing.current_span() is request_span
+    poll_trace = await task
+
+    assert poll_trace is not request_span.trace
+    assert [trace["name"] for trace in tracing.recent_traces()] == ["poll", "request"]
+
+
+def test_otlp_payload():
+    with tracing.span("root", tracing.SPAN_KIND_SERVER, count=2):
+        with tracing.span("child"):
+            pass
+    [trace] = tracing._traces
+    payload = tracing.otlp_payload(trace.spans, "service")
+
+    [resource_spans] = payload["resourceSpans"]
+    child, root = resource_spans["scopeSpans"][0]["spans"]
+    assert root["kind"] == tracing.SPAN_KIND_SERVER
+    assert root["attributes"] == [{"key": "count", "value": {"intValue": "2"}}]
+    assert child["parentSpanId"] == root["spanId"]
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+
+class MockCollectorClientSession(mocks.MockClientSession):
+    exports = []
+
+    def post(self, api_endpoint, json=None):
+        self.exports.append((api_endpoint, json))
+        return mocks.MockResponse({})
+
+
+async def test_exporter_sends_finished_traces(monkeypatch):
+    monkeypatch.setattr(aiohttp, "ClientSession", MockCollectorClientSession)
+    tracing.configure(otlp_endpoint="http://localhost:4318/v1/traces")
+
+    with tracing.span("root"):
+        pass
+    await tracing.close()
+
+    [(endpoint, payload)] = MockCollectorClientSession.exports
+    assert endpoint == "http://localhost:4318/v1/traces"
+    [span] = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert span["name"] == "root"
+
+
+async def test_traces_endpoint(monkeypatch, jp_fetch):
+    mocks.patch_mocks(monkeypatch)
+
+    async def mock_list_region(self):
+        with tracing.span("list_region"):
+            return ["us-central1"]
+
+    monkeypatch.setattr(compute.Client, "list_region", mock_list_region)
+    await jp_fetch("scheduler-plugin", "api/compute/region")
+
+    response = await jp_fetch("scheduler-plugin", "debug/traces")
+    traces = json.loads(response.body)["traces"]
+    [trace] = [t for t in traces if t["name"] == "GET api/compute/region"]
+    assert [span["name"] for span in trace["spans"]] == [
+        "GET api/compute/region",
+        "list_region",
+    ]
+    assert trace["spans"][0]["attributes"]["http.status_code"] == 200
@@ -0,0 +1,48 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from scheduler_jupyter_plugin import urls
+from scheduler_jupyter_plugin.commons import gcloud_config
+
+
+async def test_endpoint_table_rebuilt_only_on_override_change(monkeypatch):
+    overrides = {}
+    monkeypatch.setattr(gcloud_config, "get_section", lambda section: dict(overrides))
+
+    assert await urls.gcp_service_url("composer") == "https://composer.googleapis.com/"
+    builds = urls.lookup_stats()["table_builds"]
+    await urls.gcp_service_url("composer")
+    await urls.map()
+    assert urls.lookup_stats()["table_builds"] == builds
+
+    overrides["composer"] = "https://composer.example.com/"
+    assert await urls.gcp_service_url("composer") == "https://composer.example.com/"
+    assert urls.lookup_stats()["table_builds"] == builds + 1
+
+
+async def test_get_service_urls(monkeypatch, jp_fetch):
+    monkeypatch.setattr(
+        gcloud_config,
+        "get_section",
+        lambda section: {"dataproc": "https://dataproc.example.com/"},
+    )
+    response = await jp_fetch("scheduler-plugin", "getGcpServiceUrls")
+    assert response.code == 200
+    payload = json.loads(response.body)
+    assert payload["dataproc_url"] == "https://dataproc.example.com/"
+    assert payload["compute_url"] == "https://compute.googleapis.com/compute/v1"
+    assert payload["storage_url"] == "https://storage.googleapis.com/storage/v1/"
+    assert "composer_url" not in payload
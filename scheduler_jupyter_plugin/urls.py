@@ -11,11 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from google.cloud import jupyter_config
+import time
 
+from scheduler_jupyter_plugin.commons import gcloud_config
 from scheduler_jupyter_plugin.commons.constants import (
     CLOUDKMS_SERVICE_NAME,
     CLOUDRESOURCEMANAGER_SERVICE_NAME,
+    COMPOSER_SERVICE_NAME,
     COMPUTE_SERVICE_DEFAULT_URL,
     COMPUTE_SERVICE_NAME,
     DATACATALOG_SERVICE_NAME,
@@ -25,35 +27,79 @@ from scheduler_jupyter_plugin.commons.constants import (
     STORAGE_SERVICE_NAME,
 )
 
+# The endpoints resolved together whenever the endpoint table is rebuilt,
+# keyed by the name used for them in the service URL map.
+SERVICE_ENDPOINTS = {
+    "dataproc_url": (DATAPROC_SERVICE_NAME, None),
+    "compute_url": (COMPUTE_SERVICE_NAME, COMPUTE_SERVICE_DEFAULT_URL),
+    "metastore_url": (METASTORE_SERVICE_NAME, None),
+    "cloudkms_url": (CLOUDKMS_SERVICE_NAME, None),
+    "cloudresourcemanager_url": (CLOUDRESOURCEMANAGER_SERVICE_NAME, None),
+    "datacatalog_url": (DATACATALOG_SERVICE_NAME, None),
+    "storage_url": (STORAGE_SERVICE_NAME, STORAGE_SERVICE_DEFAULT_URL),
+    "composer_url": (COMPOSER_SERVICE_NAME, None),
+}
+
+# Maps (service_name, default_url) to the resolved URL. The table is only
+# valid for the endpoint overrides it was built from.
+_endpoint_table = {}
+_endpoint_overrides = None
+
+_lookup_stats = {
+    "lookups": 0,
+    "table_builds": 0,
+    "last_build_seconds": 0.0,
+    "lookup_seconds_total": 0.0,
+    "lookup_seconds_max": 0.0,
+}
+
+
+def _resolve(service_name, default_url, overrides):
+    default_url = default_url or f"https://{service_name}.googleapis.com/"
+    return overrides.get(service_name) or default_url
+
+
+def _current_endpoint_table():
+    global _endpoint_table, _endpoint_overrides
+    overrides = gcloud_config.get_section("api_endpoint_overrides")
+    if overrides != _endpoint_overrides:
+        start = time.perf_counter()
+        _endpoint_table = {
+            (name, default): _resolve(name, default, overrides)
+            for name, default in SERVICE_ENDPOINTS.values()
+        }
+        _endpoint_overrides = overrides
+        _lookup_stats["table_builds"] += 1
+        _lookup_stats["last_build_seconds"] = time.perf_counter() - start
+    return _endpoint_table
+
 
 async def map():
-    dataproc_url = await gcp_service_url(DATAPROC_SERVICE_NAME)
-    compute_url = await gcp_service_url(
-        COMPUTE_SERVICE_NAME, default_url=COMPUTE_SERVICE_DEFAULT_URL
-    )
-    metastore_url = await gcp_service_url(METASTORE_SERVICE_NAME)
-    cloudkms_url = await gcp_service_url(CLOUDKMS_SERVICE_NAME)
-    cloudresourcemanager_url = await gcp_service_url(CLOUDRESOURCEMANAGER_SERVICE_NAME)
-    datacatalog_url = await gcp_service_url(DATACATALOG_SERVICE_NAME)
-    storage_url = await gcp_service_url(
-        STORAGE_SERVICE_NAME, default_url=STORAGE_SERVICE_DEFAULT_URL
-    )
-    url_map = {
-        "dataproc_url": dataproc_url,
-        "compute_url": compute_url,
-        "metastore_url": metastore_url,
-        "cloudkms_url": cloudkms_url,
-        "cloudresourcemanager_url": cloudresourcemanager_url,
-        "datacatalog_url": datacatalog_url,
-        "storage_url": storage_url,
+    table = _current_endpoint_table()
+    return {
+        map_key: table[endpoint]
+        for map_key, endpoint in SERVICE_ENDPOINTS.items()
+        if map_key != "composer_url"
     }
-    return url_map
 
 
 async def gcp_service_url(service_name, default_url=None):
-    default_url = default_url or f"https://{service_name}.googleapis.com/"
-    configured_url = await jupyter_config.async_get_gcloud_config(
-        f"configuration.properties.api_endpoint_overrides.{service_name}"
+    start = time.perf_counter()
+    table = _current_endpoint_table()
+    key = (service_name, default_url)
+    url = table.get(key)
+    if url is None:
+        url = _resolve(service_name, default_url, _endpoint_overrides)
+        table[key] = url
+    elapsed = time.perf_counter() - start
+    _lookup_stats["lookups"] += 1
+    _lookup_stats["lookup_seconds_total"] += elapsed
+    _lookup_stats["lookup_seconds_max"] = max(
+        _lookup_stats["lookup_seconds_max"], elapsed
     )
-    url = configured_url or default_url
     return url
+
+
+def lookup_stats():
+    """Returns counters and latencies for service URL lookups."""
+    return dict(_lookup_stats)
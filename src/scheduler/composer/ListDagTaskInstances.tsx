@@ -124,16 +124,19 @@ const ListDagTaskInstances = ({
   };
 
   const listDagTaskLogList = async (index: string, iconIndex: number) => {
+    const taskInstance = dagTaskInstancesList[index];
     await SchedulerService.listDagTaskLogsListService(
       composerName,
       dagId,
       dagRunId,
-      dagTaskInstancesList[index].taskId,
+      taskInstance.taskId,
       iconIndex,
       setLogList,
       setIsLoadingLogs,
       projectId,
-      region
+      region,
+      // The listed state is only that of the latest try.
+      iconIndex === taskInstance.tryNumber ? taskInstance.state : undefined
     );
   };
   return (
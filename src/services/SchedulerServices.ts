@@ -971,13 +971,15 @@ export class SchedulerService {
     setLogList: (value: string) => void,
     setIsLoadingLogs: (value: boolean) => void,
     projectId: string,
-    region: string
+    region: string,
+    taskState?: string
   ) => {
     try {
       setIsLoadingLogs(true);
       dagRunId = encodeURIComponent(dagRunId);
+      const stateParam = taskState ? `&task_state=${taskState}` : '';
       const data: any = await requestAPI(
-        `dagRunTaskLogs?composer=${composerName}&dag_id=${dagId}&dag_run_id=${dagRunId}&task_id=${taskId}&task_try_number=${tryNumber}&project_id=${projectId}&region_id=${region}`
+        `dagRunTaskLogs?composer=${composerName}&dag_id=${dagId}&dag_run_id=${dagRunId}&task_id=${taskId}&task_try_number=${tryNumber}&project_id=${projectId}&region_id=${region}${stateParam}`
       );
       setLogList(data?.content);
       setIsLoadingLogs(false);